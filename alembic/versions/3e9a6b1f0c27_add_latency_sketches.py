@@ -0,0 +1,37 @@
+"""add latency sketches
+
+Revision ID: 3e9a6b1f0c27
+Revises: 8c41d7e2a9b3
+Create Date: 2026-10-19 10:02:41.508913
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "3e9a6b1f0c27"
+down_revision: Union[str, Sequence[str], None] = "8c41d7e2a9b3"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "daily_payment_analytics",
+        sa.Column("latency_sketch", sa.LargeBinary(), nullable=True),
+    )
+
+    op.create_table(
+        "hourly_payment_latency",
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("latency_sketch", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("hour"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("hourly_payment_latency")
+    op.drop_column("daily_payment_analytics", "latency_sketch")
@@ -0,0 +1,30 @@
+"""index payments created_at
+
+Revision ID: 8c41d7e2a9b3
+Revises: 5f0fa9446420
+Create Date: 2026-10-19 09:12:05.114302
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "8c41d7e2a9b3"
+down_revision: Union[str, Sequence[str], None] = "5f0fa9446420"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 🔥 Analytics aggregates scan payments by created_at range
+    op.create_index(
+        "ix_payments_created_at",
+        "payments",
+        ["created_at"],
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_payments_created_at", table_name="payments")
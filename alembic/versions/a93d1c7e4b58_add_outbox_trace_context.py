@@ -0,0 +1,29 @@
+"""add outbox trace_context
+
+Revision ID: a93d1c7e4b58
+Revises: f18c3a9d5b62
+Create Date: 2026-10-19 19:42:11.508113
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "a93d1c7e4b58"
+down_revision: Union[str, Sequence[str], None] = "f18c3a9d5b62"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 🔥 Trace id + per-hop timestamps (app.core.tracing)
+    op.add_column(
+        "outbox_events",
+        sa.Column("trace_context", sa.JSON(), nullable=True),
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("outbox_events", "trace_context")
@@ -0,0 +1,284 @@
+"""partition payments and outbox_events by month
+
+Revision ID: b71f5c2d8e40
+Revises: 3e9a6b1f0c27
+Create Date: 2026-10-19 11:47:12.902154
+
+Converts both tables to native RANGE partitions (one per month):
+- payments       PARTITION BY RANGE (created_at)
+- outbox_events  PARTITION BY RANGE (occurred_at)
+
+Postgres requires the partition key in every unique constraint, so
+global uniqueness of payments.idempotency_key and outbox_events.event_id
+moves to small lookup tables maintained by AFTER INSERT triggers.
+A duplicate still fails the inserting transaction with a unique
+violation, exactly as before.
+"""
+
+from datetime import date, datetime, timezone
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "b71f5c2d8e40"
+down_revision: Union[str, Sequence[str], None] = "3e9a6b1f0c27"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# Partitions created ahead of "now" (maintenance job keeps this rolling)
+MONTHS_AHEAD = 3
+
+
+def _month_start(value: date) -> date:
+    return date(value.year, value.month, 1)
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def _create_month_partitions(table: str, column: str, tz_suffix: str) -> None:
+    bind = op.get_bind()
+
+    oldest = bind.execute(
+        sa.text(f"SELECT min({column}) FROM {table}_unpartitioned")
+    ).scalar()
+
+    today = datetime.now(timezone.utc).date()
+    month = _month_start(oldest.date() if oldest else today)
+
+    last = _month_start(today)
+    for _ in range(MONTHS_AHEAD):
+        last = _next_month(last)
+
+    while month <= last:
+        upper = _next_month(month)
+        op.execute(
+            f"""
+            CREATE TABLE {table}_p{month:%Y_%m}
+            PARTITION OF {table}
+            FOR VALUES FROM ('{month.isoformat()}{tz_suffix}')
+                       TO ('{upper.isoformat()}{tz_suffix}')
+            """
+        )
+        month = upper
+
+    # Safety net only — maintenance pre-creates months so this stays empty
+    op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
+
+
+def upgrade() -> None:
+    # ==================================================
+    # PAYMENTS
+    # ==================================================
+    op.execute("ALTER TABLE payments RENAME TO payments_unpartitioned")
+    op.execute(
+        "ALTER TABLE payments_unpartitioned "
+        "RENAME CONSTRAINT payments_pkey TO payments_unpartitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE payments_unpartitioned "
+        "RENAME CONSTRAINT payments_idempotency_key_key "
+        "TO payments_unpartitioned_idempotency_key_key"
+    )
+    op.execute(
+        "ALTER INDEX ix_payments_created_at "
+        "RENAME TO ix_payments_unpartitioned_created_at"
+    )
+
+    op.execute(
+        """
+        CREATE TABLE payments (
+            id UUID NOT NULL,
+            user_id UUID NOT NULL,
+            amount INTEGER NOT NULL,
+            currency VARCHAR NOT NULL,
+            status paymentstatus NOT NULL,
+            idempotency_key VARCHAR NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            processed_at TIMESTAMP WITHOUT TIME ZONE,
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+        """
+    )
+    op.create_index("ix_payments_created_at", "payments", ["created_at"])
+    op.create_index("ix_payments_idempotency_key", "payments", ["idempotency_key"])
+
+    # 🔒 Global idempotency_key uniqueness
+    op.execute(
+        """
+        CREATE TABLE payment_idempotency_keys (
+            idempotency_key VARCHAR PRIMARY KEY,
+            payment_id UUID NOT NULL,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL
+        )
+        """
+    )
+    op.create_index(
+        "ix_payment_idempotency_keys_created_at",
+        "payment_idempotency_keys",
+        ["created_at"],
+    )
+    op.execute(
+        """
+        CREATE FUNCTION payments_register_idempotency_key() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO payment_idempotency_keys (idempotency_key, payment_id, created_at)
+            VALUES (NEW.idempotency_key, NEW.id, NEW.created_at);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER payments_idempotency_key_unique
+        AFTER INSERT ON payments
+        FOR EACH ROW EXECUTE FUNCTION payments_register_idempotency_key()
+        """
+    )
+
+    _create_month_partitions("payments", "created_at", "")
+
+    op.execute("INSERT INTO payments SELECT * FROM payments_unpartitioned")
+    op.execute("DROP TABLE payments_unpartitioned")
+
+    # ==================================================
+    # OUTBOX EVENTS
+    # ==================================================
+    op.execute("ALTER TABLE outbox_events RENAME TO outbox_events_unpartitioned")
+    op.execute(
+        "ALTER TABLE outbox_events_unpartitioned "
+        "RENAME CONSTRAINT outbox_events_pkey TO outbox_events_unpartitioned_pkey"
+    )
+    op.execute(
+        "ALTER TABLE outbox_events_unpartitioned "
+        "RENAME CONSTRAINT outbox_events_event_id_key "
+        "TO outbox_events_unpartitioned_event_id_key"
+    )
+
+    op.execute(
+        """
+        CREATE TABLE outbox_events (
+            id UUID NOT NULL,
+            event_id UUID NOT NULL,
+            aggregate_id UUID NOT NULL,
+            event_type VARCHAR NOT NULL,
+            version INTEGER NOT NULL,
+            payload JSON NOT NULL,
+            occurred_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE,
+            published_at TIMESTAMP WITH TIME ZONE,
+            PRIMARY KEY (id, occurred_at)
+        ) PARTITION BY RANGE (occurred_at)
+        """
+    )
+
+    # 🔒 Global event_id uniqueness
+    op.execute(
+        """
+        CREATE TABLE outbox_event_ids (
+            event_id UUID PRIMARY KEY,
+            occurred_at TIMESTAMP WITH TIME ZONE NOT NULL
+        )
+        """
+    )
+    op.create_index(
+        "ix_outbox_event_ids_occurred_at",
+        "outbox_event_ids",
+        ["occurred_at"],
+    )
+    op.execute(
+        """
+        CREATE FUNCTION outbox_events_register_event_id() RETURNS trigger AS $$
+        BEGIN
+            INSERT INTO outbox_event_ids (event_id, occurred_at)
+            VALUES (NEW.event_id, NEW.occurred_at);
+            RETURN NULL;
+        END;
+        $$ LANGUAGE plpgsql
+        """
+    )
+    op.execute(
+        """
+        CREATE TRIGGER outbox_events_event_id_unique
+        AFTER INSERT ON outbox_events
+        FOR EACH ROW EXECUTE FUNCTION outbox_events_register_event_id()
+        """
+    )
+
+    _create_month_partitions("outbox_events", "occurred_at", " 00:00:00+00")
+
+    op.execute(
+        """
+        INSERT INTO outbox_events
+        SELECT id, event_id, aggregate_id, event_type, version, payload,
+               occurred_at, created_at, published_at
+        FROM outbox_events_unpartitioned
+        """
+    )
+    op.execute("DROP TABLE outbox_events_unpartitioned")
+
+
+def downgrade() -> None:
+    # ==================================================
+    # OUTBOX EVENTS → plain heap
+    # ==================================================
+    op.execute("ALTER TABLE outbox_events RENAME TO outbox_events_partitioned")
+    op.execute(
+        "ALTER TABLE outbox_events_partitioned "
+        "RENAME CONSTRAINT outbox_events_pkey TO outbox_events_partitioned_pkey"
+    )
+    op.execute(
+        """
+        CREATE TABLE outbox_events (
+            id UUID NOT NULL PRIMARY KEY,
+            event_id UUID NOT NULL UNIQUE,
+            aggregate_id UUID NOT NULL,
+            event_type VARCHAR NOT NULL,
+            version INTEGER NOT NULL,
+            payload JSON NOT NULL,
+            occurred_at TIMESTAMP WITH TIME ZONE NOT NULL,
+            created_at TIMESTAMP WITH TIME ZONE,
+            published_at TIMESTAMP WITH TIME ZONE
+        )
+        """
+    )
+    op.execute("INSERT INTO outbox_events SELECT * FROM outbox_events_partitioned")
+    op.execute("DROP TABLE outbox_events_partitioned")
+    op.execute("DROP FUNCTION outbox_events_register_event_id()")
+    op.execute("DROP TABLE outbox_event_ids")
+
+    # ==================================================
+    # PAYMENTS → plain heap
+    # ==================================================
+    op.execute("ALTER TABLE payments RENAME TO payments_partitioned")
+    op.execute(
+        "ALTER TABLE payments_partitioned "
+        "RENAME CONSTRAINT payments_pkey TO payments_partitioned_pkey"
+    )
+    op.execute(
+        "ALTER INDEX ix_payments_created_at "
+        "RENAME TO ix_payments_partitioned_created_at"
+    )
+    op.execute(
+        """
+        CREATE TABLE payments (
+            id UUID NOT NULL PRIMARY KEY,
+            user_id UUID NOT NULL,
+            amount INTEGER NOT NULL,
+            currency VARCHAR NOT NULL,
+            status paymentstatus NOT NULL,
+            idempotency_key VARCHAR NOT NULL UNIQUE,
+            created_at TIMESTAMP WITHOUT TIME ZONE NOT NULL,
+            processed_at TIMESTAMP WITHOUT TIME ZONE
+        )
+        """
+    )
+    op.create_index("ix_payments_created_at", "payments", ["created_at"])
+    op.execute("INSERT INTO payments SELECT * FROM payments_partitioned")
+    op.execute("DROP TABLE payments_partitioned")
+    op.execute("DROP FUNCTION payments_register_idempotency_key()")
+    op.execute("DROP TABLE payment_idempotency_keys")
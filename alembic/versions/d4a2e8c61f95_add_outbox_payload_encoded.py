@@ -0,0 +1,45 @@
+"""add outbox payload_encoded
+
+Revision ID: d4a2e8c61f95
+Revises: b71f5c2d8e40
+Create Date: 2026-10-19 13:20:37.441870
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "d4a2e8c61f95"
+down_revision: Union[str, Sequence[str], None] = "b71f5c2d8e40"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 🔥 Compact msgpack payloads (app.events.registry)
+    op.add_column(
+        "outbox_events",
+        sa.Column("payload_encoded", sa.LargeBinary(), nullable=True),
+    )
+
+    # New rows only carry the binary payload
+    op.alter_column("outbox_events", "payload", nullable=True)
+
+
+def downgrade() -> None:
+    # Decoding msgpack in SQL is not possible — refuse to lose payloads
+    op.execute(
+        """
+        DO $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM outbox_events WHERE payload IS NULL) THEN
+                RAISE EXCEPTION 'outbox_events has binary-only payloads';
+            END IF;
+        END
+        $$
+        """
+    )
+    op.alter_column("outbox_events", "payload", nullable=False)
+    op.drop_column("outbox_events", "payload_encoded")
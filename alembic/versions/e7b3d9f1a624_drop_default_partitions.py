@@ -0,0 +1,76 @@
+"""drop the DEFAULT partitions of payments and outbox_events
+
+Revision ID: e7b3d9f1a624
+Revises: a93d1c7e4b58
+Create Date: 2026-10-19 21:14:37.660192
+
+A DEFAULT partition holding any row of a month makes CREATE TABLE …
+PARTITION OF … FOR VALUES for that month fail, and Postgres refuses
+DETACH PARTITION … CONCURRENTLY while one exists. Rows that landed in
+it move to proper monthly partitions; missing months are now alerted on
+by partition maintenance instead of silently absorbed.
+"""
+
+from datetime import date
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "e7b3d9f1a624"
+down_revision: Union[str, Sequence[str], None] = "a93d1c7e4b58"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+# table → (month of the partition key, bound suffix, key registry trigger)
+TABLES = {
+    "payments": (
+        "date_trunc('month', created_at)",
+        "",
+        "payments_idempotency_key_unique",
+    ),
+    "outbox_events": (
+        "date_trunc('month', occurred_at AT TIME ZONE 'UTC')",
+        " 00:00:00+00",
+        "outbox_events_event_id_unique",
+    ),
+}
+
+
+def _next_month(value: date) -> date:
+    return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+
+    for table, (month_expr, suffix, trigger) in TABLES.items():
+        op.execute(f"ALTER TABLE {table} DETACH PARTITION {table}_default")
+
+        months = bind.execute(
+            sa.text(f"SELECT DISTINCT ({month_expr})::date FROM {table}_default")
+        ).scalars()
+
+        # A month with rows in DEFAULT cannot have had its own partition
+        for month in sorted(months):
+            op.execute(
+                f"""
+                CREATE TABLE {table}_p{month:%Y_%m}
+                PARTITION OF {table}
+                FOR VALUES FROM ('{month.isoformat()}{suffix}')
+                           TO ('{_next_month(month).isoformat()}{suffix}')
+                """
+            )
+
+        # Keys of these rows are already registered — skip the trigger
+        op.execute(f"ALTER TABLE {table} DISABLE TRIGGER {trigger}")
+        op.execute(f"INSERT INTO {table} SELECT * FROM {table}_default")
+        op.execute(f"ALTER TABLE {table} ENABLE TRIGGER {trigger}")
+
+        op.execute(f"DROP TABLE {table}_default")
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.execute(f"CREATE TABLE {table}_default PARTITION OF {table} DEFAULT")
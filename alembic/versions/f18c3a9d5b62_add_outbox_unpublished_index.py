@@ -0,0 +1,32 @@
+"""add outbox unpublished partial index
+
+Revision ID: f18c3a9d5b62
+Revises: d4a2e8c61f95
+Create Date: 2026-10-19 14:05:58.217630
+"""
+
+from typing import Sequence, Union
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = "f18c3a9d5b62"
+down_revision: Union[str, Sequence[str], None] = "d4a2e8c61f95"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # 🔥 Outbox relay claim (published_at IS NULL ORDER BY occurred_at)
+    # without scanning the published history
+    op.create_index(
+        "ix_outbox_events_unpublished",
+        "outbox_events",
+        ["occurred_at"],
+        postgresql_where=sa.text("published_at IS NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_outbox_events_unpublished", table_name="outbox_events")
@@ -0,0 +1,55 @@
+import time
+from typing import AsyncGenerator
+
+from fastapi import HTTPException, Request
+
+from app.core.admission import ADMISSION_ENABLED, payment_admission
+from app.core.logging import logger
+from app.core.timing import current_stages
+
+
+# ==================================================
+# ✅ READ CONSISTENCY FOR READ-ONLY ROUTES
+# ==================================================
+def strong_consistency(request: Request) -> bool:
+    """
+    `X-Consistency: strong` forces the primary (app.db.session.run_read);
+    otherwise reads use the replica, except for just-created payments.
+    """
+    return request.headers.get("X-Consistency", "").lower() == "strong"
+
+
+# ==================================================
+# ✅ ADMISSION CONTROL (LOAD SHEDDING)
+# ==================================================
+async def admit_payment() -> AsyncGenerator[None, None]:
+    """
+    Sheds load before a DB connection is requested.
+
+    Over the adaptive limit → immediate 503 + Retry-After instead of
+    queueing on the pool until the gateway times out. Off on Lambda
+    (one request per container, see app.core.admission).
+    """
+    if not ADMISSION_ENABLED:
+        yield
+        return
+
+    if not payment_admission.try_acquire():
+        logger.info(
+            "REQUEST_SHED",
+            extra={"controller": payment_admission.name, **payment_admission.stats()},
+        )
+        raise HTTPException(
+            status_code=503,
+            detail="Service overloaded, retry later",
+            headers={"Retry-After": str(payment_admission.retry_after_seconds())},
+        )
+
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        payment_admission.release(
+            latency_ms=(time.perf_counter() - started) * 1000,
+            pool_wait_ms=current_stages().get("db_checkout", 0.0),
+        )
@@ -0,0 +1,15 @@
+from typing import Any
+
+from fastapi.responses import JSONResponse
+
+from app.core.serialization import dumps
+
+
+class FastJSONResponse(JSONResponse):
+    """
+    Default response class: renders through app.core.serialization
+    (orjson) instead of the stdlib json module.
+    """
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -1,7 +1,11 @@
 from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
 from app.core.logging import logger
+from app.services.health_probes import readiness
 
-router = APIRouter(prefix="/notifications", tags=["notifications"])
+# Mounted under /notifications in app.main
+router = APIRouter(tags=["notifications"])
 
 
 @router.get("/health", summary="Notifications liveness check")
@@ -18,12 +22,16 @@ async def notifications_health():
 @router.get("/ready", summary="Notifications readiness check")
 async def notifications_ready():
     """
-    Readiness probe.
+    Readiness probe (cached, see app.services.health_probes).
+
+    - database: primary reachable (outbox lag → degraded only)
+    - redis: connectivity (degraded only — callers fail open)
+    - dlq: DLQ depth via SQS queue attributes
 
-    In future this can verify:
-    - Redis connectivity
-    - EventBridge permissions
-    - DLQ backlog size
+    503 only when a required probe fails.
     """
-    logger.info("NOTIFICATIONS_READINESS_CHECK")
-    return {"status": "ready"}
+    report = await readiness()
+    return JSONResponse(
+        report,
+        status_code=503 if report["status"] == "not_ready" else 200,
+    )
@@ -1,14 +1,25 @@
-from fastapi import APIRouter, Header, HTTPException, Depends
+from fastapi import APIRouter, Header, HTTPException, Depends, Query
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from uuid import UUID
 from typing import Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import get_db
+from app.api.dependencies import admit_payment, strong_consistency
+from app.api.responses import FastJSONResponse
+from app.db.session import get_db, run_read
+from app.services.payment_query import get_payment
 from app.services.payment_service import create_payment
+from app.services.payment_status_stream import (
+    STATUS_STREAM_MAX_WAIT_SECONDS,
+    STATUS_STREAM_SSE,
+    open_status_stream,
+    wait_for_terminal_status,
+)
 from app.workers.idempotency import check_idempotency
 from app.core.rate_limit import rate_limit
+from app.core.timing import stage
 
 router = APIRouter()
 
@@ -19,26 +30,38 @@ class PaymentRequest(BaseModel):
     currency: str
 
 
+# Hot routes return the response object themselves: a returned dict goes
+# through jsonable_encoder before FastJSONResponse ever renders it
+def _accepted(payment_id: UUID, idempotency_key: str) -> FastJSONResponse:
+    return FastJSONResponse(
+        status_code=202,
+        content={
+            "status": "accepted",
+            "payment_id": str(payment_id),
+            "idempotency_key": idempotency_key,
+        },
+    )
+
+
 @router.post("", status_code=202)
 async def create_payment_api(
     payload: PaymentRequest,
     idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+    _admitted: None = Depends(admit_payment),  # before get_db: shed first
     db: AsyncSession = Depends(get_db),
 ):
     if not idempotency_key:
         raise HTTPException(status_code=400, detail="Idempotency-Key required")
 
-    allowed = await rate_limit(str(payload.user_id))
+    with stage("rate_limit"):
+        allowed = await rate_limit(str(payload.user_id))
     if not allowed:
         raise HTTPException(status_code=429, detail="Too many requests")
 
-    existing = await check_idempotency(db, idempotency_key)
+    with stage("idempotency"):
+        existing = await check_idempotency(db, idempotency_key)
     if existing:
-        return {
-            "status": "accepted",
-            "payment_id": str(existing.id),
-            "idempotency_key": idempotency_key,
-        }
+        return _accepted(existing.id, idempotency_key)
 
     payment = await create_payment(
         db=db,
@@ -48,8 +71,62 @@ async def create_payment_api(
         idempotency_key=idempotency_key,
     )
 
-    return {
-        "status": "accepted",
-        "payment_id": str(payment.id),
-        "idempotency_key": idempotency_key,
-    }
+    return _accepted(payment.id, idempotency_key)
+
+
+@router.get("/{payment_id}")
+async def get_payment_api(
+    payment_id: UUID,
+    strong: bool = Depends(strong_consistency),
+):
+    payment = await run_read(
+        lambda db: get_payment(db, payment_id),
+        key=str(payment_id),
+        strong=strong,
+    )
+    if not payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    return FastJSONResponse(payment)
+
+
+@router.get("/{payment_id}/events")
+async def payment_events_api(
+    payment_id: UUID,
+    accept: Optional[str] = Header(None),
+    wait: float = Query(
+        STATUS_STREAM_MAX_WAIT_SECONDS, ge=0, le=STATUS_STREAM_MAX_WAIT_SECONDS
+    ),
+):
+    """
+    Push-based status instead of client polling.
+
+    - Long-poll (default, and the only mode on Lambda): returns once
+      SUCCESS / FAILED or after `wait`
+    - Accept: text/event-stream → SSE (status now, then terminal status),
+      only where responses can stream (STATUS_STREAM_SSE; Mangum buffers)
+    - Finished payments are answered from the cached view immediately
+    - No DB connection is held while waiting
+    """
+    if accept and "text/event-stream" in accept:
+        if not STATUS_STREAM_SSE:
+            raise HTTPException(
+                status_code=406,
+                detail="Streaming unavailable here; long-poll without Accept: text/event-stream",
+            )
+
+        stream = await open_status_stream(str(payment_id), timeout=wait)
+        if stream is None:
+            raise HTTPException(status_code=404, detail="Payment not found")
+
+        return StreamingResponse(
+            stream,
+            media_type="text/event-stream",
+            headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        )
+
+    payment = await wait_for_terminal_status(str(payment_id), timeout=wait)
+    if not payment:
+        raise HTTPException(status_code=404, detail="Payment not found")
+
+    return FastJSONResponse(payment)
@@ -0,0 +1,152 @@
+import os
+import logging
+from collections import deque
+from typing import Deque, Dict
+
+from app.core import metrics
+
+logger = logging.getLogger(__name__)
+
+
+class AdmissionController:
+    """
+    Adaptive concurrency limit (AIMD, evaluated per window).
+
+    - A request is admitted only while in_flight < limit, otherwise it
+      is shed immediately (caller answers 503 + Retry-After)
+    - Every `window` completions the limit is re-evaluated:
+        p99 latency > budget or pool wait > target  → limit × decrease
+        window saturated (peak in_flight ≥ limit)   → limit + 1
+    - Limit stays within [min_limit, max_limit]
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: float,
+        min_limit: float,
+        max_limit: float,
+        latency_budget_ms: float,
+        target_pool_wait_ms: float,
+        window: int = 50,
+        decrease_factor: float = 0.75,
+    ):
+        self.name = name
+        self.limit = initial_limit
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_budget_ms = latency_budget_ms
+        self.target_pool_wait_ms = target_pool_wait_ms
+        self.window = window
+        self.decrease_factor = decrease_factor
+
+        self.in_flight = 0
+        self._peak_in_flight = 0
+        self._latencies_ms: Deque[float] = deque(maxlen=window)
+        self._pool_waits_ms: Deque[float] = deque(maxlen=window)
+
+        self._stats = {
+            "admitted": 0,
+            "shed": 0,
+            "increases": 0,
+            "decreases": 0,
+        }
+
+    # --------------------------------------------------
+    # Request lifecycle
+    # --------------------------------------------------
+    def try_acquire(self) -> bool:
+        if self.in_flight >= int(self.limit):
+            self._stats["shed"] += 1
+            metrics.incr("admission.shed", controller=self.name)
+            return False
+
+        self.in_flight += 1
+        self._peak_in_flight = max(self._peak_in_flight, self.in_flight)
+        self._stats["admitted"] += 1
+        return True
+
+    def release(self, latency_ms: float, pool_wait_ms: float) -> None:
+        self.in_flight = max(0, self.in_flight - 1)
+        self._latencies_ms.append(latency_ms)
+        self._pool_waits_ms.append(pool_wait_ms)
+
+        if len(self._latencies_ms) >= self.window:
+            self._adjust()
+
+    def retry_after_seconds(self) -> int:
+        # Roughly one budget-length of queue per admitted slot, min 1s
+        return max(1, round(self.latency_budget_ms / 1000 * 2))
+
+    # --------------------------------------------------
+    # AIMD
+    # --------------------------------------------------
+    def _adjust(self) -> None:
+        latencies = sorted(self._latencies_ms)
+        p99 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.99))]
+        pool_wait = sum(self._pool_waits_ms) / len(self._pool_waits_ms)
+        previous = self.limit
+
+        if p99 > self.latency_budget_ms or pool_wait > self.target_pool_wait_ms:
+            self.limit = max(self.min_limit, self.limit * self.decrease_factor)
+            if self.limit < previous:
+                self._stats["decreases"] += 1
+        elif self._peak_in_flight >= int(self.limit):
+            self.limit = min(self.max_limit, self.limit + 1)
+            if self.limit > previous:
+                self._stats["increases"] += 1
+
+        if int(self.limit) != int(previous):
+            logger.info(
+                "ADMISSION_LIMIT_CHANGED",
+                extra={
+                    "controller": self.name,
+                    "limit": int(self.limit),
+                    "previous_limit": int(previous),
+                    "p99_ms": round(p99, 1),
+                    "pool_wait_ms": round(pool_wait, 2),
+                },
+            )
+
+        self._latencies_ms.clear()
+        self._pool_waits_ms.clear()
+        self._peak_in_flight = self.in_flight
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            **self._stats,
+            "limit": int(self.limit),
+            "in_flight": self.in_flight,
+        }
+
+
+# ==================================================
+# PAYMENT CREATION CONTROLLER (PER CONTAINER)
+# ==================================================
+# The limit is per process, so it only sheds where one process serves
+# many concurrent requests (uvicorn). A Lambda container serves ONE
+# request at a time and never reaches it: there, overload is bounded by
+# the function's reserved concurrency × pool size instead.
+ADMISSION_ENABLED = os.getenv(
+    "ADMISSION_ENABLED",
+    "false" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "true",
+).lower() == "true"
+
+# Defaults sized for the API pool profile (5 connections, no overflow)
+payment_admission = AdmissionController(
+    name="create_payment",
+    initial_limit=float(os.getenv("ADMISSION_INITIAL_LIMIT", "5")),
+    min_limit=float(os.getenv("ADMISSION_MIN_LIMIT", "1")),
+    max_limit=float(os.getenv("ADMISSION_MAX_LIMIT", "20")),
+    latency_budget_ms=float(os.getenv("ADMISSION_LATENCY_BUDGET_MS", "250")),
+    target_pool_wait_ms=float(os.getenv("ADMISSION_TARGET_POOL_WAIT_MS", "10")),
+    window=int(os.getenv("ADMISSION_WINDOW", "50")),
+)
+
+
+def admission_stats() -> Dict[str, Dict[str, float]]:
+    return {payment_admission.name: payment_admission.stats()}
+
+
+if ADMISSION_ENABLED:
+    metrics.register_gauges("admission.create_payment", payment_admission.stats)
@@ -1,8 +1,10 @@
 import os
-from dotenv import load_dotenv
 
-load_dotenv()
+# Lambda gets its configuration from the function environment;
+# .env files are a local-development convenience only
+if not os.getenv("AWS_LAMBDA_FUNCTION_NAME"):
+    from dotenv import load_dotenv  # lazy import
 
-DATABASE_URL = os.getenv("DATABASE_URL", "")
+    load_dotenv()
 
-print("🚨 DATABASE_URL USED BY APP:", DATABASE_URL)
+DATABASE_URL = os.getenv("DATABASE_URL", "")
@@ -0,0 +1,59 @@
+import os
+import time
+import threading
+import uuid
+from datetime import datetime, timezone
+
+# --------------------------------------------------
+# UUIDv7 (RFC 9562) — time-ordered identifiers
+# --------------------------------------------------
+# 48-bit unix ms | ver(7) | 12-bit counter | var(10) | 62 random bits
+#
+# Consecutive ids land on the right-most B-tree leaf instead of a random
+# page, so inserts stop splitting pages all over the primary-key and
+# unique indexes. Ids stay strictly increasing within a process (the
+# counter absorbs bursts inside one millisecond).
+
+_lock = threading.Lock()
+_last_ms = 0
+_counter = 0
+
+_MAX_COUNTER = 0xFFF
+
+
+def uuid7() -> uuid.UUID:
+    global _last_ms, _counter
+
+    now_ms = time.time_ns() // 1_000_000
+
+    with _lock:
+        if now_ms > _last_ms:
+            _last_ms = now_ms
+            # random start, top bit clear → room for ≥2048 ids in the same ms
+            _counter = int.from_bytes(os.urandom(2), "big") & 0x7FF
+        else:
+            _counter += 1
+            if _counter > _MAX_COUNTER:
+                # counter exhausted (or clock stepped back): borrow the next ms
+                _last_ms += 1
+                _counter = 0
+
+        ms, counter = _last_ms, _counter
+
+    rand_b = int.from_bytes(os.urandom(8), "big") & ((1 << 62) - 1)
+
+    value = (
+        (ms & ((1 << 48) - 1)) << 80
+        | 0x7 << 76
+        | counter << 64
+        | 0b10 << 62
+        | rand_b
+    )
+    return uuid.UUID(int=value)
+
+
+def uuid7_datetime(value: uuid.UUID) -> datetime:
+    """
+    Creation time embedded in a UUIDv7 (millisecond precision, UTC).
+    """
+    return datetime.fromtimestamp((value.int >> 80) / 1000, tz=timezone.utc)
@@ -8,6 +8,15 @@ logger = logging.getLogger(__name__)
 
 LOCK_TTL = 30
 
+# Delete only if we still own it
+_RELEASE_SCRIPT = """
+if redis.call("GET", KEYS[1]) == ARGV[1] then
+    return redis.call("DEL", KEYS[1])
+else
+    return 0
+end
+"""
+
 
 async def acquire_lock(name: str) -> Optional[str]:
     redis_client = await get_redis()
@@ -39,16 +48,8 @@ async def release_lock(name: str, token: str) -> None:
     if not redis_client or not token:
         return
 
-    lua = """
-    if redis.call("GET", KEYS[1]) == ARGV[1] then
-        return redis.call("DEL", KEYS[1])
-    else
-        return 0
-    end
-    """
-
     try:
-        await redis_client.eval(lua, 1, f"lock:{name}", token)
+        await redis_client.eval(_RELEASE_SCRIPT, 1, f"lock:{name}", token)
         logger.info("LOCK_RELEASED", extra={"name": name})
     except Exception:
         logger.exception("LOCK_RELEASE_FAILED")
@@ -1,8 +1,165 @@
+import os
+import sys
+import copy
+import queue
+import atexit
+import random
 import logging
+import logging.handlers
+import functools
+from datetime import datetime, timezone
+from typing import Dict
+
+from app.core.serialization import dumps_str
+
+# Attributes every LogRecord has — anything else came from `extra`
+_RECORD_ATTRS = set(vars(logging.makeLogRecord({}))) | {"message", "asctime"}
+
+# High-volume INFO events sampled by default (override: LOG_SAMPLE_RATES)
+DEFAULT_SAMPLE_RATES = {
+    "REQUEST_RECEIVED": 0.1,
+    "OUTBOX_EVENT_PUBLISHED": 0.1,
+}
+
+
+def _load_sample_rates() -> Dict[str, float]:
+    """
+    LOG_SAMPLE_RATES="REQUEST_RECEIVED=0.05,OUTBOX_EVENT_PUBLISHED=1"
+    """
+    rates = dict(DEFAULT_SAMPLE_RATES)
+    for item in os.getenv("LOG_SAMPLE_RATES", "").split(","):
+        name, _, rate = item.partition("=")
+        if name.strip() and rate.strip():
+            rates[name.strip()] = float(rate)
+    return rates
+
+
+# --------------------------------------------------
+# Sampling (runs on the caller's thread, before enqueue)
+# --------------------------------------------------
+class SamplingFilter(logging.Filter):
+    """
+    Keeps a `rate` fraction of the configured INFO/DEBUG messages.
+
+    - WARNING and above are never sampled
+    - Kept records carry `sample_rate` so counts can be re-weighted
+    - Requests that failed server-side (status_code ≥ 500) are kept
+    """
+
+    def __init__(self, rates: Dict[str, float]):
+        super().__init__()
+        self.rates = rates
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno >= logging.WARNING:
+            return True
+
+        rate = self.rates.get(record.msg) if isinstance(record.msg, str) else None
+        if rate is None or rate >= 1:
+            return True
+
+        if getattr(record, "status_code", 0) >= 500:
+            return True
+
+        if random.random() < rate:
+            record.sample_rate = rate
+            return True
+        return False
+
+
+# --------------------------------------------------
+# JSON formatting (runs on the listener thread)
+# --------------------------------------------------
+class JsonFormatter(logging.Formatter):
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            "timestamp": datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+
+        for key, value in record.__dict__.items():
+            if key not in _RECORD_ATTRS:
+                entry[key] = value
+
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        elif record.exc_text:
+            entry["exception"] = record.exc_text
+
+        try:
+            return dumps_str(entry)
+        except TypeError:
+            # unknown extra types: fall back to their str()
+            return dumps_str(
+                {key: value if isinstance(value, (str, int, float, bool, type(None)))
+                 else str(value) for key, value in entry.items()}
+            )
+
+
+class _DeferredFormatQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler.prepare() formats on the caller's thread; this one only
+    resolves %-args and tracebacks, leaving JSON formatting to the listener.
+    """
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        if record.exc_info:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+
+# --------------------------------------------------
+# Setup
+# --------------------------------------------------
+_log_queue: "queue.Queue[logging.LogRecord]" = queue.Queue(-1)
+
+_stream_handler = logging.StreamHandler(sys.stdout)
+_stream_handler.setFormatter(JsonFormatter())
+
+_queue_handler = _DeferredFormatQueueHandler(_log_queue)
+_queue_handler.addFilter(SamplingFilter(_load_sample_rates()))
+
+_listener = logging.handlers.QueueListener(
+    _log_queue, _stream_handler, respect_handler_level=True
+)
+_listener.start()
+atexit.register(_listener.stop)
 
 logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s %(levelname)s %(name)s %(message)s"
+    level=os.getenv("LOG_LEVEL", "INFO").upper(),
+    handlers=[_queue_handler],
+    force=True,  # replace the Lambda runtime's default root handler
 )
 
 logger = logging.getLogger("event-platform")
+
+
+def flush_logs() -> None:
+    """
+    Blocks until every queued record is written.
+
+    Call before a Lambda handler returns: the listener thread is frozen
+    with the container between invocations.
+    """
+    _log_queue.join()
+
+
+def flushes_logs(handler):
+    """
+    Lambda handler decorator: flush_logs() after every invocation.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        try:
+            return handler(event, context)
+        finally:
+            flush_logs()
+
+    return wrapper
@@ -0,0 +1,277 @@
+import os
+import sys
+import time
+import bisect
+import functools
+import inspect
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Tuple
+
+from app.core.serialization import dumps_str
+
+# ==================================================
+# MODE
+# ==================================================
+# emf        → one CloudWatch EMF document per dimension set, per invocation
+# prometheus → cumulative, scraped from GET /metrics (container mode)
+# off        → record nothing
+METRICS_MODE = os.getenv(
+    "METRICS_MODE",
+    "emf" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "prometheus",
+)
+METRICS_NAMESPACE = os.getenv("METRICS_NAMESPACE", "EventPlatform")
+
+# Latency buckets (ms, upper bounds); last bucket is +Inf
+BUCKETS_MS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+_Key = Tuple[str, Tuple[Tuple[str, str], ...]]
+
+
+def _key(name: str, dims: Dict[str, object]) -> _Key:
+    return name, tuple(sorted((k, str(v)) for k, v in dims.items()))
+
+
+class Histogram:
+    __slots__ = ("counts", "count", "sum", "max")
+
+    def __init__(self):
+        self.counts = [0] * (len(BUCKETS_MS) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(BUCKETS_MS, value)] += 1
+        self.count += 1
+        self.sum += value
+        if value > self.max:
+            self.max = value
+
+    def quantile(self, q: float) -> float:
+        """
+        Upper bound of the bucket holding the q-th sample (max for +Inf).
+        """
+        rank = q * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank and count:
+                return BUCKETS_MS[index] if index < len(BUCKETS_MS) else self.max
+        return self.max
+
+
+# ==================================================
+# REGISTRY (IN-PROCESS AGGREGATION)
+# ==================================================
+_counters: Dict[_Key, float] = {}
+_gauges: Dict[_Key, float] = {}
+_histograms: Dict[_Key, Histogram] = {}
+
+# name prefix → callable returning {field: value}, sampled at flush/scrape
+_gauge_sources: Dict[str, Callable[[], Dict[str, float]]] = {}
+
+_enabled = METRICS_MODE != "off"
+
+
+def incr(name: str, value: float = 1, **dims) -> None:
+    if _enabled:
+        key = _key(name, dims)
+        _counters[key] = _counters.get(key, 0) + value
+
+
+def gauge(name: str, value: float, **dims) -> None:
+    if _enabled:
+        _gauges[_key(name, dims)] = value
+
+
+def observe(name: str, value_ms: float, **dims) -> None:
+    if _enabled:
+        key = _key(name, dims)
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = Histogram()
+        histogram.observe(value_ms)
+
+
+def register_gauges(prefix: str, source: Callable[[], Dict[str, float]]) -> None:
+    """
+    Stats provider (admission, token cache, pool) read at flush/scrape time.
+    """
+    _gauge_sources[prefix] = source
+
+
+@contextmanager
+def timer(name: str, **dims) -> Iterator[None]:
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, (time.perf_counter() - started) * 1000, **dims)
+
+
+def timed(name: str, **dims):
+    """
+    Decorator: observe `name` (ms) per call, sync or async.
+    """
+
+    def decorator(fn):
+        if inspect.iscoroutinefunction(fn):
+
+            @functools.wraps(fn)
+            async def async_wrapper(*args, **kwargs):
+                with timer(name, **dims):
+                    return await fn(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            with timer(name, **dims):
+                return fn(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def _sample_gauge_sources() -> None:
+    for prefix, source in list(_gauge_sources.items()):
+        try:
+            stats = source()
+        except Exception:
+            continue
+        for field, value in stats.items():
+            if isinstance(value, (int, float)):
+                gauge(f"{prefix}.{field}", value)
+
+
+def reset() -> None:
+    _counters.clear()
+    _gauges.clear()
+    _histograms.clear()
+
+
+# ==================================================
+# CLOUDWATCH EMF (LAMBDA)
+# ==================================================
+def _unit(name: str) -> str:
+    return "Milliseconds" if name.endswith("_ms") else "Count"
+
+
+def emf_documents() -> List[Dict]:
+    """
+    One EMF document per dimension set. Histograms are summarised as
+    count / sum / max / p50 / p99 (bucket upper bounds).
+    """
+    _sample_gauge_sources()
+
+    grouped: Dict[Tuple, Dict[str, Tuple[float, str]]] = {}
+
+    for (name, dims), value in _counters.items():
+        grouped.setdefault(dims, {})[name] = (value, "Count")
+    for (name, dims), value in _gauges.items():
+        grouped.setdefault(dims, {})[name] = (value, "None")
+    for (name, dims), histogram in _histograms.items():
+        metrics = grouped.setdefault(dims, {})
+        unit = _unit(name)
+        metrics[f"{name}.count"] = (histogram.count, "Count")
+        metrics[f"{name}.sum"] = (histogram.sum, unit)
+        metrics[f"{name}.max"] = (histogram.max, unit)
+        metrics[f"{name}.p50"] = (histogram.quantile(0.50), unit)
+        metrics[f"{name}.p99"] = (histogram.quantile(0.99), unit)
+
+    timestamp = int(time.time() * 1000)
+    documents = []
+    for dims, metrics in grouped.items():
+        names = sorted(metrics)
+        # EMF allows at most 100 metrics per directive
+        for start in range(0, len(names), 100):
+            chunk = names[start:start + 100]
+            documents.append(
+                {
+                    "_aws": {
+                        "Timestamp": timestamp,
+                        "CloudWatchMetrics": [
+                            {
+                                "Namespace": METRICS_NAMESPACE,
+                                "Dimensions": [[k for k, _ in dims]],
+                                "Metrics": [
+                                    {"Name": name, "Unit": metrics[name][1]}
+                                    for name in chunk
+                                ],
+                            }
+                        ],
+                    },
+                    **dict(dims),
+                    **{name: metrics[name][0] for name in chunk},
+                }
+            )
+    return documents
+
+
+def flush_emf() -> None:
+    """
+    Writes the invocation's aggregates to stdout as EMF and resets.
+    Written directly (not via logging): never sampled, never reformatted.
+    """
+    if METRICS_MODE != "emf":
+        return
+
+    documents = emf_documents()
+    if documents:
+        sys.stdout.write("".join(dumps_str(doc) + "\n" for doc in documents))
+        sys.stdout.flush()
+    reset()
+
+
+def flushes_metrics(handler):
+    """
+    Lambda handler decorator: flush_emf() once per invocation.
+    """
+
+    @functools.wraps(handler)
+    def wrapper(event, context):
+        try:
+            return handler(event, context)
+        finally:
+            flush_emf()
+
+    return wrapper
+
+
+# ==================================================
+# PROMETHEUS TEXT (CONTAINER MODE)
+# ==================================================
+def _prom_name(name: str) -> str:
+    return name.replace(".", "_").replace("-", "_")
+
+
+def _prom_labels(dims, extra: Tuple[Tuple[str, str], ...] = ()) -> str:
+    labels = [*dims, *extra]
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{k}="{v}"' for k, v in labels) + "}"
+
+
+def render_prometheus() -> str:
+    _sample_gauge_sources()
+    lines: List[str] = []
+
+    for (name, dims), value in sorted(_counters.items()):
+        lines.append(f"{_prom_name(name)}_total{_prom_labels(dims)} {value}")
+
+    for (name, dims), value in sorted(_gauges.items()):
+        lines.append(f"{_prom_name(name)}{_prom_labels(dims)} {value}")
+
+    for (name, dims), histogram in sorted(_histograms.items(), key=lambda i: i[0]):
+        metric = _prom_name(name)
+        cumulative = 0
+        for bound, count in zip((*BUCKETS_MS, "+Inf"), histogram.counts):
+            cumulative += count
+            lines.append(
+                f"{metric}_bucket{_prom_labels(dims, (('le', str(bound)),))} {cumulative}"
+            )
+        lines.append(f"{metric}_sum{_prom_labels(dims)} {histogram.sum}")
+        lines.append(f"{metric}_count{_prom_labels(dims)} {histogram.count}")
+
+    return "\n".join(lines) + "\n"
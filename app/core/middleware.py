@@ -0,0 +1,91 @@
+import time
+import uuid
+
+from app.core import metrics, tracing
+from app.core.logging import logger
+from app.core.timing import (
+    begin_request,
+    current_stages,
+    end_request,
+    server_timing_header,
+)
+
+
+class RequestContextMiddleware:
+    """
+    Pure ASGI middleware: request id + stage timings + access log.
+
+    - No BaseHTTPMiddleware (no extra task / body streaming wrapper)
+    - X-Request-ID and Server-Timing added on response start
+    - One REQUEST_RECEIVED log line with per-stage durations
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        request_id = str(uuid.uuid4())
+        scope.setdefault("state", {})["request_id"] = request_id
+
+        started = time.perf_counter()
+        status_code = 500
+        token = begin_request()
+
+        # Continue the caller's trace id if it sent a well-formed one
+        incoming_trace_id = dict(scope.get("headers") or []).get(b"x-trace-id")
+        trace_token = tracing.start_trace(
+            trace_id=tracing.parse_trace_id(incoming_trace_id),
+            request_id=request_id,
+        )
+        trace_id = tracing.current_trace_id()
+
+        async def send_with_headers(message):
+            nonlocal status_code
+
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+                total_ms = (time.perf_counter() - started) * 1000
+
+                headers = list(message.get("headers", []))
+                headers.append((b"x-request-id", request_id.encode()))
+                headers.append((b"x-trace-id", trace_id.encode()))
+                headers.append(
+                    (
+                        b"server-timing",
+                        server_timing_header(current_stages(), total_ms).encode(),
+                    )
+                )
+                message = {**message, "headers": headers}
+
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_headers)
+        finally:
+            duration_ms = (time.perf_counter() - started) * 1000
+            stages = current_stages()
+
+            status_class = f"{status_code // 100}xx"
+            metrics.incr("api.requests", method=scope["method"], status=status_class)
+            metrics.observe("api.request_ms", duration_ms, method=scope["method"])
+            for name, ms in stages.items():
+                metrics.observe("api.stage_ms", ms, stage=name)
+
+            logger.info(
+                "REQUEST_RECEIVED",
+                extra={
+                    "request_id": request_id,
+                    "trace_id": trace_id,
+                    "method": scope["method"],
+                    "path": scope["path"],
+                    "status_code": status_code,
+                    "duration_ms": round(duration_ms, 2),
+                    "stages_ms": {name: round(ms, 2) for name, ms in stages.items()},
+                },
+            )
+            end_request(token)
+            tracing.end_trace(trace_token)
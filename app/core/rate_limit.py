@@ -1,4 +1,5 @@
 import logging
+from app.core import metrics
 from app.core.redis import get_redis
 
 logger = logging.getLogger(__name__)
@@ -20,12 +21,14 @@ async def rate_limit(key: str) -> bool:
     redis_key = f"rate:{key}"
 
     try:
-        current = await redis.incr(redis_key)
+        with metrics.timer("redis.command_ms", command="rate_limit"):
+            current = await redis.incr(redis_key)
 
-        if current == 1:
-            await redis.expire(redis_key, WINDOW_SECONDS)
+            if current == 1:
+                await redis.expire(redis_key, WINDOW_SECONDS)
 
         if current > RATE_LIMIT:
+            metrics.incr("api.rate_limited")
             logger.info(
                 "RATE_LIMIT_EXCEEDED",
                 extra={"key": key, "count": current},
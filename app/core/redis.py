@@ -1,18 +1,36 @@
 import os
 import logging
-import redis.asyncio as redis
-from typing import Optional
+
+from app.core import metrics
+from typing import TYPE_CHECKING, Optional
+
+if TYPE_CHECKING:
+    import redis.asyncio as redis
 
 logger = logging.getLogger(__name__)
 
 
-async def get_redis() -> Optional[redis.Redis]:
+def redis_from_url(url: str, **kwargs) -> "redis.Redis":
+    """
+    Client for `url`; memory:// → in-process FakeRedis (local stack).
+    """
+    if url.startswith("memory://"):
+        from app.transport.fake_redis import from_url
+    else:
+        from redis.asyncio import from_url  # lazy import
+
+    return from_url(url, **kwargs)
+
+
+async def get_redis() -> Optional["redis.Redis"]:
     """
     Lambda-safe Redis getter.
 
     - No global client reuse
     - No cross-event-loop contamination
     - Fails open if Redis unavailable
+    - redis is imported on first use, not at cold start
+    - REDIS_URL=memory:// → in-process fake (local stack)
     """
 
     redis_url = os.getenv("REDIS_URL")
@@ -21,7 +39,7 @@ async def get_redis() -> Optional[redis.Redis]:
         return None
 
     try:
-        client = redis.from_url(
+        client = redis_from_url(
             redis_url,
             decode_responses=True,
             socket_connect_timeout=1,
@@ -29,11 +47,13 @@ async def get_redis() -> Optional[redis.Redis]:
         )
 
         # Validate connection on each invocation
-        await client.ping()
+        with metrics.timer("redis.connect_ms"):
+            await client.ping()
 
         return client
 
     except Exception as exc:
+        metrics.incr("redis.unavailable")
         logger.error(
             "REDIS_CONNECTION_FAILED",
             extra={"error": str(exc)},
@@ -1,23 +1,134 @@
+import os
+import time
+import hashlib
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
-from jose import jwt, JWTError
+from typing import Any, Dict, List, Optional, Tuple
+
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
 
-SECRET_KEY = "super-secret-key"  # move to env later
+from app.core import metrics
+
+
+def _load_secret_keys() -> List[str]:
+    """
+    JWT_SECRET_KEYS="new,old" → sign with the first, accept any (rotation).
+    """
+    keys = [key.strip() for key in os.getenv("JWT_SECRET_KEYS", "").split(",")]
+    keys = [key for key in keys if key]
+    return keys or [os.getenv("SECRET_KEY", "super-secret-key")]
+
+
+SECRET_KEYS = _load_secret_keys()
+SECRET_KEY = SECRET_KEYS[0]
 ALGORITHM = "HS256"
 ACCESS_TOKEN_EXPIRE_MINUTES = 30
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
 def create_access_token(data: dict):
+    from jose import jwt  # lazy import
+
     to_encode = data.copy()
     expire = datetime.utcnow() + timedelta(minutes=ACCESS_TOKEN_EXPIRE_MINUTES)
     to_encode.update({"exp": expire})
     return jwt.encode(to_encode, SECRET_KEY, algorithm=ALGORITHM)
 
+
+# ==================================================
+# VERIFIED TOKEN CACHE (PER CONTAINER)
+# ==================================================
+TOKEN_CACHE_SIZE = int(os.getenv("TOKEN_CACHE_SIZE", "10000"))
+# Entries expire this long before the token's own exp
+TOKEN_CACHE_EXPIRY_MARGIN_SECONDS = float(
+    os.getenv("TOKEN_CACHE_EXPIRY_MARGIN_SECONDS", "5")
+)
+# Upper bound for any entry (tokens without exp, dropped keys)
+TOKEN_CACHE_MAX_TTL_SECONDS = float(os.getenv("TOKEN_CACHE_MAX_TTL_SECONDS", "300"))
+
+# sha256(token) → (claims, cached-until epoch seconds)
+_token_cache: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+# get_current_user is a sync dependency → runs on threadpool threads
+_token_cache_lock = threading.Lock()
+
+_token_cache_stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+
+def token_cache_stats() -> Dict[str, float]:
+    lookups = _token_cache_stats["hits"] + _token_cache_stats["misses"]
+    return {
+        **_token_cache_stats,
+        "size": len(_token_cache),
+        "hit_rate": _token_cache_stats["hits"] / lookups if lookups else 0.0,
+    }
+
+
+def _decode_token(token: str) -> Dict[str, Any]:
+    """
+    Full verification: signature (any accepted key) + claims.
+    """
+    from jose import jwt, ExpiredSignatureError, JWTError  # lazy import
+
+    last_error: Optional[Exception] = None
+    for key in SECRET_KEYS:
+        try:
+            return jwt.decode(token, key, algorithms=[ALGORITHM])
+        except ExpiredSignatureError:
+            raise  # signature was valid — no other key will help
+        except JWTError as exc:
+            last_error = exc
+
+    raise last_error
+
+
+def verify_token(token: str) -> Dict[str, Any]:
+    """
+    Decoded claims, from cache when this exact token was verified before.
+    Raises jose.JWTError on invalid tokens (never cached).
+    """
+    digest = hashlib.sha256(token.encode()).digest()
+    now = time.time()
+
+    with _token_cache_lock:
+        entry = _token_cache.get(digest)
+        if entry is not None:
+            claims, cached_until = entry
+            if now < cached_until:
+                _token_cache.move_to_end(digest)
+                _token_cache_stats["hits"] += 1
+                return dict(claims)  # callers may mutate their copy
+            _token_cache.pop(digest, None)
+
+        _token_cache_stats["misses"] += 1
+
+    # Verification (the expensive part) runs outside the lock
+    claims = _decode_token(token)
+
+    cached_until = now + TOKEN_CACHE_MAX_TTL_SECONDS
+    if isinstance(claims.get("exp"), (int, float)):
+        cached_until = min(cached_until, claims["exp"] - TOKEN_CACHE_EXPIRY_MARGIN_SECONDS)
+
+    if cached_until > now:
+        with _token_cache_lock:
+            _token_cache[digest] = (dict(claims), cached_until)
+            _token_cache.move_to_end(digest)
+            while len(_token_cache) > TOKEN_CACHE_SIZE:
+                _token_cache.popitem(last=False)
+                _token_cache_stats["evictions"] += 1
+
+    return claims
+
+
+metrics.register_gauges("auth.token_cache", token_cache_stats)
+
+
 def get_current_user(token: str = Depends(oauth2_scheme)):
+    from jose import JWTError  # lazy import
+
     try:
-        payload = jwt.decode(token, SECRET_KEY, algorithms=[ALGORITHM])
+        payload = verify_token(token)
         return payload
     except JWTError:
         raise HTTPException(
@@ -0,0 +1,35 @@
+import decimal
+from typing import Any, Union
+
+import orjson
+
+# orjson handles UUID, datetime, date, Enum and dataclasses natively
+_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, decimal.Decimal):
+        return str(value)
+    if hasattr(value, "model_dump"):  # pydantic models
+        return value.model_dump(mode="json")
+    if isinstance(value, (set, frozenset)):
+        return list(value)
+    raise TypeError(f"Type is not JSON serializable: {type(value).__name__}")
+
+
+def dumps(value: Any) -> bytes:
+    """
+    JSON bytes (API responses, Redis values).
+    """
+    return orjson.dumps(value, default=_default, option=_OPTIONS)
+
+
+def dumps_str(value: Any) -> str:
+    """
+    JSON text, for AWS APIs that take str (EventBridge Detail, SQS body).
+    """
+    return dumps(value).decode()
+
+
+def loads(data: Union[bytes, bytearray, memoryview, str]) -> Any:
+    return orjson.loads(data)
@@ -0,0 +1,48 @@
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, Optional
+
+# Per-request stage timings (ms), installed by the request middleware.
+# Outside a request (workers, scripts) stage() is a no-op recorder.
+_stages: ContextVar[Optional[Dict[str, float]]] = ContextVar(
+    "request_stages", default=None
+)
+
+
+def begin_request():
+    """
+    Starts collecting stage timings for the current request.
+    Returns a token for end_request().
+    """
+    return _stages.set({})
+
+
+def end_request(token) -> None:
+    _stages.reset(token)
+
+
+def current_stages() -> Dict[str, float]:
+    return dict(_stages.get() or {})
+
+
+@contextmanager
+def stage(name: str) -> Iterator[None]:
+    """
+    Times a block and attributes it to `name` on the current request.
+    Repeated stages accumulate.
+    """
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        stages = _stages.get()
+        if stages is not None:
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            stages[name] = stages.get(name, 0.0) + elapsed_ms
+
+
+def server_timing_header(stages: Dict[str, float], total_ms: float) -> str:
+    metrics = [f"{name};dur={ms:.1f}" for name, ms in stages.items()]
+    metrics.append(f"total;dur={total_ms:.1f}")
+    return ", ".join(metrics)
@@ -0,0 +1,134 @@
+import re
+import time
+import uuid
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional, Tuple
+
+# ==================================================
+# TRACE CONTEXT
+# ==================================================
+# Carried in every event envelope as:
+#   {"trace_id": "...", "request_id": "...", "hops": {hop: epoch_ms, ...}}
+#
+# One trace follows a payment from the API request to its terminal
+# state; the outcome event carries the full set of hops.
+
+API_RECEIVED = "api.received"
+API_EVENT_CREATED = "api.event_created"
+OUTBOX_PUBLISHED = "outbox.published"
+SQS_SENT = "sqs.sent"
+WORKER_RECEIVED = "worker.received"
+GATEWAY_STARTED = "gateway.started"
+GATEWAY_COMPLETED = "gateway.completed"
+WORKER_EVENT_CREATED = "worker.event_created"
+
+# stage → (from hop, to hop, kind). Queueing stages scale with consumers,
+# processing stages with code / dependencies.
+STAGES: List[Tuple[str, str, str, str]] = [
+    ("api", API_RECEIVED, API_EVENT_CREATED, "processing"),
+    ("outbox_wait", API_EVENT_CREATED, OUTBOX_PUBLISHED, "queueing"),
+    ("bus_transit", OUTBOX_PUBLISHED, SQS_SENT, "queueing"),
+    ("sqs_wait", SQS_SENT, WORKER_RECEIVED, "queueing"),
+    ("worker", WORKER_RECEIVED, GATEWAY_STARTED, "processing"),
+    ("gateway", GATEWAY_STARTED, GATEWAY_COMPLETED, "processing"),
+    ("commit", GATEWAY_COMPLETED, WORKER_EVENT_CREATED, "processing"),
+]
+
+_trace: ContextVar[Optional[Dict[str, Any]]] = ContextVar("trace", default=None)
+
+# Format start_trace generates (uuid4().hex)
+_TRACE_ID = re.compile(rb"[0-9a-fA-F]{32}")
+
+
+def parse_trace_id(value: Optional[bytes]) -> Optional[str]:
+    """
+    Caller-supplied trace id (X-Trace-ID), or None unless it is 32 hex
+    chars: it is echoed in a response header and persisted in every
+    event's trace context.
+    """
+    if not value or not _TRACE_ID.fullmatch(value):
+        return None
+    return value.decode("ascii").lower()
+
+
+def now_ms() -> float:
+    return round(time.time() * 1000, 1)
+
+
+def start_trace(
+    trace_id: Optional[str] = None,
+    request_id: Optional[str] = None,
+    received_at_ms: Optional[float] = None,
+):
+    """
+    New trace for an incoming API request. Returns a reset token.
+    """
+    return _trace.set(
+        {
+            "trace_id": trace_id or uuid.uuid4().hex,
+            "request_id": request_id,
+            "hops": {API_RECEIVED: received_at_ms or now_ms()},
+        }
+    )
+
+
+def resume_trace(context: Optional[Dict[str, Any]]):
+    """
+    Continues a trace received in an event envelope. Returns a reset token.
+    """
+    if not context:
+        return _trace.set(None)
+    return _trace.set(
+        {**context, "hops": dict(context.get("hops") or {})}
+    )
+
+
+def end_trace(token) -> None:
+    _trace.reset(token)
+
+
+def current_trace() -> Optional[Dict[str, Any]]:
+    return _trace.get()
+
+
+def current_trace_id() -> Optional[str]:
+    trace = _trace.get()
+    return trace["trace_id"] if trace else None
+
+
+def mark(hop: str, at_ms: Optional[float] = None) -> None:
+    """
+    Records a hop timestamp on the current trace (no-op without one).
+    """
+    trace = _trace.get()
+    if trace is not None:
+        trace["hops"][hop] = at_ms if at_ms is not None else now_ms()
+
+
+def context_for_event(hop: str) -> Optional[Dict[str, Any]]:
+    """
+    Snapshot of the current trace for an outgoing event, `hop` marked now.
+    """
+    mark(hop)
+    trace = _trace.get()
+    if trace is None:
+        return None
+    return {**trace, "hops": dict(trace["hops"])}
+
+
+def stage_durations(context: Optional[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    stage → ms for every stage whose two hops are present, plus "total"
+    (first hop → last hop).
+    """
+    hops = (context or {}).get("hops") or {}
+
+    durations = {}
+    for name, start, end, _ in STAGES:
+        if start in hops and end in hops:
+            durations[name] = max(0.0, hops[end] - hops[start])
+
+    if len(hops) >= 2:
+        durations["total"] = max(hops.values()) - min(hops.values())
+
+    return durations
@@ -1,18 +1,28 @@
-from sqlalchemy import Column, String, DateTime, Integer, JSON
+from sqlalchemy import Column, String, DateTime, Integer, JSON, LargeBinary, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime, timezone
 import uuid
 
 from app.shared.base import Base
+from app.core.ids import uuid7
+from app.events import registry
 
 
 class OutboxEvent(Base):
     __tablename__ = "outbox_events"
+    __table_args__ = (
+        # 🔥 Relay claim: tiny, only holds the unpublished backlog
+        Index(
+            "ix_outbox_events_unpublished",
+            "occurred_at",
+            postgresql_where=text("published_at IS NULL"),
+        ),
+    )
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
 
-    # 🔒 External immutable event id
-    event_id = Column(UUID(as_uuid=True), nullable=False, unique=True)
+    # 🔒 External immutable event id (unique via the outbox_event_ids registry)
+    event_id = Column(UUID(as_uuid=True), nullable=False)
 
     # 🔑 Aggregate (payment_id)
     aggregate_id = Column(UUID(as_uuid=True), nullable=False)
@@ -20,7 +30,14 @@ class OutboxEvent(Base):
     event_type = Column(String, nullable=False)
     version = Column(Integer, nullable=False)
 
-    payload = Column(JSON, nullable=False)
+    # Legacy JSON payload (rows written before the binary encoding)
+    payload = Column(JSON, nullable=True)
+
+    # 🔥 Compact msgpack payload (app.events.registry) — preferred
+    payload_encoded = Column(LargeBinary, nullable=True)
+
+    # Trace id + per-hop timestamps (app.core.tracing)
+    trace_context = Column(JSON, nullable=True)
 
     # 🔥 IMPORTANT FOR REPLAY / AUDIT (must be timezone aware)
     occurred_at = Column(
@@ -38,3 +55,33 @@ class OutboxEvent(Base):
         DateTime(timezone=True),
         nullable=True,
     )
+
+    # DB key is (id, occurred_at): flush-UPDATEs prune to one partition
+    __mapper_args__ = {"primary_key": [id, occurred_at]}
+
+    def decoded_payload(self) -> dict:
+        """
+        Payload exactly as written (no upcasting — consumers upcast).
+        """
+        if self.payload_encoded is not None:
+            return registry.decode(self.payload_encoded, upcast_to_latest=False)[2]
+        return self.payload
+
+
+def build_outbox_event(event, aggregate_id) -> OutboxEvent:
+    """
+    Outbox row for a DomainEvent, payload stored in the binary encoding.
+    """
+    return OutboxEvent(
+        event_id=uuid.UUID(event["event_id"]),
+        aggregate_id=aggregate_id,
+        event_type=event["event_type"],
+        version=event["version"],
+        payload_encoded=registry.encode(
+            registry.schema_name(event["event_type"]),
+            event["version"],
+            event["payload"],
+        ),
+        occurred_at=event["occurred_at"],
+        trace_context=event.get("trace"),
+    )
@@ -0,0 +1,199 @@
+import os
+import time
+import uuid
+from dataclasses import dataclass, replace
+from typing import Any, Dict, Optional
+
+from sqlalchemy import event, exc
+from sqlalchemy.pool import NullPool
+
+from app.core import metrics as app_metrics
+
+# ==================================================
+# POOL PROFILES (PER ROLE)
+# ==================================================
+# Every field can be overridden per role through the environment:
+#   DB_<ROLE>_POOL_MODE=null            (queue | null)
+#   DB_<ROLE>_POOL_SIZE=10
+#   DB_<ROLE>_MAX_OVERFLOW=5
+#   DB_<ROLE>_POOL_TIMEOUT=2
+#   DB_<ROLE>_PRE_PING_IDLE_SECONDS=30  (-1 = never, 0 = every checkout)
+#   DB_<ROLE>_STATEMENT_CACHE_SIZE=0
+#
+# DB_POOLER=pgbouncer (or rds-proxy) switches every role to settings
+# that are safe behind a transaction pooler: NullPool (the pooler owns
+# the connections) and no server-side prepared statement cache.
+
+
+@dataclass(frozen=True)
+class PoolProfile:
+    mode: str = "queue"
+    pool_size: int = 5
+    max_overflow: int = 0
+    pool_timeout: float = 30.0
+    pool_recycle: int = 1800
+    # Ping only connections idle for longer than this (None = never)
+    pre_ping_idle_seconds: Optional[float] = 30.0
+    # asyncpg / SQLAlchemy prepared statement caches (0 = disabled)
+    statement_cache_size: int = 100
+
+
+DEFAULT_PROFILES: Dict[str, PoolProfile] = {
+    # One Lambda container serves one request at a time; keep it small
+    "api": PoolProfile(pool_size=5, max_overflow=0, pool_timeout=5.0),
+    "replica": PoolProfile(pool_size=5, max_overflow=0, pool_timeout=5.0),
+    # Per-invocation engines: pool barely outlives a batch
+    "worker": PoolProfile(pool_size=2, max_overflow=0, pre_ping_idle_seconds=None),
+    "publisher": PoolProfile(pool_size=1, max_overflow=0, pre_ping_idle_seconds=None),
+    # Long scans, bounded fan-out (backfill passes its own pool_size)
+    "analytics": PoolProfile(pool_size=4, max_overflow=0, pool_timeout=60.0),
+}
+
+_TRANSACTION_POOLERS = {"pgbouncer", "rds-proxy"}
+
+
+def _env(role: str, name: str) -> Optional[str]:
+    return os.getenv(f"DB_{role.upper()}_{name}")
+
+
+def load_profile(role: str) -> PoolProfile:
+    profile = DEFAULT_PROFILES.get(role, PoolProfile())
+
+    if os.getenv("DB_POOLER", "").lower() in _TRANSACTION_POOLERS:
+        profile = replace(profile, mode="null", statement_cache_size=0)
+
+    overrides: Dict[str, Any] = {}
+    for field, cast in (
+        ("mode", str),
+        ("pool_size", int),
+        ("max_overflow", int),
+        ("pool_timeout", float),
+        ("pool_recycle", int),
+        ("statement_cache_size", int),
+    ):
+        value = _env(role, field.upper())
+        if value is not None:
+            overrides[field] = cast(value)
+
+    idle = _env(role, "PRE_PING_IDLE_SECONDS")
+    if idle is not None:
+        overrides["pre_ping_idle_seconds"] = None if float(idle) < 0 else float(idle)
+
+    return replace(profile, **overrides)
+
+
+def engine_kwargs(profile: PoolProfile, connect_args: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    create_async_engine keyword arguments for a profile.
+    """
+    connect_args = {
+        **connect_args,
+        # asyncpg's own statement cache
+        "statement_cache_size": profile.statement_cache_size,
+        # SQLAlchemy asyncpg dialect's prepared statement cache
+        "prepared_statement_cache_size": profile.statement_cache_size,
+    }
+
+    if profile.statement_cache_size == 0:
+        # Transaction poolers hand each transaction a different server
+        # connection: never reuse a prepared statement name
+        connect_args["prepared_statement_name_func"] = (
+            lambda: f"__asyncpg_{uuid.uuid4()}__"
+        )
+
+    if profile.mode == "null":
+        return {"poolclass": NullPool, "connect_args": connect_args}
+
+    return {
+        "pool_size": profile.pool_size,
+        "max_overflow": profile.max_overflow,
+        "pool_timeout": profile.pool_timeout,
+        "pool_recycle": profile.pool_recycle,
+        # replaced by the idle-aware ping below
+        "pool_pre_ping": profile.pre_ping_idle_seconds == 0,
+        "connect_args": connect_args,
+    }
+
+
+# ==================================================
+# POOL METRICS
+# ==================================================
+_METRICS: Dict[str, Dict[str, float]] = {}
+
+# Smoothing for the recent checkout wait (EWMA)
+_WAIT_ALPHA = 0.2
+
+
+def _metrics(role: str) -> Dict[str, float]:
+    return _METRICS.setdefault(
+        role,
+        {
+            "checkouts": 0,
+            "checkins": 0,
+            "connects": 0,
+            "invalidations": 0,
+            "idle_pings": 0,
+            "in_use": 0,
+            "wait_seconds_total": 0.0,
+            "wait_seconds_max": 0.0,
+            "wait_seconds_recent": 0.0,
+        },
+    )
+
+
+def record_checkout_wait(role: str, seconds: float) -> None:
+    metrics = _metrics(role)
+    metrics["wait_seconds_total"] += seconds
+    metrics["wait_seconds_max"] = max(metrics["wait_seconds_max"], seconds)
+    metrics["wait_seconds_recent"] += _WAIT_ALPHA * (
+        seconds - metrics["wait_seconds_recent"]
+    )
+
+
+def recent_checkout_wait(role: str) -> float:
+    return _metrics(role)["wait_seconds_recent"]
+
+
+def pool_stats(role: str) -> Dict[str, float]:
+    return dict(_metrics(role))
+
+
+def instrument_engine(engine, role: str, profile: PoolProfile) -> None:
+    """
+    Pool event hooks: usage counters + pre-ping only after idle time.
+    """
+    metrics = _metrics(role)
+    app_metrics.register_gauges(f"db.pool.{role}", lambda: pool_stats(role))
+    pool = engine.sync_engine.pool
+    dialect = engine.sync_engine.dialect
+    idle_threshold = profile.pre_ping_idle_seconds
+
+    @event.listens_for(pool, "connect")
+    def _on_connect(dbapi_connection, connection_record):
+        metrics["connects"] += 1
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(pool, "checkout")
+    def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+        if idle_threshold:
+            idle = time.monotonic() - connection_record.info.get("last_used", 0.0)
+            if idle > idle_threshold:
+                metrics["idle_pings"] += 1
+                try:
+                    dialect.do_ping(dbapi_connection)
+                except Exception as ping_error:
+                    # Pool discards this connection and checks out another
+                    raise exc.DisconnectionError() from ping_error
+
+        metrics["checkouts"] += 1
+        metrics["in_use"] += 1
+
+    @event.listens_for(pool, "checkin")
+    def _on_checkin(dbapi_connection, connection_record):
+        metrics["checkins"] += 1
+        metrics["in_use"] = max(0, metrics["in_use"] - 1)
+        connection_record.info["last_used"] = time.monotonic()
+
+    @event.listens_for(pool, "invalidate")
+    def _on_invalidate(dbapi_connection, connection_record, exception):
+        metrics["invalidations"] += 1
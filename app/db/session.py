@@ -1,14 +1,34 @@
 # app/db/session.py
 import os
 import ssl
-from typing import AsyncGenerator, Tuple
+import time
+import uuid
+import asyncio
+import logging
+from dataclasses import replace
+from contextlib import asynccontextmanager
+from typing import AsyncGenerator, AsyncIterator, Awaitable, Callable, Optional, Tuple, TypeVar
 
+from sqlalchemy import text
+from sqlalchemy.exc import InterfaceError, OperationalError
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
 
+from app.core import metrics
+from app.core.ids import uuid7_datetime
+from app.core.serialization import dumps_str, loads
+from app.core.timing import stage
+from app.db.pool import (
+    engine_kwargs,
+    instrument_engine,
+    load_profile,
+    record_checkout_wait,
+)
+
 # ==================================================
 # SSL CONTEXT (RDS / AURORA)
 # ==================================================
@@ -17,6 +37,9 @@ _ssl_context.check_hostname = False
 _ssl_context.verify_mode = ssl.CERT_NONE
 
 
+logger = logging.getLogger(__name__)
+
+
 def _get_database_url() -> str:
     db_url = os.getenv("DATABASE_URL")
     if not db_url:
@@ -24,6 +47,33 @@ def _get_database_url() -> str:
     return db_url
 
 
+def _get_replica_url() -> Optional[str]:
+    return os.getenv("DATABASE_REPLICA_URL") or None
+
+
+def _create_engine(
+    url: str,
+    role: str,
+    pool_size: Optional[int] = None,
+) -> AsyncEngine:
+    """
+    Engine configured from the role's pool profile (see app.db.pool).
+    """
+    profile = load_profile(role)
+    if pool_size is not None:
+        profile = replace(profile, pool_size=pool_size)
+
+    engine = create_async_engine(
+        url,
+        # JSON columns (outbox payload) share the app-wide codec
+        json_serializer=dumps_str,
+        json_deserializer=loads,
+        **engine_kwargs(profile, {"ssl": _ssl_context}),
+    )
+    instrument_engine(engine, role, profile)
+    return engine
+
+
 # ==================================================
 # API ENGINE (GLOBAL, REUSED ACROSS INVOCATIONS)
 # ==================================================
@@ -35,13 +85,7 @@ def _get_api_sessionmaker() -> async_sessionmaker[AsyncSession]:
     global _engine, _SessionLocal
 
     if _engine is None:
-        _engine = create_async_engine(
-            _get_database_url(),
-            pool_pre_ping=True,
-            pool_size=5,
-            max_overflow=0,
-            connect_args={"ssl": _ssl_context},
-        )
+        _engine = _create_engine(_get_database_url(), "api")
 
         _SessionLocal = async_sessionmaker(
             bind=_engine,
@@ -58,20 +102,217 @@ def _get_api_sessionmaker() -> async_sessionmaker[AsyncSession]:
 async def get_db() -> AsyncGenerator[AsyncSession, None]:
     SessionLocal = _get_api_sessionmaker()
     async with SessionLocal() as session:
-        yield session
+        # Check the connection out up front so pool wait is measured
+        started = time.perf_counter()
+        with stage("db_checkout"):
+            await session.connection()
+        waited = time.perf_counter() - started
+        record_checkout_wait("api", waited)
+        metrics.observe("db.checkout_ms", waited * 1000, role="api")
+
+        with metrics.timer("db.session_ms", role="api"):
+            yield session
+
+
+# ==================================================
+# READ REPLICA (GLOBAL, OWN POOL)
+# ==================================================
+# Reads routed to the replica must be at most this stale
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+# How often replica lag is re-measured (one cheap query per interval)
+REPLICA_LAG_CHECK_SECONDS = float(os.getenv("REPLICA_LAG_CHECK_SECONDS", "5"))
+# After a replica failure, skip it for this long
+REPLICA_RETRY_SECONDS = float(os.getenv("REPLICA_RETRY_SECONDS", "30"))
+
+# Connection-level failures: the replica is skipped and the read retried
+# on the primary. Query errors (bad SQL, constraint…) propagate as-is.
+_REPLICA_ERRORS = (OperationalError, InterfaceError, OSError, asyncio.TimeoutError)
+
+T = TypeVar("T")
+
+_replica_engine = None
+_ReplicaSessionLocal = None
+
+_replica_state = {
+    "lag_seconds": 0.0,
+    "lag_checked_at": 0.0,
+    "down_until": 0.0,
+}
+
+
+def _get_replica_sessionmaker() -> Optional[async_sessionmaker[AsyncSession]]:
+    global _replica_engine, _ReplicaSessionLocal
+
+    replica_url = _get_replica_url()
+    if not replica_url:
+        return None
+
+    if _replica_engine is None:
+        _replica_engine = _create_engine(replica_url, "replica")
+
+        _ReplicaSessionLocal = async_sessionmaker(
+            bind=_replica_engine,
+            class_=AsyncSession,
+            expire_on_commit=False,
+        )
+
+    return _ReplicaSessionLocal
+
+
+def _recently_written(key: Optional[str]) -> bool:
+    """
+    Read-your-writes without shared state: a UUIDv7 key carries its
+    creation time, and a row younger than REPLICA_MAX_LAG_SECONDS may not
+    have replayed yet. Works across Lambda containers — the container
+    serving the read need not be the one that wrote.
+    """
+    if not key:
+        return False
+
+    try:
+        key_id = uuid.UUID(str(key))
+    except ValueError:
+        return False
+    if key_id.version != 7:
+        return False
+
+    age = time.time() - uuid7_datetime(key_id).timestamp()
+    return age < REPLICA_MAX_LAG_SECONDS
+
+
+def _mark_replica_down(exc: BaseException) -> None:
+    _replica_state["down_until"] = time.monotonic() + REPLICA_RETRY_SECONDS
+    metrics.incr("db.replica_failures")
+    logger.warning("REPLICA_UNAVAILABLE", extra={"error": str(exc)})
+
+
+async def _replica_lag_seconds(session: AsyncSession) -> float:
+    """
+    Replication lag, cached for REPLICA_LAG_CHECK_SECONDS.
+    A fully replayed replica reports 0 even if the primary is idle.
+    """
+    now = time.monotonic()
+    if now - _replica_state["lag_checked_at"] < REPLICA_LAG_CHECK_SECONDS:
+        return _replica_state["lag_seconds"]
+
+    lag = (
+        await session.execute(
+            text(
+                """
+                SELECT CASE
+                    WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+                    ELSE COALESCE(
+                        EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()),
+                        0
+                    )
+                END
+                """
+            )
+        )
+    ).scalar_one()
+
+    _replica_state["lag_seconds"] = float(lag)
+    _replica_state["lag_checked_at"] = now
+    return _replica_state["lag_seconds"]
+
+
+async def _open_replica_session() -> Optional[AsyncSession]:
+    """
+    Replica session if the replica is configured, healthy and fresh
+    enough; None means "use the primary".
+    """
+    ReplicaSessionLocal = _get_replica_sessionmaker()
+    if ReplicaSessionLocal is None:
+        return None
+
+    if time.monotonic() < _replica_state["down_until"]:
+        return None
+
+    session = ReplicaSessionLocal()
+    try:
+        # Check out now (even while the lag is cached) so a dead replica
+        # fails here, not inside the caller's query
+        await session.connection()
+        lag = await _replica_lag_seconds(session)
+    except Exception as exc:
+        await session.close()
+        _mark_replica_down(exc)
+        return None
+
+    if lag > REPLICA_MAX_LAG_SECONDS:
+        await session.close()
+        logger.info("REPLICA_TOO_STALE", extra={"lag_seconds": lag})
+        return None
+
+    return session
+
+
+@asynccontextmanager
+async def read_session(
+    key: Optional[str] = None,
+    strong: bool = False,
+) -> AsyncIterator[AsyncSession]:
+    """
+    Session for read-only work: replica when possible, primary when
+    - no replica is configured, or it is down (automatic fallback)
+    - replica lag exceeds REPLICA_MAX_LAG_SECONDS
+    - `key` is a UUIDv7 younger than the lag bound (read-your-writes)
+    - the caller asks for strong consistency
+
+    A replica connection failure inside the block marks the replica down
+    for later reads but is re-raised — use run_read() to retry it.
+    """
+    session = None
+    if not strong and not _recently_written(key):
+        session = await _open_replica_session()
+
+    if session is None:
+        async with _get_api_sessionmaker()() as session:
+            yield session
+        return
+
+    async with session:
+        try:
+            yield session
+        except _REPLICA_ERRORS as exc:
+            _mark_replica_down(exc)
+            raise
+
+
+async def run_read(
+    read: Callable[[AsyncSession], Awaitable[T]],
+    key: Optional[str] = None,
+    strong: bool = False,
+) -> T:
+    """
+    await read(session) under read_session() routing; if the replica
+    fails mid-read it is marked down and `read` re-runs on the primary.
+    """
+    replica = False
+    try:
+        async with read_session(key=key, strong=strong) as session:
+            replica = session.bind is _replica_engine
+            return await read(session)
+    except _REPLICA_ERRORS:
+        if not replica:
+            raise
+
+    metrics.incr("db.replica_fallbacks")
+    async with _get_api_sessionmaker()() as session:
+        return await read(session)
 
 
 # ==================================================
 # WORKER SESSION FACTORY (PER INVOCATION)
 # ==================================================
-def create_worker_session_factory() -> Tuple:
-    engine = create_async_engine(
-        _get_database_url(),
-        pool_pre_ping=True,
-        pool_size=5,
-        max_overflow=0,
-        connect_args={"ssl": _ssl_context},
-    )
+def create_worker_session_factory(
+    role: str = "worker",
+    pool_size: Optional[int] = None,
+) -> Tuple:
+    """
+    Roles: worker | publisher | analytics (pool profile per role).
+    """
+    engine = _create_engine(_get_database_url(), role, pool_size=pool_size)
 
     SessionLocal = async_sessionmaker(
         bind=engine,
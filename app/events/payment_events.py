@@ -1,8 +1,8 @@
-from typing import TypedDict, Dict, Any
+from typing import TypedDict, Dict, Any, NotRequired, Optional
 from datetime import datetime
-from uuid import uuid4
-
-from app.shared.models import Payment
+from app.shared.models import Payment, PaymentStatus
+from app.core import tracing
+from app.core.ids import uuid7
 
 
 class DomainEvent(TypedDict):
@@ -11,6 +11,7 @@ class DomainEvent(TypedDict):
     version: int
     payload: Dict[str, Any]
     occurred_at: str
+    trace: NotRequired[Optional[Dict[str, Any]]]
 
 
 def payment_created_event(payment: Payment) -> DomainEvent:
@@ -19,7 +20,7 @@ def payment_created_event(payment: Payment) -> DomainEvent:
     """
 
     return {
-        "event_id": str(uuid4()),
+        "event_id": str(uuid7()),
         "event_type": "payment.created.v1",
         "version": 1,
         "payload": {
@@ -27,7 +28,35 @@ def payment_created_event(payment: Payment) -> DomainEvent:
             "user_id": str(payment.user_id),
             "amount": payment.amount,
             "currency": payment.currency,
+            "created_at": payment.created_at.isoformat(),
         },
         "occurred_at": datetime.utcnow(),
+        "trace": tracing.context_for_event(tracing.API_EVENT_CREATED),
+    }
+
+
+def payment_outcome_event(payment: Payment) -> DomainEvent:
+    """
+    🔒 SINGLE SOURCE OF TRUTH for payment.success.v1 / payment.failed.v1
 
+    Emitted only after the terminal state is committed.
+    """
+
+    outcome = "success" if payment.status == PaymentStatus.SUCCESS else "failed"
+
+    return {
+        "event_id": str(uuid7()),
+        "event_type": f"payment.{outcome}.v1",
+        "version": 1,
+        "payload": {
+            "payment_id": str(payment.id),
+            "user_id": str(payment.user_id),
+            "amount": payment.amount,
+            "currency": payment.currency,
+            "status": payment.status.value,
+            "created_at": payment.created_at.isoformat(),
+            "processed_at": payment.processed_at.isoformat(),
+        },
+        "occurred_at": datetime.utcnow(),
+        "trace": tracing.context_for_event(tracing.WORKER_EVENT_CREATED),
     }
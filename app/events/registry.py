@@ -0,0 +1,145 @@
+import re
+import zlib
+from datetime import datetime
+from typing import Any, Callable, Dict, Tuple
+from uuid import UUID
+
+import msgpack
+
+# --------------------------------------------------
+# Versioned event schema registry
+# --------------------------------------------------
+# Schemas are keyed by (name, version) where name is the unversioned
+# event type ("payment.created"). Stored types such as
+# "payment.created.v1" are normalised on the way in.
+#
+# Upcasters turn a payload of version N into version N + 1, so consumers
+# only ever handle the latest version of each event.
+
+Payload = Dict[str, Any]
+
+_VERSION_SUFFIX = re.compile(r"\.v(\d+)$")
+
+_SCHEMAS: Dict[str, int] = {}  # name → latest version
+_UPCASTERS: Dict[Tuple[str, int], Callable[[Payload], Payload]] = {}
+
+# --------------------------------------------------
+# Binary envelope
+# --------------------------------------------------
+# byte 0    format version
+# byte 1    flags (bit 0 = zlib compressed)
+# byte 2..  msgpack [name, version, payload]
+_FORMAT_VERSION = 1
+_FLAG_COMPRESSED = 0x01
+
+# Small payloads are not worth the zlib header + CPU
+COMPRESS_THRESHOLD_BYTES = 512
+
+
+class UnknownEventSchema(Exception):
+    pass
+
+
+def split_event_type(event_type: str) -> Tuple[str, int]:
+    """
+    "payment.created.v1" → ("payment.created", 1)
+    """
+    match = _VERSION_SUFFIX.search(event_type)
+    if not match:
+        raise UnknownEventSchema(f"Unversioned event type: {event_type}")
+    return event_type[: match.start()], int(match[1])
+
+
+def schema_name(event_type: str) -> str:
+    match = _VERSION_SUFFIX.search(event_type)
+    return event_type[: match.start()] if match else event_type
+
+
+def register_event(name: str, version: int) -> None:
+    """
+    Declares that `version` of event `name` exists.
+    Every version above 1 needs an upcaster from the previous one.
+    """
+    if version > 1 and (name, version - 1) not in _UPCASTERS:
+        raise ValueError(f"Missing upcaster {name} v{version - 1} → v{version}")
+    _SCHEMAS[name] = max(version, _SCHEMAS.get(name, 0))
+
+
+def upcaster(name: str, from_version: int):
+    """
+    Decorator registering the v{from_version} → v{from_version + 1} step.
+    """
+
+    def decorator(fn: Callable[[Payload], Payload]):
+        _UPCASTERS[(name, from_version)] = fn
+        return fn
+
+    return decorator
+
+
+def latest_version(name: str) -> int:
+    try:
+        return _SCHEMAS[name]
+    except KeyError:
+        raise UnknownEventSchema(f"Unregistered event: {name}") from None
+
+
+def upcast(name: str, version: int, payload: Payload) -> Tuple[int, Payload]:
+    """
+    Applies registered upcasters until the payload is at the latest version.
+    """
+    target = latest_version(name)
+    if version > target:
+        raise UnknownEventSchema(f"{name} v{version} is newer than v{target}")
+
+    while version < target:
+        payload = _UPCASTERS[(name, version)](payload)
+        version += 1
+
+    return version, payload
+
+
+def _default(value: Any) -> Any:
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, datetime):
+        return value.isoformat()
+    raise TypeError(f"Cannot encode {type(value).__name__}")
+
+
+def encode(name: str, version: int, payload: Payload) -> bytes:
+    latest_version(name)  # refuse unregistered events at write time
+
+    body = msgpack.packb([name, version, payload], default=_default)
+    flags = 0
+
+    if len(body) >= COMPRESS_THRESHOLD_BYTES:
+        compressed = zlib.compress(body, 6)
+        if len(compressed) < len(body):
+            body, flags = compressed, _FLAG_COMPRESSED
+
+    return bytes((_FORMAT_VERSION, flags)) + body
+
+
+def decode(data: bytes, upcast_to_latest: bool = True) -> Tuple[str, int, Payload]:
+    if data[0] != _FORMAT_VERSION:
+        raise ValueError(f"Unsupported event encoding: {data[0]}")
+
+    body = data[2:]
+    if data[1] & _FLAG_COMPRESSED:
+        body = zlib.decompress(body)
+
+    name, version, payload = msgpack.unpackb(body)
+
+    if upcast_to_latest:
+        version, payload = upcast(name, version, payload)
+
+    return name, version, payload
+
+
+# --------------------------------------------------
+# Registered platform events
+# --------------------------------------------------
+register_event("payment.created", 1)
+register_event("payment.success", 1)
+register_event("payment.failed", 1)
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 from datetime import datetime
 from uuid import UUID
 
@@ -16,3 +16,30 @@ class EventEnvelope(BaseModel):
     version: int
     occurred_at: datetime
     payload: Dict[str, Any]
+    # Trace id + per-hop timestamps (app.core.tracing) — optional
+    trace: Optional[Dict[str, Any]] = None
+
+
+# Envelope fields the outbox relay flattens into the EventBridge detail
+_DETAIL_ENVELOPE_FIELDS = ("event_id", "event_type", "aggregate_id", "version", "occurred_at")
+
+
+def envelope_from_message(body: Dict[str, Any]) -> EventEnvelope:
+    """
+    Envelope from an SQS message body.
+
+    - EventBridge → SQS delivers {"detail-type", "detail": {...}} where
+      the detail is the flattened envelope written by the outbox relay
+    - Anything else is validated as an envelope as-is
+    """
+    if "detail" not in body:
+        return EventEnvelope.model_validate(body)
+
+    detail = dict(body["detail"])
+    envelope = {field: detail.pop(field, None) for field in _DETAIL_ENVELOPE_FIELDS}
+    envelope["event_type"] = envelope["event_type"] or body.get("detail-type")
+    envelope["aggregate_id"] = envelope["aggregate_id"] or detail.get("payment_id")
+    envelope["trace"] = detail.pop("trace", None)
+    detail.pop("replayed", None)
+
+    return EventEnvelope.model_validate({**envelope, "payload": detail})
@@ -1,9 +1,12 @@
-import uuid
-from fastapi import FastAPI, Request
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse
 from mangum import Mangum
 
+from app.api.responses import FastJSONResponse
 from app.api.routes import payments, notifications
-from app.core.logging import logger
+from app.core import metrics
+from app.core.logging import flushes_logs, logger
+from app.core.middleware import RequestContextMiddleware
 
 # --------------------------------------------------
 # FastAPI app
@@ -11,33 +14,15 @@ from app.core.logging import logger
 app = FastAPI(
     title="Event Driven Platform",
     redirect_slashes=False,
+    default_response_class=FastJSONResponse,
 )
 
 logger.info("🔥🔥 API IMAGE VERSION: 2026-02-11-FINAL-API-CLEAN 🔥🔥")
 
 # --------------------------------------------------
-# Middleware: Request ID + structured logging
+# Middleware: Request ID + stage timings (pure ASGI)
 # --------------------------------------------------
-@app.middleware("http")
-async def add_request_id(request: Request, call_next):
-    request_id = str(uuid.uuid4())
-    request.state.request_id = request_id
-
-    response = await call_next(request)
-
-    response.headers["X-Request-ID"] = request_id
-
-    logger.info(
-        "REQUEST_RECEIVED",
-        extra={
-            "request_id": request_id,
-            "method": request.method,
-            "path": request.url.path,
-            "status_code": response.status_code,
-        },
-    )
-
-    return response
+app.add_middleware(RequestContextMiddleware)
 
 
 # --------------------------------------------------
@@ -63,6 +48,19 @@ async def health():
     return {"status": "ok"}
 
 
+# --------------------------------------------------
+# Metrics (container mode only — Lambda flushes EMF)
+# --------------------------------------------------
+if metrics.METRICS_MODE == "prometheus":
+
+    @app.get("/metrics", tags=["system"], include_in_schema=False)
+    async def prometheus_metrics():
+        return PlainTextResponse(
+            metrics.render_prometheus(),
+            media_type="text/plain; version=0.0.4",
+        )
+
+
 # --------------------------------------------------
 # Startup (NO DB, NO NETWORK)
 # --------------------------------------------------
@@ -74,7 +72,11 @@ async def startup():
 # --------------------------------------------------
 # Lambda adapter (MUST be last)
 # --------------------------------------------------
-handler = Mangum(
-    app,
-    lifespan="off",
+handler = flushes_logs(
+    metrics.flushes_metrics(
+        Mangum(
+            app,
+            lifespan="off",
+        )
+    )
 )
\ No newline at end of file
@@ -0,0 +1,199 @@
+import argparse
+import asyncio
+import json
+import os
+import time
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Set
+
+from app.db.session import create_worker_session_factory
+from app.services.analytics_job import (
+    compute_daily_analytics,
+    upsert_daily_analytics,
+    upsert_hourly_latency,
+)
+from app.core.logging import logger
+
+DEFAULT_CONCURRENCY = 4
+
+# Bump when the per-day computation changes: checkpoints of an older
+# version no longer count as done
+BACKFILL_VERSION = 1
+
+
+# --------------------------------------------------
+# Checkpoint (resume an interrupted backfill)
+# --------------------------------------------------
+def default_checkpoint(start: date, end: date) -> str:
+    return f".analytics_backfill.{start.isoformat()}_{end.isoformat()}.v{BACKFILL_VERSION}.json"
+
+
+def _checkpoint_key(start: date, end: date) -> Dict[str, Any]:
+    return {"start": start.isoformat(), "end": end.isoformat(), "version": BACKFILL_VERSION}
+
+
+def _load_checkpoint(path: str, start: date, end: date) -> Set[date]:
+    """
+    Days completed by an interrupted run of the SAME (start, end, version);
+    a checkpoint written for anything else is ignored.
+    """
+    if not os.path.exists(path):
+        return set()
+
+    with open(path) as fh:
+        data = json.load(fh)
+
+    if data.get("key") != _checkpoint_key(start, end):
+        logger.warning(
+            "ANALYTICS_BACKFILL_CHECKPOINT_IGNORED",
+            extra={"path": path, "key": data.get("key")},
+        )
+        return set()
+
+    return {date.fromisoformat(day) for day in data.get("completed", [])}
+
+
+def _save_checkpoint(path: str, start: date, end: date, completed: Set[date]) -> None:
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w") as fh:
+        json.dump(
+            {
+                "key": _checkpoint_key(start, end),
+                "completed": sorted(day.isoformat() for day in completed),
+            },
+            fh,
+        )
+
+    os.replace(tmp_path, path)  # atomic — never leaves a torn checkpoint
+
+
+def _days(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=n) for n in range((end - start).days + 1)]
+
+
+async def run_backfill(
+    start: date,
+    end: date,
+    concurrency: int = DEFAULT_CONCURRENCY,
+    checkpoint_path: Optional[str] = None,
+    restart: bool = False,
+) -> Dict[str, Any]:
+    """
+    Rebuilds daily_payment_analytics for every day in [start, end].
+
+    - One chunk per day, each in its own transaction (upsert, idempotent)
+    - At most `concurrency` days in flight (one pooled session each)
+    - Completed days are checkpointed per (start, end, version); rerunning
+      resumes where it stopped, `restart` starts over. A successful run
+      deletes its checkpoint
+    - A failed day cancels the days still in flight before exiting
+    - Reports rows scanned per second for tuning `concurrency`
+    """
+    checkpoint_path = checkpoint_path or default_checkpoint(start, end)
+    days = _days(start, end)
+
+    completed = set() if restart else _load_checkpoint(checkpoint_path, start, end)
+    completed &= set(days)
+    pending = [day for day in days if day not in completed]
+
+    logger.info(
+        "ANALYTICS_BACKFILL_STARTED",
+        extra={
+            "start": start.isoformat(),
+            "end": end.isoformat(),
+            "pending_days": len(pending),
+            "skipped_days": len(completed),
+            "concurrency": concurrency,
+        },
+    )
+
+    engine, SessionLocal = create_worker_session_factory("analytics", pool_size=concurrency)
+    semaphore = asyncio.Semaphore(concurrency)
+    checkpoint_lock = asyncio.Lock()
+
+    stats = {"days": 0, "rows_scanned": 0}
+    started = time.monotonic()
+
+    async def backfill_day(day: date) -> None:
+        async with semaphore:
+            async with SessionLocal() as session:
+                async with session.begin():
+                    rows, hourly_rows = await compute_daily_analytics(
+                        session, day, day + timedelta(days=1)
+                    )
+                    await upsert_daily_analytics(session, rows)
+                    await upsert_hourly_latency(session, hourly_rows)
+
+        async with checkpoint_lock:
+            completed.add(day)
+            _save_checkpoint(checkpoint_path, start, end, completed)
+
+            stats["days"] += 1
+            stats["rows_scanned"] += rows[0]["total_payments"]
+            elapsed = time.monotonic() - started
+
+            logger.info(
+                "ANALYTICS_BACKFILL_DAY_DONE",
+                extra={
+                    "date": day.isoformat(),
+                    "rows": rows[0]["total_payments"],
+                    "progress": f"{stats['days']}/{len(pending)}",
+                    "rows_per_second": round(stats["rows_scanned"] / elapsed, 1),
+                },
+            )
+
+    tasks = [asyncio.create_task(backfill_day(day)) for day in pending]
+    try:
+        await asyncio.gather(*tasks)
+    finally:
+        # A failure leaves siblings running: stop them before the pool goes
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await engine.dispose()
+
+    if os.path.exists(checkpoint_path):
+        os.remove(checkpoint_path)
+
+    elapsed = time.monotonic() - started
+    summary = {
+        "status": "processed",
+        "days": stats["days"],
+        "rows_scanned": stats["rows_scanned"],
+        "elapsed_seconds": round(elapsed, 2),
+        "rows_per_second": round(stats["rows_scanned"] / elapsed, 1) if elapsed else 0.0,
+    }
+
+    logger.info("ANALYTICS_BACKFILL_COMPLETE", extra=summary)
+    return summary
+
+
+# --------------------------------------------------
+# CLI: python -m app.services.analytics_backfill 2026-01-01 2026-03-31
+# --------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Backfill daily payment analytics")
+    parser.add_argument("start", type=date.fromisoformat, help="first day (inclusive)")
+    parser.add_argument("end", type=date.fromisoformat, help="last day (inclusive)")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_CONCURRENCY)
+    parser.add_argument("--checkpoint", help="default: keyed by range and version")
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="ignore the checkpoint and recompute every day",
+    )
+    args = parser.parse_args()
+
+    if args.end < args.start:
+        parser.error("end must not be before start")
+
+    summary = asyncio.run(
+        run_backfill(
+            args.start, args.end, args.concurrency, args.checkpoint, args.restart
+        )
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,214 @@
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional
+
+from app.core.redis import get_redis
+from app.services.latency_sketch import LatencySketch, bucket_key
+from app.core.logging import logger
+
+# Counters outlive the day so late events and the compactor can still see them
+COUNTER_TTL_SECONDS = 3 * 24 * 3600
+# SQS is at-least-once: an event_id is only counted once within this window
+DEDUP_TTL_SECONDS = 24 * 3600
+
+# --------------------------------------------------
+# Atomic "dedupe then increment" (one round trip per event)
+# --------------------------------------------------
+# KEYS[1] = dedup key, KEYS[2..3] = day/hour counter hashes,
+# KEYS[4..5] = day/hour latency bucket hashes
+# ARGV[1] = dedup ttl, ARGV[2] = counter ttl
+# ARGV[3] = field to increment, ARGV[4] = latency seconds ("" if none)
+# ARGV[5] = latency bucket field
+_RECORD_SCRIPT = """
+if not redis.call("SET", KEYS[1], "1", "NX", "EX", ARGV[1]) then
+    return 0
+end
+for i = 2, 3 do
+    redis.call("HINCRBY", KEYS[i], ARGV[3], 1)
+    if ARGV[4] ~= "" then
+        redis.call("HINCRBYFLOAT", KEYS[i], "latency_sum", ARGV[4])
+        redis.call("HINCRBY", KEYS[i], "processed", 1)
+    end
+    redis.call("EXPIRE", KEYS[i], ARGV[2])
+end
+if ARGV[4] ~= "" then
+    for i = 4, 5 do
+        redis.call("HINCRBY", KEYS[i], ARGV[5], 1)
+        redis.call("EXPIRE", KEYS[i], ARGV[2])
+    end
+end
+return 1
+"""
+
+
+def day_key(day: date) -> str:
+    return f"analytics:day:{day.isoformat()}"
+
+
+def hour_key(ts: datetime) -> str:
+    return f"analytics:hour:{ts.strftime('%Y-%m-%dT%H')}"
+
+
+def latency_day_key(day: date) -> str:
+    return f"analytics:latency:day:{day.isoformat()}"
+
+
+def latency_hour_key(ts: datetime) -> str:
+    return f"analytics:latency:hour:{ts.strftime('%Y-%m-%dT%H')}"
+
+
+def _parse_ts(value: Any) -> Optional[datetime]:
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value)
+
+
+async def _record(
+    event_id: str,
+    bucket_ts: datetime,
+    field: str,
+    latency_seconds: Optional[float],
+) -> bool:
+    redis = await get_redis()
+    if not redis:
+        logger.warning("ANALYTICS_COUNTER_REDIS_UNAVAILABLE")
+        return False  # 🔥 FAIL OPEN — daily reconciliation fills the gap
+
+    bucket = None
+    if latency_seconds is not None:
+        key = bucket_key(latency_seconds)
+        bucket = "z" if key is None else str(key)
+
+    try:
+        counted = await redis.eval(
+            _RECORD_SCRIPT,
+            5,
+            f"analytics:seen:{event_id}",
+            day_key(bucket_ts.date()),
+            hour_key(bucket_ts),
+            latency_day_key(bucket_ts.date()),
+            latency_hour_key(bucket_ts),
+            DEDUP_TTL_SECONDS,
+            COUNTER_TTL_SECONDS,
+            field,
+            "" if latency_seconds is None else repr(latency_seconds),
+            bucket or "",
+        )
+        return bool(counted)
+
+    except Exception as exc:
+        logger.error(
+            "ANALYTICS_COUNTER_ERROR",
+            extra={"error": str(exc), "event_id": event_id},
+        )
+        return False
+
+
+async def record_payment_created(event_id: str, payload: Dict[str, Any]) -> bool:
+    """
+    Counts a new payment in the bucket of its creation time.
+    """
+    created_at = _parse_ts(payload.get("created_at")) or datetime.utcnow()
+    return await _record(event_id, created_at, "total", None)
+
+
+async def record_payment_outcome(event_id: str, payload: Dict[str, Any]) -> bool:
+    """
+    Counts a terminal outcome (SUCCESS / FAILED) plus its processing latency.
+
+    Bucketed by payment created_at so the counters line up with the
+    batch job's GROUP BY date(created_at).
+    """
+    created_at = _parse_ts(payload.get("created_at"))
+    processed_at = _parse_ts(payload.get("processed_at"))
+
+    if not created_at:
+        logger.warning(
+            "ANALYTICS_OUTCOME_MISSING_CREATED_AT",
+            extra={"event_id": event_id},
+        )
+        return False
+
+    field = "success" if payload.get("status") == "SUCCESS" else "failed"
+    latency = (
+        (processed_at - created_at).total_seconds() if processed_at else None
+    )
+
+    return await _record(event_id, created_at, field, latency)
+
+
+def counters_to_row(
+    day: date,
+    counters: Dict[str, str],
+    latency_buckets: Optional[Dict[str, str]] = None,
+) -> Dict[str, Any]:
+    """
+    Converts Redis counter (+ latency bucket) hashes into a
+    daily_payment_analytics row.
+    """
+    success = int(counters.get("success", 0))
+    failed = int(counters.get("failed", 0))
+    # created events can arrive after their outcome (or be lost) — never
+    # report fewer payments than terminal outcomes
+    total = max(int(counters.get("total", 0)), success + failed)
+    processed = int(counters.get("processed", 0))
+    latency_sum = float(counters.get("latency_sum", 0.0))
+
+    return {
+        "date": day,
+        "total_payments": total,
+        "successful_payments": success,
+        "failed_payments": failed,
+        "failure_rate": failed / total if total else 0.0,
+        "avg_processing_time_seconds": (
+            latency_sum / processed if processed else None
+        ),
+        "latency_sketch": (
+            LatencySketch.from_counts(latency_buckets).to_bytes()
+            if latency_buckets
+            else None
+        ),
+    }
+
+
+async def get_live_counters(day: date) -> Dict[str, Any]:
+    """
+    Near-real-time view for dashboards: day totals + per-hour breakdown.
+    Constant cost (26 hash reads, one round trip).
+    """
+    redis = await get_redis()
+    if not redis:
+        return {}
+
+    start = datetime.combine(day, datetime.min.time())
+    hours = [start + timedelta(hours=h) for h in range(24)]
+
+    pipe = redis.pipeline(transaction=False)
+    pipe.hgetall(day_key(day))
+    pipe.hgetall(latency_day_key(day))
+    for hour in hours:
+        pipe.hgetall(hour_key(hour))
+    day_counters, day_latency, *hour_counters = await pipe.execute()
+
+    hourly: List[Dict[str, Any]] = []
+    for hour, counters in zip(hours, hour_counters):
+        if counters:
+            row = counters_to_row(day, counters)
+            row["hour"] = hour.isoformat()
+            del row["date"], row["latency_sketch"]
+            hourly.append(row)
+
+    sketch = LatencySketch.from_counts(day_latency)
+    day_row = counters_to_row(day, day_counters)
+    del day_row["latency_sketch"]
+
+    return {
+        "day": {
+            **day_row,
+            "p50": sketch.quantile(0.5),
+            "p95": sketch.quantile(0.95),
+            "p99": sketch.quantile(0.99),
+        },
+        "hourly": hourly,
+    }
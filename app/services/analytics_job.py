@@ -1,48 +1,257 @@
-from sqlalchemy.future import select
-from datetime import date
+import asyncio
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, List, Optional, Tuple
 
-from app.db.session import create_session_factory
-from app.shared.models import Payment, DailyPaymentAnalytics
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.db.session import create_worker_session_factory
+from app.shared.models import (
+    Payment,
+    PaymentStatus,
+    DailyPaymentAnalytics,
+    HourlyPaymentLatency,
+)
+from app.services.latency_sketch import LatencySketch, LOG_GAMMA, MIN_VALUE
+from app.core.logging import flushes_logs, logger
 
 
-async def run_daily_analytics():
-    import pandas as pd  # lazy import
+def _day_bounds(start: date, end: date):
+    """
+    Half-open [start, end) range as naive UTC datetimes.
+    payments.created_at is stored as naive UTC, so compare like with like
+    (keeps the predicate sargable on ix_payments_created_at).
+    """
+    return (
+        datetime.combine(start, datetime.min.time()),
+        datetime.combine(end, datetime.min.time()),
+    )
 
-    engine, SessionLocal = create_session_factory()
 
-    try:
-        async with SessionLocal() as session:
-            result = await session.execute(select(Payment))
-            payments = result.scalars().all()
+def _latency_seconds():
+    return func.extract("epoch", Payment.processed_at - Payment.created_at)
+
+
+def status_aggregate_query(range_start: datetime, range_end: datetime):
+    day_col = func.date(Payment.created_at).label("day")
+    latency = _latency_seconds()
+
+    return (
+        select(
+            day_col,
+            Payment.status,
+            func.count().label("payments"),
+            func.count(Payment.processed_at).label("processed"),
+            func.sum(latency).label("latency_sum"),
+        )
+        .where(
+            Payment.created_at >= range_start,
+            Payment.created_at < range_end,
+        )
+        .group_by(day_col, Payment.status)
+    )
+
+
+def latency_bucket_query(range_start: datetime, range_end: datetime):
+    latency = _latency_seconds()
+    hour_col = func.date_trunc("hour", Payment.created_at).label("hour")
+    bucket_col = case(
+        (latency > MIN_VALUE, func.ceil(func.ln(latency) / LOG_GAMMA)),
+        else_=None,
+    ).label("bucket")
+
+    return (
+        select(hour_col, bucket_col, func.count().label("payments"))
+        .where(
+            Payment.created_at >= range_start,
+            Payment.created_at < range_end,
+            Payment.processed_at.is_not(None),
+        )
+        .group_by(hour_col, bucket_col)
+    )
+
+
+async def _hourly_latency_sketches(
+    session: AsyncSession,
+    range_start: datetime,
+    range_end: datetime,
+) -> Dict[datetime, LatencySketch]:
+    """
+    Builds per-hour latency sketches with one GROUP BY (hour, bucket).
+
+    Bucket keys are computed in SQL with the same formula as
+    latency_sketch.bucket_key, so only a few hundred rows per hour
+    leave the database.
+    """
+    result = await session.execute(latency_bucket_query(range_start, range_end))
+
+    sketches: Dict[datetime, LatencySketch] = {}
+    for row in result:
+        sketch = sketches.setdefault(row.hour, LatencySketch())
+        sketch.add_bucket(
+            None if row.bucket is None else int(row.bucket),
+            row.payments,
+        )
+
+    return sketches
+
+
+async def compute_daily_analytics(
+    session: AsyncSession,
+    start: date,
+    end: date,
+) -> Tuple[List[Dict[str, Any]], List[Dict[str, Any]]]:
+    """
+    Aggregates payments created in [start, end) inside Postgres.
+
+    One GROUP BY (date, status) over an indexed created_at range —
+    the cost is O(rows in range), never O(all history).
+    Every day in the range gets a row (zero-filled), so reruns also
+    correct days whose payments were removed.
+
+    Returns (daily rows, hourly latency rows).
+    """
+    range_start, range_end = _day_bounds(start, end)
+
+    result = await session.execute(status_aggregate_query(range_start, range_end))
+
+    buckets: Dict[date, Dict[str, float]] = {}
+    day = start
+    while day < end:
+        buckets[day] = {
+            "total": 0,
+            "success": 0,
+            "failed": 0,
+            "processed": 0,
+            "latency_sum": 0.0,
+        }
+        day += timedelta(days=1)
 
-            if not payments:
-                return
+    for row in result:
+        bucket = buckets[row.day]
+        bucket["total"] += row.payments
+        bucket["processed"] += row.processed
+        bucket["latency_sum"] += float(row.latency_sum or 0.0)
 
-            df = pd.DataFrame(
-                [
-                    {"status": p.status.value, "created_at": p.created_at.date()}
-                    for p in payments
-                ]
-            )
+        if row.status == PaymentStatus.SUCCESS:
+            bucket["success"] += row.payments
+        elif row.status == PaymentStatus.FAILED:
+            bucket["failed"] += row.payments
 
-            today = date.today()
-            today_df = df[df["created_at"] == today]
+    hourly = await _hourly_latency_sketches(session, range_start, range_end)
 
-            total = len(today_df)
-            success = len(today_df[today_df["status"] == "SUCCESS"])
-            failed = len(today_df[today_df["status"] == "FAILED"])
+    daily_sketches: Dict[date, LatencySketch] = {}
+    for hour, sketch in hourly.items():
+        daily_sketches.setdefault(hour.date(), LatencySketch()).merge(sketch)
 
-            analytics = DailyPaymentAnalytics(
-                date=today,
-                total_payments=total,
-                successful_payments=success,
-                failed_payments=failed,
-                failure_rate=failed / total if total else 0,
-            )
+    rows = []
+    for day, bucket in buckets.items():
+        total = bucket["total"]
+        processed = bucket["processed"]
+        sketch = daily_sketches.get(day)
+        rows.append(
+            {
+                "date": day,
+                "total_payments": total,
+                "successful_payments": bucket["success"],
+                "failed_payments": bucket["failed"],
+                "failure_rate": bucket["failed"] / total if total else 0.0,
+                "avg_processing_time_seconds": (
+                    bucket["latency_sum"] / processed if processed else None
+                ),
+                "latency_sketch": sketch.to_bytes() if sketch else None,
+            }
+        )
 
-            session.add(analytics)
-            await session.commit()
+    hourly_rows = [
+        {"hour": hour, "latency_sketch": sketch.to_bytes()}
+        for hour, sketch in sorted(hourly.items())
+    ]
+
+    return rows, hourly_rows
+
+
+async def upsert_daily_analytics(
+    session: AsyncSession,
+    rows: List[Dict[str, Any]],
+) -> None:
+    """
+    INSERT … ON CONFLICT (date) DO UPDATE.
+    Reruns overwrite the metrics in place (idempotent).
+    """
+    if not rows:
+        return
+
+    stmt = insert(DailyPaymentAnalytics).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[DailyPaymentAnalytics.date],
+        set_={
+            "total_payments": stmt.excluded.total_payments,
+            "successful_payments": stmt.excluded.successful_payments,
+            "failed_payments": stmt.excluded.failed_payments,
+            "failure_rate": stmt.excluded.failure_rate,
+            "avg_processing_time_seconds": stmt.excluded.avg_processing_time_seconds,
+            "latency_sketch": stmt.excluded.latency_sketch,
+        },
+    )
+
+    await session.execute(stmt)
+
+
+async def upsert_hourly_latency(
+    session: AsyncSession,
+    rows: List[Dict[str, Any]],
+) -> None:
+    """
+    INSERT … ON CONFLICT (hour) DO UPDATE for hourly latency sketches.
+    """
+    if not rows:
+        return
+
+    stmt = insert(HourlyPaymentLatency).values(rows)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[HourlyPaymentLatency.hour],
+        set_={"latency_sketch": stmt.excluded.latency_sketch},
+    )
+
+    await session.execute(stmt)
+
+
+async def run_daily_analytics(day: Optional[date] = None):
+    """
+    Computes and upserts analytics for a single UTC day (default: today).
+    """
+    day = day or datetime.utcnow().date()
+
+    engine, SessionLocal = create_worker_session_factory("analytics")
+
+    try:
+        async with SessionLocal() as session:
+            async with session.begin():
+                rows, hourly_rows = await compute_daily_analytics(
+                    session, day, day + timedelta(days=1)
+                )
+                await upsert_daily_analytics(session, rows)
+                await upsert_hourly_latency(session, hourly_rows)
+
+        logger.info(
+            "DAILY_ANALYTICS_UPSERTED",
+            extra={
+                "date": day.isoformat(),
+                "total_payments": rows[0]["total_payments"],
+            },
+        )
+
+        return {"status": "processed", "date": day.isoformat()}
 
     finally:
         await engine.dispose()
+
+
+# --------------------------------------------------
+# Lambda Entrypoint
+# --------------------------------------------------
+@flushes_logs
+def handler(event, context):
+    return asyncio.run(run_daily_analytics())
@@ -1,15 +1,18 @@
 import os
-import json
-import boto3
-from botocore.exceptions import ClientError, BotoCoreError
+
+from app.core import metrics
+from app.core.serialization import dumps_str
+from app.transport.base import get_event_bus
 
 EVENT_BUS_NAME = os.getenv("EVENT_BUS_NAME", "default")
 
 
 def get_eventbridge_client():
-    return boto3.client("events")
+    # boto3 EventBridge client, or the in-memory bus (TRANSPORT=memory)
+    return get_event_bus()
 
 
+@metrics.timed("eventbridge.publish_ms")
 def publish_event(
     *,
     event_type: str,
@@ -23,6 +26,8 @@ def publish_event(
     Used ONLY by outbox_publisher.
     """
 
+    from botocore.exceptions import ClientError, BotoCoreError  # lazy import
+
     client = get_eventbridge_client()
 
     try:
@@ -31,18 +36,20 @@ def publish_event(
                 {
                     "Source": "event-platform.payments",
                     "DetailType": event_type,   # 🔥 DO NOT concatenate version here
-                    "Detail": json.dumps(payload),
+                    "Detail": dumps_str(payload),
                     "EventBusName": EVENT_BUS_NAME,
                 }
             ]
         )
 
         if response.get("FailedEntryCount", 0) > 0:
+            metrics.incr("eventbridge.publish_failed")
             raise RuntimeError(
                 f"EventBridge failed for event_id={event_id}"
             )
 
     except (ClientError, BotoCoreError) as exc:
+        metrics.incr("eventbridge.publish_failed")
         raise RuntimeError(
             f"EventBridge exception for event_id={event_id}: {exc}"
         ) from exc
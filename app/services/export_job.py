@@ -0,0 +1,307 @@
+import argparse
+import asyncio
+import enum
+import json
+import os
+import uuid
+from collections import deque
+from datetime import date, datetime, timedelta
+from typing import Any, Deque, Dict, List, Optional, Sequence, Set, Tuple
+
+from sqlalchemy import DateTime, Integer, JSON, LargeBinary, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import create_worker_session_factory
+from app.db.models.outbox import OutboxEvent
+from app.shared.models import Payment
+from app.core.logging import logger
+
+DEFAULT_CHUNK_SIZE = 10_000
+
+# created_at is set at flush, the row becomes visible at commit: rows can
+# commit behind the watermark. Each incremental run re-scans this far back
+# and skips ids it already exported.
+EXPORT_LOOKBACK = timedelta(seconds=float(os.getenv("EXPORT_LOOKBACK_SECONDS", "600")))
+
+# Tables finance may export, keyed on created_at for incremental runs
+EXPORTABLE_TABLES = {
+    "payments": Payment,
+    "outbox_events": OutboxEvent,
+}
+
+
+def _arrow_type(column):
+    import pyarrow as pa  # lazy import
+
+    if isinstance(column.type, Integer):
+        return pa.int64()
+    if isinstance(column.type, DateTime):
+        return pa.timestamp("us", tz="UTC" if column.type.timezone else None)
+    if isinstance(column.type, LargeBinary):
+        return pa.binary()
+    return pa.string()  # UUID / String / Enum / JSON
+
+
+def _to_arrow_value(value: Any, column) -> Any:
+    if value is None:
+        return None
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, enum.Enum):
+        return value.value
+    if isinstance(column.type, JSON):
+        return json.dumps(value)
+    return value
+
+
+def _watermark_path(table_dir: str) -> str:
+    return os.path.join(table_dir, "_watermark.json")
+
+
+def _read_watermark(table_dir: str) -> Tuple[Optional[datetime], Set[str]]:
+    """
+    (created_at of the last exported row, ids exported within the
+    lookback window before it).
+    """
+    path = _watermark_path(table_dir)
+    if not os.path.exists(path):
+        return None, set()
+
+    with open(path) as fh:
+        data = json.load(fh)
+    return datetime.fromisoformat(data["created_at"]), set(data.get("recent_ids", []))
+
+
+def _write_watermark(
+    table_dir: str,
+    created_at: datetime,
+    last_id: str,
+    recent_ids: Sequence[str],
+) -> None:
+    path = _watermark_path(table_dir)
+    with open(f"{path}.tmp", "w") as fh:
+        json.dump(
+            {
+                "created_at": created_at.isoformat(),
+                "id": last_id,
+                "recent_ids": list(recent_ids),
+            },
+            fh,
+        )
+    os.replace(f"{path}.tmp", path)
+
+
+class _PartitionedWriter:
+    """
+    Writes Parquet files partitioned by created_at date.
+
+    Rows arrive ordered by created_at, so at most ONE file is open at a
+    time and memory is bounded by a single chunk.
+
+    Files are written under hidden temporary names (ignored by Parquet
+    readers) and only renamed into place by commit(); abort() removes
+    them, so a failed run leaves no partial parts behind.
+    """
+
+    def __init__(self, table_dir: str, columns: List, run_id: str):
+        import pyarrow as pa  # lazy import
+
+        self._table_dir = table_dir
+        self._columns = columns
+        self._run_id = run_id
+        self._schema = pa.schema(
+            [pa.field(column.name, _arrow_type(column)) for column in columns]
+        )
+        self._writer = None
+        self._partition: Optional[date] = None
+        self.files: List[str] = []
+        self._pending: List[str] = []
+
+    def _open(self, partition: date) -> None:
+        import pyarrow.parquet as pq  # lazy import
+
+        self.close()
+
+        partition_dir = os.path.join(self._table_dir, f"date={partition.isoformat()}")
+        os.makedirs(partition_dir, exist_ok=True)
+
+        path = os.path.join(partition_dir, f"part-{self._run_id}.parquet")
+        tmp_path = os.path.join(partition_dir, f".part-{self._run_id}.parquet.tmp")
+        self._writer = pq.ParquetWriter(tmp_path, self._schema, compression="zstd")
+        self._partition = partition
+        self.files.append(path)
+        self._pending.append(tmp_path)
+
+    def write(self, partition: date, rows: List[Sequence[Any]]) -> None:
+        import pyarrow as pa  # lazy import
+
+        if partition != self._partition:
+            self._open(partition)
+
+        arrays = [
+            pa.array(
+                [_to_arrow_value(row[i], column) for row in rows],
+                type=field.type,
+            )
+            for i, (column, field) in enumerate(zip(self._columns, self._schema))
+        ]
+        self._writer.write_table(pa.Table.from_arrays(arrays, schema=self._schema))
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+    def commit(self) -> None:
+        self.close()
+        for tmp_path, path in zip(self._pending, self.files):
+            os.replace(tmp_path, path)
+        self._pending = []
+
+    def abort(self) -> None:
+        self.close()
+        for tmp_path in self._pending:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        self._pending, self.files = [], []
+
+
+async def export_table(
+    session: AsyncSession,
+    table: str,
+    output_dir: str,
+    columns: Optional[Sequence[str]] = None,
+    since: Optional[datetime] = None,
+    incremental: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Dict[str, Any]:
+    """
+    Streams `table` into date-partitioned Parquet files.
+
+    - Server-side cursor (yield_per) → flat memory, whatever the table size
+    - Column projection: only requested columns leave the database
+    - Incremental: (created_at, id) order; resumes EXPORT_LOOKBACK before
+      the watermark and skips ids already exported, so rows committed
+      late behind the watermark are picked up exactly once
+    - Parts become visible only when the whole run succeeded
+    """
+    model = EXPORTABLE_TABLES[table]
+    table_columns = model.__table__.columns
+
+    names = list(columns) if columns else [column.name for column in table_columns]
+    unknown = set(names) - set(table_columns.keys())
+    if unknown:
+        raise ValueError(f"Unknown columns for {table}: {sorted(unknown)}")
+
+    selected = [table_columns[name] for name in names]
+    created_at = model.__table__.c.created_at
+    row_id = model.__table__.c.id
+
+    table_dir = os.path.join(output_dir, table)
+    watermark, exported_ids = None, set()
+    if since is None and incremental:
+        watermark, exported_ids = _read_watermark(table_dir)
+        if watermark is not None:
+            since = watermark - EXPORT_LOOKBACK
+
+    stmt = (
+        select(*selected, created_at.label("_export_created_at"), row_id.label("_export_id"))
+        .where(created_at.is_not(None))
+        .order_by(created_at.asc(), row_id.asc())
+        .execution_options(yield_per=chunk_size)
+    )
+    if since is not None:
+        stmt = stmt.where(created_at >= since)
+
+    writer = _PartitionedWriter(table_dir, selected, uuid.uuid4().hex[:12])
+    exported = 0
+    last_id: Optional[str] = None
+    # (created_at, id) of every row scanned within the lookback window
+    recent: Deque[Tuple[datetime, str]] = deque()
+
+    try:
+        result = await session.stream(stmt)
+
+        async for chunk in result.partitions(chunk_size):
+            # split the (ordered) chunk at date boundaries
+            run: List[Sequence[Any]] = []
+            run_date: Optional[date] = None
+
+            for row in chunk:
+                row_created_at, key = row[-2], str(row[-1])
+                recent.append((row_created_at, key))
+                while recent[0][0] < row_created_at - EXPORT_LOOKBACK:
+                    recent.popleft()
+                watermark, last_id = row_created_at, key
+
+                if key in exported_ids:
+                    continue
+
+                row_date = row_created_at.date()
+                if run and row_date != run_date:
+                    writer.write(run_date, run)
+                    run = []
+                run_date = row_date
+                run.append(row)
+                exported += 1
+
+            if run:
+                writer.write(run_date, run)
+
+        writer.commit()
+    except BaseException:
+        writer.abort()
+        raise
+
+    if incremental and last_id is not None:
+        _write_watermark(table_dir, watermark, last_id, [key for _, key in recent])
+
+    summary = {
+        "table": table,
+        "rows": exported,
+        "files": len(writer.files),
+        "watermark": watermark.isoformat() if watermark else None,
+    }
+
+    logger.info("EXPORT_TABLE_COMPLETE", extra=summary)
+    return summary
+
+
+async def run_export(table: str, output_dir: str, **kwargs) -> Dict[str, Any]:
+    engine, SessionLocal = create_worker_session_factory("analytics", pool_size=1)
+
+    try:
+        async with SessionLocal() as session:
+            return await export_table(session, table, output_dir, **kwargs)
+    finally:
+        await engine.dispose()
+
+
+# --------------------------------------------------
+# CLI: python -m app.services.export_job payments ./exports
+# --------------------------------------------------
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Stream a table to Parquet")
+    parser.add_argument("table", choices=sorted(EXPORTABLE_TABLES))
+    parser.add_argument("output_dir")
+    parser.add_argument("--columns", help="comma separated projection")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--full", action="store_true", help="ignore the watermark")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_CHUNK_SIZE)
+    args = parser.parse_args()
+
+    summary = asyncio.run(
+        run_export(
+            args.table,
+            args.output_dir,
+            columns=args.columns.split(",") if args.columns else None,
+            since=args.since,
+            incremental=not args.full,
+            chunk_size=args.chunk_size,
+        )
+    )
+    print(json.dumps(summary))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+import os
+import time
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from sqlalchemy import text
+
+from app.core import metrics
+from app.core.redis import get_redis
+from app.transport.base import get_queue_client
+from app.db.session import read_session
+from app.core.logging import logger
+
+# Results are shared by every caller for this long (health-check storms
+# cost one probe round per TTL per container)
+HEALTH_CACHE_TTL_SECONDS = float(os.getenv("HEALTH_CACHE_TTL_SECONDS", "5"))
+PROBE_TIMEOUT_SECONDS = float(os.getenv("PROBE_TIMEOUT_SECONDS", "1"))
+
+# Backlog is counted up to this many rows (bounded index-only scan)
+OUTBOX_BACKLOG_COUNT_CAP = int(os.getenv("OUTBOX_BACKLOG_COUNT_CAP", "10000"))
+OUTBOX_MAX_LAG_SECONDS = float(os.getenv("OUTBOX_MAX_LAG_SECONDS", "60"))
+DLQ_MAX_DEPTH = int(os.getenv("DLQ_MAX_DEPTH", "0"))
+
+_OUTBOX_QUERY = text(
+    """
+    SELECT
+        (SELECT min(occurred_at)
+         FROM outbox_events
+         WHERE published_at IS NULL) AS oldest_unpublished,
+        (SELECT count(*)
+         FROM (SELECT 1
+               FROM outbox_events
+               WHERE published_at IS NULL
+               LIMIT :cap) backlog) AS backlog
+    """
+)
+
+
+# --------------------------------------------------
+# Probes
+# --------------------------------------------------
+async def probe_database() -> Dict[str, Any]:
+    """
+    DB reachability + outbox lag in ONE round trip on the primary.
+    Both subqueries are served by ix_outbox_events_unpublished.
+
+    Only reachability gates readiness: a lagging relay is reported as
+    `degraded` (and gauged) — pulling API containers out of rotation
+    would not drain the outbox any faster.
+    """
+    async with read_session(strong=True) as session:
+        row = (
+            await session.execute(_OUTBOX_QUERY, {"cap": OUTBOX_BACKLOG_COUNT_CAP})
+        ).one()
+
+    oldest_age = None
+    if row.oldest_unpublished is not None:
+        oldest_age = (
+            datetime.now(timezone.utc) - row.oldest_unpublished
+        ).total_seconds()
+
+    lagging = oldest_age is not None and oldest_age > OUTBOX_MAX_LAG_SECONDS
+
+    metrics.gauge("outbox.backlog", row.backlog)
+    metrics.gauge("outbox.oldest_unpublished_age_seconds", oldest_age or 0.0)
+    metrics.gauge("outbox.lagging", int(lagging))
+
+    return {
+        "ok": True,
+        "degraded": lagging,
+        "outbox_backlog": row.backlog,
+        "outbox_backlog_capped": row.backlog >= OUTBOX_BACKLOG_COUNT_CAP,
+        "outbox_oldest_age_seconds": round(oldest_age, 1) if oldest_age is not None else None,
+    }
+
+
+async def probe_redis() -> Dict[str, Any]:
+    # get_redis() pings and fails open (None) on its own
+    client = await get_redis()
+    if client is None:
+        return {"ok": False}
+
+    await client.close()
+    return {"ok": True}
+
+
+async def probe_dlq() -> Dict[str, Any]:
+    dlq_url = os.getenv("DLQ_URL")
+    if not dlq_url:
+        return {"ok": True, "configured": False}
+
+    # boto3 is blocking — keep it off the event loop
+    attributes = (
+        await asyncio.to_thread(
+            get_queue_client().get_queue_attributes,
+            QueueUrl=dlq_url,
+            AttributeNames=[
+                "ApproximateNumberOfMessages",
+                "ApproximateNumberOfMessagesNotVisible",
+            ],
+        )
+    )["Attributes"]
+
+    depth = int(attributes["ApproximateNumberOfMessages"]) + int(
+        attributes["ApproximateNumberOfMessagesNotVisible"]
+    )
+    metrics.gauge("dlq.depth", depth)
+
+    return {"ok": depth <= DLQ_MAX_DEPTH, "depth": depth}
+
+
+# name → (probe, required for readiness)
+PROBES: Dict[str, tuple] = {
+    "database": (probe_database, True),
+    "redis": (probe_redis, False),  # rate limit / idempotency fail open
+    "dlq": (probe_dlq, False),
+}
+
+
+async def _run_probe(name: str, probe: Callable[[], Awaitable[Dict]]) -> Dict[str, Any]:
+    started = time.perf_counter()
+    try:
+        result = await asyncio.wait_for(probe(), timeout=PROBE_TIMEOUT_SECONDS)
+    except asyncio.TimeoutError:
+        result = {"ok": False, "error": "timeout"}
+    except Exception as exc:
+        result = {"ok": False, "error": str(exc)}
+
+    result["latency_ms"] = round((time.perf_counter() - started) * 1000, 1)
+    return result
+
+
+async def _check_all() -> Dict[str, Any]:
+    names = list(PROBES)
+    results = await asyncio.gather(
+        *(_run_probe(name, PROBES[name][0]) for name in names)
+    )
+    checks = dict(zip(names, results))
+
+    if not all(checks[name]["ok"] for name in names if PROBES[name][1]):
+        status = "not_ready"
+    elif not all(check["ok"] and not check.get("degraded") for check in checks.values()):
+        status = "degraded"
+    else:
+        status = "ready"
+
+    if status != "ready":
+        logger.warning("READINESS_DEGRADED", extra={"status": status, "checks": checks})
+
+    return {
+        "status": status,
+        "checked_at": datetime.now(timezone.utc).isoformat(),
+        "checks": checks,
+    }
+
+
+# --------------------------------------------------
+# TTL cache + single flight
+# --------------------------------------------------
+_cached: Optional[Dict[str, Any]] = None
+_cached_at = 0.0
+_inflight: Optional["asyncio.Future"] = None
+
+
+async def readiness() -> Dict[str, Any]:
+    """
+    Cached readiness report.
+
+    - Fresh result (< TTL) → returned without touching any dependency
+    - Concurrent misses share ONE in-flight probe round
+    """
+    global _cached, _cached_at, _inflight
+
+    if _cached is not None and time.monotonic() - _cached_at < HEALTH_CACHE_TTL_SECONDS:
+        return _cached
+
+    loop = asyncio.get_running_loop()
+    if _inflight is None or _inflight.done() or _inflight.get_loop() is not loop:
+        _inflight = asyncio.ensure_future(_check_all())
+
+    report = await asyncio.shield(_inflight)
+    _cached, _cached_at = report, time.monotonic()
+    return report
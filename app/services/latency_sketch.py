@@ -0,0 +1,210 @@
+import math
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Sequence
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.shared.models import DailyPaymentAnalytics, HourlyPaymentLatency
+
+# --------------------------------------------------
+# Log-bucketed sketch (DDSketch style)
+# --------------------------------------------------
+# Every quantile is returned within ±1% of the true value, whatever the
+# distribution. Buckets are exact counts, so merging is plain addition —
+# merging N days gives the same answer as sketching the N days at once.
+RELATIVE_ACCURACY = 0.01
+GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+LOG_GAMMA = math.log(GAMMA)
+
+# Latencies at or below 1ms collapse into a single "zero" bucket
+MIN_VALUE = 0.001
+
+_FORMAT_VERSION = 1
+
+
+def bucket_key(seconds: float) -> Optional[int]:
+    """
+    Bucket index for a latency; None means the zero bucket.
+    Mirrored in SQL by analytics_job (ceil(ln(x) / ln(gamma))).
+    """
+    if seconds <= MIN_VALUE:
+        return None
+    return math.ceil(math.log(seconds) / LOG_GAMMA)
+
+
+def _write_varint(out: bytearray, value: int) -> None:
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+
+
+def _read_varint(data: bytes, pos: int):
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if not byte & 0x80:
+            return result, pos
+        shift += 7
+
+
+class LatencySketch:
+    """
+    Mergeable latency distribution.
+
+    Serialized form (a few hundred bytes at most):
+    version | zero_count | n_buckets | (zigzag key delta, count)*
+    """
+
+    __slots__ = ("buckets", "zero_count")
+
+    def __init__(self):
+        self.buckets: Dict[int, int] = {}
+        self.zero_count = 0
+
+    @property
+    def count(self) -> int:
+        return self.zero_count + sum(self.buckets.values())
+
+    def add(self, seconds: float, count: int = 1) -> None:
+        self.add_bucket(bucket_key(seconds), count)
+
+    def add_bucket(self, key: Optional[int], count: int) -> None:
+        if key is None:
+            self.zero_count += count
+        else:
+            self.buckets[key] = self.buckets.get(key, 0) + count
+
+    def merge(self, other: "LatencySketch") -> "LatencySketch":
+        self.zero_count += other.zero_count
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        return self
+
+    def quantile(self, q: float) -> Optional[float]:
+        total = self.count
+        if not total:
+            return None
+
+        rank = q * (total - 1)
+        seen = self.zero_count
+        if rank < seen:
+            return 0.0
+
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if rank < seen:
+                return 2 * GAMMA ** key / (GAMMA + 1)
+
+        return 2 * GAMMA ** max(self.buckets) / (GAMMA + 1)
+
+    def to_bytes(self) -> bytes:
+        out = bytearray([_FORMAT_VERSION])
+        _write_varint(out, self.zero_count)
+        _write_varint(out, len(self.buckets))
+
+        previous = 0
+        for key in sorted(self.buckets):
+            delta = key - previous
+            _write_varint(out, (delta << 1) ^ (delta >> 63))  # zigzag
+            _write_varint(out, self.buckets[key])
+            previous = key
+
+        return bytes(out)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "LatencySketch":
+        if data[0] != _FORMAT_VERSION:
+            raise ValueError(f"Unsupported sketch version: {data[0]}")
+
+        sketch = cls()
+        sketch.zero_count, pos = _read_varint(data, 1)
+        n_buckets, pos = _read_varint(data, pos)
+
+        key = 0
+        for _ in range(n_buckets):
+            zigzag, pos = _read_varint(data, pos)
+            count, pos = _read_varint(data, pos)
+            key += (zigzag >> 1) ^ -(zigzag & 1)
+            sketch.buckets[key] = count
+
+        return sketch
+
+    @classmethod
+    def from_counts(cls, counts: Dict[str, str]) -> "LatencySketch":
+        """
+        Builds a sketch from a Redis bucket hash ("z" = zero bucket).
+        """
+        sketch = cls()
+        for key, count in counts.items():
+            sketch.add_bucket(None if key == "z" else int(key), int(count))
+        return sketch
+
+
+def merge_sketches(blobs: Iterable[Optional[bytes]]) -> LatencySketch:
+    merged = LatencySketch()
+    for blob in blobs:
+        if blob:
+            merged.merge(LatencySketch.from_bytes(blob))
+    return merged
+
+
+def _summarise(
+    sketch: LatencySketch,
+    quantiles: Sequence[float],
+) -> Dict[str, Optional[float]]:
+    summary: Dict[str, Optional[float]] = {"count": sketch.count}
+    for q in quantiles:
+        summary[f"p{q * 100:g}"] = sketch.quantile(q)
+    return summary
+
+
+# --------------------------------------------------
+# Range queries (merge stored sketches, never rescan payments)
+# --------------------------------------------------
+async def daily_latency_percentiles(
+    session: AsyncSession,
+    start: date,
+    end: date,
+    quantiles: Sequence[float] = (0.5, 0.95, 0.99),
+) -> Dict[str, Optional[float]]:
+    """
+    Latency percentiles for payments created in [start, end).
+    """
+    result = await session.execute(
+        select(DailyPaymentAnalytics.latency_sketch).where(
+            DailyPaymentAnalytics.date >= start,
+            DailyPaymentAnalytics.date < end,
+        )
+    )
+    return _summarise(merge_sketches(result.scalars()), quantiles)
+
+
+async def hourly_latency_percentiles(
+    session: AsyncSession,
+    start: datetime,
+    end: datetime,
+    quantiles: Sequence[float] = (0.5, 0.95, 0.99),
+) -> List[Dict[str, object]]:
+    """
+    Per-hour latency percentiles for payments created in [start, end).
+    """
+    result = await session.execute(
+        select(HourlyPaymentLatency.hour, HourlyPaymentLatency.latency_sketch)
+        .where(
+            HourlyPaymentLatency.hour >= start,
+            HourlyPaymentLatency.hour < end,
+        )
+        .order_by(HourlyPaymentLatency.hour)
+    )
+
+    return [
+        {
+            "hour": row.hour.isoformat(),
+            **_summarise(merge_sketches([row.latency_sketch]), quantiles),
+        }
+        for row in result
+    ]
@@ -0,0 +1,398 @@
+import os
+import time
+import asyncio
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core import metrics
+from app.core.aws import get_client
+from app.core.redis import get_redis
+from app.core.serialization import dumps_str
+from app.core.logging import logger
+
+# SNS PublishBatch hard limit
+SNS_BATCH_SIZE = 10
+
+NOTIFICATION_CHANNELS = [
+    channel.strip()
+    for channel in os.getenv("NOTIFICATION_CHANNELS", "email").split(",")
+    if channel.strip()
+]
+# Buffering window for long-running consumers (Lambda flushes per batch)
+NOTIFICATION_WINDOW_SECONDS = float(os.getenv("NOTIFICATION_WINDOW_SECONDS", "2"))
+NOTIFICATION_MAX_BUFFERED = int(os.getenv("NOTIFICATION_MAX_BUFFERED", "1000"))
+NOTIFICATION_SEND_CONCURRENCY = int(os.getenv("NOTIFICATION_SEND_CONCURRENCY", "4"))
+# Messages per second per channel (NOTIFICATION_RATE_<CHANNEL> overrides)
+NOTIFICATION_DEFAULT_RATE = float(os.getenv("NOTIFICATION_DEFAULT_RATE", "50"))
+# Delivery markers outlive the queue's retention (retries + DLQ replay)
+NOTIFICATION_DELIVERED_TTL_SECONDS = int(
+    os.getenv("NOTIFICATION_DELIVERED_TTL_SECONDS", str(14 * 24 * 3600))
+)
+
+
+# --------------------------------------------------
+# Per-channel rate limit
+# --------------------------------------------------
+class TokenBucket:
+    """
+    Async token bucket: `rate` tokens/second, bursts up to `capacity`.
+
+    Callers reserve tokens up front (the balance may go negative) and
+    sleep off the debt — no lock, fair in arrival order, usable from any
+    event loop.
+    """
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        self.rate = rate
+        self.capacity = capacity or max(rate, SNS_BATCH_SIZE)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+
+    async def acquire(self, tokens: float = 1) -> None:
+        now = time.monotonic()
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+        self._tokens -= min(tokens, self.capacity)
+        if self._tokens < 0:
+            await asyncio.sleep(-self._tokens / self.rate)
+
+
+def _channel_rate(channel: str) -> float:
+    return float(os.getenv(f"NOTIFICATION_RATE_{channel.upper()}", NOTIFICATION_DEFAULT_RATE))
+
+
+# --------------------------------------------------
+# Senders
+# --------------------------------------------------
+@dataclass
+class OutgoingMessage:
+    id: str
+    channel: str
+    user_id: str
+    body: Dict[str, Any]
+
+
+class SnsBatchSender:
+    """
+    SNS PublishBatch (≤ 10 entries per call). `channel` and `user_id` go
+    out as message attributes for subscription filter policies.
+    """
+
+    def __init__(self, topic_arn: str):
+        self.topic_arn = topic_arn
+
+    async def send_batch(self, messages: List[OutgoingMessage]) -> Set[str]:
+        """
+        Returns the ids of messages that failed.
+        """
+        entries = [
+            {
+                "Id": message.id,
+                "Message": dumps_str(message.body),
+                "MessageAttributes": {
+                    "channel": {"DataType": "String", "StringValue": message.channel},
+                    "user_id": {"DataType": "String", "StringValue": message.user_id},
+                },
+            }
+            for message in messages
+        ]
+
+        # boto3 is blocking — keep it off the event loop
+        response = await asyncio.to_thread(
+            get_client("sns").publish_batch,
+            TopicArn=self.topic_arn,
+            PublishBatchRequestEntries=entries,
+        )
+        return {failed["Id"] for failed in response.get("Failed", [])}
+
+
+class StubSender:
+    """
+    Local / test sender: records every batch, optionally fails some ids.
+    """
+
+    def __init__(self, fail_ids: Iterable[str] = ()):
+        self.batches: List[List[OutgoingMessage]] = []
+        self.fail_ids = set(fail_ids)
+
+    async def send_batch(self, messages: List[OutgoingMessage]) -> Set[str]:
+        self.batches.append(list(messages))
+        logger.info(
+            "NOTIFICATION_STUB_BATCH",
+            extra={"messages": len(messages), "ids": [m.id for m in messages]},
+        )
+        return {m.id for m in messages if m.id in self.fail_ids}
+
+
+def default_sender():
+    topic_arn = os.getenv("NOTIFICATION_TOPIC_ARN")
+    if topic_arn and os.getenv("NOTIFICATION_SENDER", "sns") == "sns":
+        return SnsBatchSender(topic_arn)
+    return StubSender()
+
+
+# --------------------------------------------------
+# Delivery log (retry without resending)
+# --------------------------------------------------
+# A retried record is re-buffered on EVERY channel; channels that already
+# delivered its notification are skipped at flush.
+def _delivery_key(channel: str, item: Dict[str, Any]) -> str:
+    return f"{item['payment_id']}:{item['event_type']}:{channel}"
+
+
+class MemoryDeliveryLog:
+    """
+    Per-process delivery markers (local runs and tests).
+    """
+
+    def __init__(self):
+        self.keys: Set[str] = set()
+
+    async def delivered(self, keys: List[str]) -> Set[str]:
+        return self.keys.intersection(keys)
+
+    async def mark(self, keys: List[str]) -> None:
+        self.keys.update(keys)
+
+
+class RedisDeliveryLog:
+    """
+    Delivery markers shared by every container (a retry may land on
+    another one). Fails open: without Redis a retry may resend
+    (at-least-once), it never drops a notification.
+    """
+
+    def __init__(self, ttl_seconds: int = NOTIFICATION_DELIVERED_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+
+    async def delivered(self, keys: List[str]) -> Set[str]:
+        if not keys:
+            return set()
+
+        redis = await get_redis()
+        if not redis:
+            return set()
+
+        try:
+            values = await redis.mget([f"notified:{key}" for key in keys])
+            return {key for key, value in zip(keys, values) if value}
+        except Exception as exc:
+            logger.warning("NOTIFICATION_DELIVERY_LOG_FAILED", extra={"error": str(exc)})
+            return set()
+        finally:
+            await redis.close()
+
+    async def mark(self, keys: List[str]) -> None:
+        if not keys:
+            return
+
+        redis = await get_redis()
+        if not redis:
+            return
+
+        try:
+            pipe = redis.pipeline(transaction=False)
+            for key in keys:
+                pipe.set(f"notified:{key}", "1", ex=self.ttl_seconds)
+            await pipe.execute()
+        except Exception as exc:
+            logger.warning("NOTIFICATION_DELIVERY_LOG_FAILED", extra={"error": str(exc)})
+        finally:
+            await redis.close()
+
+
+def default_delivery_log():
+    return RedisDeliveryLog() if os.getenv("REDIS_URL") else MemoryDeliveryLog()
+
+
+# --------------------------------------------------
+# Engine
+# --------------------------------------------------
+@dataclass
+class _Pending:
+    # payment_id → latest notification payload (coalesces repeats)
+    payments: "OrderedDict[str, Dict[str, Any]]" = field(default_factory=OrderedDict)
+    # payment_id → ids of the source records (SQS message ids) behind it
+    sources: Dict[str, Set[str]] = field(default_factory=dict)
+
+    def source_ids(self) -> Set[str]:
+        return set().union(*self.sources.values())
+
+
+class NotificationEngine:
+    """
+    Buffers payment notifications per (user, channel) and sends digests.
+
+    - One message per (user, channel) per window: a single event is sent
+      as-is, several are coalesced into one digest
+    - Sent through the batch API (10 per call), bounded concurrency,
+      token bucket per channel
+    - flush() reports which source records could not be delivered;
+      a retried record only goes out on the channels that failed
+      (delivery log per payment, event and channel)
+    """
+
+    def __init__(
+        self,
+        sender=None,
+        delivery_log=None,
+        channels: Optional[List[str]] = None,
+        window_seconds: float = NOTIFICATION_WINDOW_SECONDS,
+        max_buffered: int = NOTIFICATION_MAX_BUFFERED,
+        concurrency: int = NOTIFICATION_SEND_CONCURRENCY,
+    ):
+        self.sender = sender or default_sender()
+        self.delivery_log = delivery_log or default_delivery_log()
+        self.channels = channels or NOTIFICATION_CHANNELS
+        self.window_seconds = window_seconds
+        self.max_buffered = max_buffered
+        self.concurrency = concurrency
+
+        self._pending: Dict[Tuple[str, str], _Pending] = {}
+        self._buffered = 0
+        self._window_opened_at: Optional[float] = None
+        self._buckets = {channel: TokenBucket(_channel_rate(channel)) for channel in self.channels}
+
+    def add(
+        self,
+        event_type: str,
+        payload: Dict[str, Any],
+        source_id: Optional[str] = None,
+    ) -> None:
+        user_id = str(payload.get("user_id"))
+        payment_id = str(payload.get("payment_id"))
+
+        for channel in self.channels:
+            pending = self._pending.setdefault((user_id, channel), _Pending())
+            pending.payments[payment_id] = {
+                "event_type": event_type,
+                "payment_id": payment_id,
+                "status": payload.get("status"),
+                "amount": payload.get("amount"),
+                "currency": payload.get("currency"),
+                "processed_at": payload.get("processed_at"),
+            }
+            sources = pending.sources.setdefault(payment_id, set())
+            if source_id:
+                sources.add(source_id)
+
+        self._buffered += 1
+        if self._window_opened_at is None:
+            self._window_opened_at = time.monotonic()
+
+    def due(self) -> bool:
+        """
+        Window elapsed or buffer full (long-running consumers).
+        """
+        if self._window_opened_at is None:
+            return False
+        return (
+            self._buffered >= self.max_buffered
+            or time.monotonic() - self._window_opened_at >= self.window_seconds
+        )
+
+    @staticmethod
+    def _render(user_id: str, channel: str, pending: _Pending, index: int) -> OutgoingMessage:
+        items = list(pending.payments.values())
+        if len(items) == 1:
+            body = {"type": items[0]["event_type"], "user_id": user_id, **items[0]}
+        else:
+            body = {
+                "type": "payment.digest",
+                "user_id": user_id,
+                "count": len(items),
+                "payments": items,
+            }
+        return OutgoingMessage(id=f"n{index}", channel=channel, user_id=user_id, body=body)
+
+    async def flush(self) -> Set[str]:
+        """
+        Sends everything buffered. Returns source ids whose notification
+        failed (caller decides whether to retry them).
+        """
+        if not self._pending:
+            return set()
+
+        pending, self._pending = self._pending, {}
+        self._buffered, self._window_opened_at = 0, None
+
+        # Skip what an earlier attempt of a retried record already sent
+        delivered = await self.delivery_log.delivered(
+            [
+                _delivery_key(channel, item)
+                for (_, channel), group in pending.items()
+                for item in group.payments.values()
+            ]
+        )
+        skipped = 0
+        for (_, channel), group in pending.items():
+            for payment_id, item in list(group.payments.items()):
+                if _delivery_key(channel, item) in delivered:
+                    del group.payments[payment_id]
+                    group.sources.pop(payment_id, None)
+                    skipped += 1
+        if skipped:
+            metrics.incr("notifications.already_delivered", skipped)
+        pending = {key: group for key, group in pending.items() if group.payments}
+
+        messages: Dict[str, List[OutgoingMessage]] = {}
+        groups: Dict[str, Tuple[str, _Pending]] = {}
+        for index, ((user_id, channel), group) in enumerate(pending.items()):
+            message = self._render(user_id, channel, group, index)
+            messages.setdefault(channel, []).append(message)
+            groups[message.id] = (channel, group)
+
+        semaphore = asyncio.Semaphore(self.concurrency)
+
+        async def send(channel: str, batch: List[OutgoingMessage]) -> Set[str]:
+            async with semaphore:
+                await self._buckets[channel].acquire(len(batch))
+                try:
+                    with metrics.timer("notifications.batch_ms", channel=channel):
+                        return await self.sender.send_batch(batch)
+                except Exception as exc:
+                    logger.exception(
+                        "NOTIFICATION_BATCH_FAILED",
+                        extra={"channel": channel, "messages": len(batch), "error": str(exc)},
+                    )
+                    return {message.id for message in batch}
+
+        batches = [
+            (channel, channel_messages[start:start + SNS_BATCH_SIZE])
+            for channel, channel_messages in messages.items()
+            for start in range(0, len(channel_messages), SNS_BATCH_SIZE)
+        ]
+        results = await asyncio.gather(*(send(channel, batch) for channel, batch in batches))
+
+        failed_ids = set().union(*results)
+        failed_sources: Set[str] = set()
+        delivered_keys: List[str] = []
+        for message_id, (channel, group) in groups.items():
+            if message_id in failed_ids:
+                failed_sources |= group.source_ids()
+            else:
+                delivered_keys += [
+                    _delivery_key(channel, item) for item in group.payments.values()
+                ]
+        await self.delivery_log.mark(delivered_keys)
+
+        sent = sum(len(batch) for _, batch in batches) - len(failed_ids)
+        metrics.incr("notifications.sent", sent)
+        metrics.incr("notifications.failed", len(failed_ids))
+        metrics.incr(
+            "notifications.coalesced",
+            sum(len(group.payments) - 1 for group in pending.values()),
+        )
+
+        logger.info(
+            "NOTIFICATIONS_FLUSHED",
+            extra={
+                "groups": len(pending),
+                "batches": len(batches),
+                "sent": sent,
+                "failed": len(failed_ids),
+            },
+        )
+        return failed_sources
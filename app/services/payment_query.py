@@ -1,28 +1,114 @@
+import uuid
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
 from sqlalchemy import select
+from app.core.ids import uuid7_datetime
 from app.core.redis import get_redis
-from app.shared.models import Payment
+from app.core.serialization import dumps, loads
+from app.core.logging import logger
+from app.shared.models import Payment, PaymentStatus
 
 CACHE_TTL = 60
 
+TERMINAL_STATUSES = {PaymentStatus.SUCCESS.value, PaymentStatus.FAILED.value}
+
+# Payment ids are UUIDv7 minted in the same flush as created_at, so the
+# id's timestamp ± this skew bounds created_at (the partition key)
+CREATED_AT_SKEW = timedelta(minutes=10)
+
+
+def status_channel(payment_id) -> str:
+    return f"payment-status:{payment_id}"
+
+
+def created_at_window(payment_id) -> Optional[Tuple[datetime, datetime]]:
+    """
+    created_at bounds implied by a UUIDv7 payment id (naive UTC, like
+    Payment.created_at). None for legacy uuid4 ids — no bound known.
+    """
+    if not isinstance(payment_id, uuid.UUID):
+        payment_id = uuid.UUID(str(payment_id))
+    if payment_id.version != 7:
+        return None
+
+    minted = uuid7_datetime(payment_id).replace(tzinfo=None)
+    return minted - CREATED_AT_SKEW, minted + CREATED_AT_SKEW
+
+
+def payment_by_id_query(payment_id):
+    """
+    Lookup by id, pruned to the partition(s) covering the id's timestamp
+    instead of probing every monthly partition's primary key.
+    """
+    query = select(Payment).where(Payment.id == payment_id)
+
+    window = created_at_window(payment_id)
+    if window:
+        query = query.where(Payment.created_at.between(*window))
+    return query
+
+
+def payment_view(payment: Payment) -> dict:
+    return {
+        "payment_id": str(payment.id),
+        "status": payment.status.value,
+        "amount": payment.amount,
+        "currency": payment.currency,
+        "created_at": payment.created_at.isoformat(),
+        "processed_at": (
+            payment.processed_at.isoformat() if payment.processed_at else None
+        ),
+    }
+
 
 async def get_payment(db, payment_id):
-    redis = get_redis()
+    """
+    Payment status view (dict) or None.
+    Only terminal states are cached — they never change.
+    """
+    redis = await get_redis()
 
     if redis:
         cached = await redis.get(f"payment:{payment_id}")
         if cached:
-            return Payment.parse_raw(cached)
+            return loads(cached)
 
-    result = await db.execute(
-        select(Payment).where(Payment.id == payment_id)
-    )
+    result = await db.execute(payment_by_id_query(payment_id))
     payment = result.scalar_one_or_none()
 
-    if payment and redis:
+    if not payment:
+        return None
+
+    view = payment_view(payment)
+
+    if redis and payment.status != PaymentStatus.PENDING:
         await redis.setex(
             f"payment:{payment_id}",
             CACHE_TTL,
-            payment.json(),
+            dumps(view),
         )
 
-    return payment
+    return view
+
+
+async def publish_payment_status(payment: Payment) -> None:
+    """
+    Write-through of a terminal state: refreshes the cached view and
+    notifies status stream subscribers. Best effort — fails open.
+    """
+    redis = await get_redis()
+    if not redis:
+        return
+
+    view = dumps(payment_view(payment))
+    try:
+        await redis.setex(f"payment:{payment.id}", CACHE_TTL, view)
+        await redis.publish(status_channel(payment.id), view)
+    except Exception as exc:
+        logger.warning(
+            "PAYMENT_STATUS_PUBLISH_FAILED",
+            extra={"payment_id": str(payment.id), "error": str(exc)},
+        )
+    finally:
+        await redis.close()
@@ -1,11 +1,31 @@
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
-from uuid import UUID, UUID as UUIDType
+from uuid import UUID
 
 from app.shared.models import Payment, PaymentStatus
-from app.db.models.outbox import OutboxEvent
+from app.db.models.outbox import build_outbox_event
 from app.events.payment_events import payment_created_event
+from app.core import metrics
 from app.core.redis import get_redis
 from app.core.logging import logger
+from app.core.timing import stage
+from app.workers.idempotency import payment_by_idempotency_key_query
+
+# Registry PK written by the payments AFTER INSERT trigger
+IDEMPOTENCY_KEY_CONSTRAINT = "payment_idempotency_keys_pkey"
+
+
+async def _idempotency_race_winner(db: AsyncSession, idempotency_key: str):
+    """
+    A concurrent request with the same key committed first: the insert
+    waited on its row and lost. Answer with the winner's payment.
+    """
+    await db.rollback()
+    metrics.incr("payments.idempotency_race")
+    logger.info("IDEMPOTENCY_RACE_LOST", extra={"idempotency_key": idempotency_key})
+
+    result = await db.execute(payment_by_idempotency_key_query(idempotency_key))
+    return result.scalar_one()
 
 
 async def create_payment(
@@ -27,7 +47,15 @@ async def create_payment(
     )
 
     db.add(payment)
-    await db.flush()  # 🔥 ensures payment.id exists
+    with stage("db_create"):
+        try:
+            await db.flush()  # 🔥 ensures payment.id exists
+        except IntegrityError as exc:
+            # The key registry row is inserted by the trigger, at flush
+            if IDEMPOTENCY_KEY_CONSTRAINT not in str(exc.orig):
+                await db.rollback()
+                raise
+            return await _idempotency_race_winner(db, idempotency_key)
 
     # --------------------------------------------------
     # Build domain event (PURE)
@@ -43,43 +71,37 @@ async def create_payment(
     # --------------------------------------------------
     # OUTBOX WRITE (ATOMIC 🔒)
     # --------------------------------------------------
-    outbox = OutboxEvent(
-        event_id=UUIDType(event["event_id"]),   # ✅ CAST TO UUID
-        aggregate_id=payment.id,
-        event_type=event["event_type"],
-        version=event["version"],
-        payload=event["payload"],
-        occurred_at=event["occurred_at"],       # ✅ REQUIRED FIELD
-    )
+    outbox = build_outbox_event(event, aggregate_id=payment.id)
 
     db.add(outbox)
 
     # --------------------------------------------------
     # Commit payment + event TOGETHER
     # --------------------------------------------------
-    try:
-        await db.commit()
-    except Exception:
-        await db.rollback()
-        raise
-
-    await db.refresh(payment)
+    with stage("db_create"):
+        try:
+            await db.commit()
+        except Exception:
+            await db.rollback()
+            raise
 
     # --------------------------------------------------
     # Redis write-through (BEST EFFORT)
     # --------------------------------------------------
-    try:
-        redis = await get_redis()
-        if redis:
-            await redis.setex(
-                f"idempotency:{idempotency_key}",
-                300,
-                str(payment.id),
+    with stage("redis_write"):
+        try:
+            redis = await get_redis()
+            if redis:
+                with metrics.timer("redis.command_ms", command="idempotency_set"):
+                    await redis.setex(
+                        f"idempotency:{idempotency_key}",
+                        300,
+                        str(payment.id),
+                    )
+        except Exception as exc:
+            logger.warning(
+                "REDIS_IDEMPOTENCY_WRITE_FAILED",
+                extra={"error": str(exc)},
             )
-    except Exception as exc:
-        logger.warning(
-            "REDIS_IDEMPOTENCY_WRITE_FAILED",
-            extra={"error": str(exc)},
-        )
 
     return payment
@@ -0,0 +1,287 @@
+import os
+import asyncio
+from typing import AsyncIterator, Dict, Optional, Set
+
+from app.core import metrics
+from app.core.redis import redis_from_url
+from app.core.serialization import dumps, loads
+from app.db.session import run_read
+from app.services.payment_query import TERMINAL_STATUSES, get_payment, status_channel
+from app.core.logging import logger
+
+# Long-poll / SSE waits are capped below the API Gateway integration timeout
+STATUS_STREAM_MAX_WAIT_SECONDS = float(os.getenv("STATUS_STREAM_MAX_WAIT_SECONDS", "25"))
+STATUS_STREAM_KEEPALIVE_SECONDS = float(os.getenv("STATUS_STREAM_KEEPALIVE_SECONDS", "10"))
+
+# Mangum behind the API Gateway HTTP API buffers the whole response, so an
+# SSE stream would arrive in one piece after the wait: on Lambda the
+# long-poll is THE push mode. SSE needs a streaming runtime (uvicorn).
+STATUS_STREAM_SSE = os.getenv(
+    "STATUS_STREAM_SSE",
+    "false" if os.getenv("AWS_LAMBDA_FUNCTION_NAME") else "true",
+).lower() == "true"
+
+
+class StatusHub:
+    """
+    ONE Redis pub/sub connection per process, fanned out to every
+    waiting client.
+
+    - Channels are subscribed on the first waiter for a payment and
+      dropped with the last one (the process only receives what it needs)
+    - A single reader task dispatches messages to per-waiter queues
+    - Bound to the event loop that created it
+    """
+
+    def __init__(self, redis_url: str):
+        self.redis_url = redis_url
+        self._client = None
+        self._pubsub = None
+        self._reader: Optional[asyncio.Task] = None
+        self._waiters: Dict[str, Set[asyncio.Queue]] = {}
+        self._lock = asyncio.Lock()
+
+    async def _connect(self) -> None:
+        self._client = redis_from_url(
+            self.redis_url,
+            decode_responses=True,
+            socket_connect_timeout=1,
+        )
+        self._pubsub = self._client.pubsub(ignore_subscribe_messages=True)
+
+    async def subscribe(self, payment_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=8)
+
+        async with self._lock:
+            if self._pubsub is None:
+                await self._connect()
+
+            waiters = self._waiters.setdefault(payment_id, set())
+            if not waiters:
+                await self._pubsub.subscribe(status_channel(payment_id))
+            waiters.add(queue)
+
+            if self._reader is None or self._reader.done():
+                self._reader = asyncio.create_task(self._read())
+
+        metrics.gauge("status_stream.waiters", self.waiter_count())
+        return queue
+
+    async def unsubscribe(self, payment_id: str, queue: asyncio.Queue) -> None:
+        async with self._lock:
+            waiters = self._waiters.get(payment_id)
+            if waiters is None:
+                return
+
+            waiters.discard(queue)
+            if not waiters:
+                del self._waiters[payment_id]
+                try:
+                    await self._pubsub.unsubscribe(status_channel(payment_id))
+                except Exception as exc:
+                    logger.warning(
+                        "STATUS_STREAM_UNSUBSCRIBE_FAILED",
+                        extra={"payment_id": payment_id, "error": str(exc)},
+                    )
+
+        metrics.gauge("status_stream.waiters", self.waiter_count())
+
+    async def _read(self) -> None:
+        """
+        Runs while anyone is waiting; restarted by the next subscribe().
+        """
+        try:
+            while self._waiters:
+                message = await self._pubsub.get_message(timeout=1.0)
+                if message is None or message["type"] != "message":
+                    continue
+
+                payment_id = message["channel"].split(":", 1)[1]
+                view = loads(message["data"])
+                for queue in list(self._waiters.get(payment_id, ())):
+                    if not queue.full():
+                        queue.put_nowait(view)
+
+                metrics.incr("status_stream.messages")
+        except asyncio.CancelledError:
+            raise
+        except Exception as exc:
+            # Waiters time out and fall back to a fresh read
+            metrics.incr("status_stream.reader_failed")
+            logger.error("STATUS_STREAM_READER_FAILED", extra={"error": str(exc)})
+            await self.close()
+
+    def waiter_count(self) -> int:
+        return sum(len(waiters) for waiters in self._waiters.values())
+
+    async def close(self) -> None:
+        pubsub, client = self._pubsub, self._client
+        self._pubsub = self._client = None
+        self._waiters.clear()
+
+        if pubsub is not None:
+            try:
+                await pubsub.close()
+                await client.close()
+            except Exception:
+                pass
+
+
+# ==================================================
+# PER-PROCESS HUB (PER EVENT LOOP)
+# ==================================================
+_hub: Optional[StatusHub] = None
+_hub_loop = None
+
+
+def get_status_hub() -> Optional[StatusHub]:
+    """
+    The process-wide hub, or None when Redis is not configured.
+    """
+    global _hub, _hub_loop
+
+    redis_url = os.getenv("REDIS_URL")
+    if not redis_url:
+        return None
+
+    loop = asyncio.get_running_loop()
+    if _hub is None or _hub_loop is not loop:
+        _hub, _hub_loop = StatusHub(redis_url), loop
+    return _hub
+
+
+# --------------------------------------------------
+# Long-poll / SSE
+# --------------------------------------------------
+async def current_status(payment_id: str) -> Optional[dict]:
+    """
+    Cached view for finished payments, otherwise a replica read.
+    The session is released before any waiting starts.
+    """
+    return await run_read(lambda db: get_payment(db, payment_id), key=payment_id)
+
+
+async def _subscribe(payment_id: str):
+    hub = get_status_hub()
+    if hub is None:
+        return None, None
+
+    try:
+        return hub, await hub.subscribe(payment_id)
+    except Exception as exc:
+        # Fail open: callers degrade to a plain status read
+        metrics.incr("status_stream.unavailable")
+        logger.warning(
+            "STATUS_STREAM_SUBSCRIBE_FAILED",
+            extra={"payment_id": payment_id, "error": str(exc)},
+        )
+        return None, None
+
+
+async def _next_update(queue: Optional[asyncio.Queue], timeout: float) -> Optional[dict]:
+    if queue is None:
+        await asyncio.sleep(timeout)
+        return None
+    try:
+        return await asyncio.wait_for(queue.get(), timeout=timeout)
+    except asyncio.TimeoutError:
+        return None
+
+
+async def wait_for_terminal_status(
+    payment_id: str,
+    timeout: float = STATUS_STREAM_MAX_WAIT_SECONDS,
+) -> Optional[dict]:
+    """
+    Long-poll: the payment view as soon as it is SUCCESS / FAILED, or the
+    current view once `timeout` expires. None for unknown payments.
+
+    Subscribes BEFORE reading the current state, so a status published
+    in between is never missed.
+    """
+    hub, queue = await _subscribe(payment_id)
+    try:
+        view = await current_status(payment_id)
+        if view is None or view["status"] in TERMINAL_STATUSES or queue is None:
+            return view
+
+        with metrics.timer("status_stream.wait_ms", mode="long_poll"):
+            update = await _next_update(queue, timeout)
+        return update or await current_status(payment_id)
+    finally:
+        if queue is not None:
+            await hub.unsubscribe(payment_id, queue)
+
+
+def _sse(event: str, data: dict) -> bytes:
+    return b"event: " + event.encode() + b"\ndata: " + dumps(data) + b"\n\n"
+
+
+async def open_status_stream(
+    payment_id: str,
+    timeout: float = STATUS_STREAM_MAX_WAIT_SECONDS,
+) -> Optional[AsyncIterator[bytes]]:
+    """
+    Subscribes, then reads the current view ONCE: None for unknown
+    payments (nothing left subscribed), otherwise the SSE body starting
+    from that view.
+    """
+    hub, queue = await _subscribe(payment_id)
+    try:
+        view = await current_status(payment_id)
+    except BaseException:
+        if queue is not None:
+            await hub.unsubscribe(payment_id, queue)
+        raise
+
+    if view is None:
+        if queue is not None:
+            await hub.unsubscribe(payment_id, queue)
+        return None
+
+    return _status_event_stream(payment_id, view, hub, queue, timeout)
+
+
+async def _status_event_stream(
+    payment_id: str,
+    view: dict,
+    hub: Optional[StatusHub],
+    queue: Optional[asyncio.Queue],
+    timeout: float,
+):
+    """
+    Server-Sent Events: the current status, then the terminal one.
+
+    - Comment keep-alives every STATUS_STREAM_KEEPALIVE_SECONDS
+    - Closes after the terminal status or `timeout`; EventSource
+      reconnects on its own (`retry` hint)
+    """
+    try:
+        yield b"retry: 1000\n\n"
+
+        yield _sse("status", view)
+        if view["status"] in TERMINAL_STATUSES:
+            return
+
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout
+        while (remaining := deadline - loop.time()) > 0:
+            update = await _next_update(
+                queue, min(remaining, STATUS_STREAM_KEEPALIVE_SECONDS)
+            )
+            if update is None:
+                # No pub/sub (or nothing yet): re-read once per keep-alive
+                if queue is None:
+                    update = await current_status(payment_id)
+                    if update and update["status"] in TERMINAL_STATUSES:
+                        yield _sse("status", update)
+                        return
+                yield b": keep-alive\n\n"
+                continue
+
+            yield _sse("status", update)
+            if update["status"] in TERMINAL_STATUSES:
+                return
+    finally:
+        if queue is not None:
+            await hub.unsubscribe(payment_id, queue)
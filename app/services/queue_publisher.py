@@ -1,14 +1,14 @@
-import boto3
-import json
 import os
 
-sqs = boto3.client("sqs")
+from app.core.serialization import dumps_str
+from app.transport.base import get_queue_client
+
 QUEUE_URL = os.environ["PAYMENT_QUEUE_URL"]
 
 async def enqueue_payment(payment):
-    sqs.send_message(
+    get_queue_client().send_message(
         QueueUrl=QUEUE_URL,
-        MessageBody=json.dumps({
+        MessageBody=dumps_str({
             "payment_id": str(payment.id)
         }),
     )
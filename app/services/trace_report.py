@@ -0,0 +1,139 @@
+import argparse
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.tracing import STAGES, stage_durations
+from app.db.models.outbox import OutboxEvent
+from app.db.session import create_worker_session_factory
+from app.services.latency_sketch import LatencySketch
+from app.core.logging import logger
+
+# Terminal events carry the complete trace of their payment
+TERMINAL_EVENT_TYPES = ("payment.success.v1", "payment.failed.v1")
+
+REPORT_QUANTILES = (0.5, 0.95, 0.99)
+
+_STAGE_KINDS = {name: kind for name, _, _, kind in STAGES}
+
+
+def _ms(seconds: Optional[float]) -> Optional[float]:
+    return round(seconds * 1000, 1) if seconds is not None else None
+
+
+async def trace_breakdown(
+    session: AsyncSession,
+    since: datetime,
+    until: datetime,
+    chunk_size: int = 5_000,
+) -> Dict[str, Any]:
+    """
+    Create → terminal-state latency per stage, from outcome outbox rows.
+
+    - Range on occurred_at → partition pruning
+    - Streams trace_context only; percentiles via LatencySketch (1%)
+    """
+    stmt = (
+        select(OutboxEvent.trace_context)
+        .where(OutboxEvent.occurred_at >= since)
+        .where(OutboxEvent.occurred_at < until)
+        .where(OutboxEvent.event_type.in_(TERMINAL_EVENT_TYPES))
+        .where(OutboxEvent.trace_context.is_not(None))
+        .execution_options(yield_per=chunk_size)
+    )
+
+    sketches: Dict[str, LatencySketch] = {}
+    totals_ms: Dict[str, float] = {}
+    traces = 0
+
+    result = await session.stream(stmt)
+    async for (trace_context,) in result:
+        durations = stage_durations(trace_context)
+        if not durations:
+            continue
+
+        traces += 1
+        for stage, ms in durations.items():
+            sketches.setdefault(stage, LatencySketch()).add(ms / 1000)
+            totals_ms[stage] = totals_ms.get(stage, 0.0) + ms
+
+    overall_ms = totals_ms.get("total") or 0.0
+    stages = {}
+    for stage in [name for name, _, _, _ in STAGES] + ["total"]:
+        sketch = sketches.get(stage)
+        if sketch is None:
+            continue
+
+        stages[stage] = {
+            "kind": _STAGE_KINDS.get(stage, "end_to_end"),
+            "samples": sketch.count,
+            "mean_ms": round(totals_ms[stage] / sketch.count, 1),
+            **{f"p{int(q * 100)}_ms": _ms(sketch.quantile(q)) for q in REPORT_QUANTILES},
+            # share of summed end-to-end time spent in this stage
+            "share": round(totals_ms[stage] / overall_ms, 3) if overall_ms else None,
+        }
+
+    return {
+        "since": since.isoformat(),
+        "until": until.isoformat(),
+        "traces": traces,
+        "stages": stages,
+    }
+
+
+async def run_trace_report(since: datetime, until: datetime) -> Dict[str, Any]:
+    engine, SessionLocal = create_worker_session_factory("analytics", pool_size=1)
+
+    try:
+        async with SessionLocal() as session:
+            report = await trace_breakdown(session, since, until)
+    finally:
+        await engine.dispose()
+
+    logger.info(
+        "TRACE_REPORT_COMPLETE",
+        extra={"traces": report["traces"], "since": report["since"]},
+    )
+    return report
+
+
+# --------------------------------------------------
+# CLI: python -m app.services.trace_report --hours 24
+# --------------------------------------------------
+def _print_table(report: Dict[str, Any]) -> None:
+    print(f"{report['traces']} traces  {report['since']} → {report['until']}")
+    print(f"{'stage':12} {'kind':11} {'p50':>9} {'p95':>9} {'p99':>9} {'share':>6}")
+    for stage, row in report["stages"].items():
+        share = f"{row['share'] * 100:5.1f}%" if row["share"] is not None else "     -"
+        print(
+            f"{stage:12} {row['kind']:11} "
+            f"{row['p50_ms']:>7.1f}ms {row['p95_ms']:>7.1f}ms {row['p99_ms']:>7.1f}ms "
+            f"{share}"
+        )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Latency breakdown by pipeline stage")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--hours", type=float, default=24, help="window when --since is omitted")
+    parser.add_argument("--json", action="store_true")
+    args = parser.parse_args()
+
+    until = args.until or datetime.now(timezone.utc)
+    since = args.since or until - timedelta(hours=args.hours)
+
+    report = asyncio.run(run_trace_report(since, until))
+
+    if args.json:
+        print(json.dumps(report))
+    else:
+        _print_table(report)
+
+
+if __name__ == "__main__":
+    main()
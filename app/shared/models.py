@@ -1,10 +1,11 @@
 from app.shared.base import Base
-from sqlalchemy import Column, String, Integer, Enum, DateTime, Date, Float
+from sqlalchemy import Column, String, Integer, Enum, DateTime, Date, Float, LargeBinary
 from sqlalchemy.dialects.postgresql import UUID
 from datetime import datetime
-import uuid
 import enum
 
+from app.core.ids import uuid7
+
 
 # ------------------------
 # Payment Status Enum
@@ -21,7 +22,7 @@ class PaymentStatus(str, enum.Enum):
 class Payment(Base):
     __tablename__ = "payments"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid7)
 
     user_id = Column(UUID(as_uuid=True), nullable=False)
     amount = Column(Integer, nullable=False)
@@ -33,14 +34,41 @@ class Payment(Base):
         default=PaymentStatus.PENDING,
     )
 
-    idempotency_key = Column(String, unique=True, nullable=False)
+    # Global uniqueness lives in payment_idempotency_keys (partitioned table)
+    idempotency_key = Column(String, nullable=False, index=True)
 
-    # When payment request was created
-    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+    # When payment request was created (indexed for analytics range scans)
+    created_at = Column(
+        DateTime,
+        default=datetime.utcnow,
+        nullable=False,
+        index=True,
+    )
 
     # When payment reached terminal state (SUCCESS / FAILED)
     processed_at = Column(DateTime, nullable=True)
 
+    # DB key is (id, created_at): identity, refresh and flush-UPDATE
+    # carry the partition key and prune to one partition
+    __mapper_args__ = {"primary_key": [id, created_at]}
+
+
+# ------------------------
+# Idempotency Key Registry
+# ------------------------
+class PaymentIdempotencyKey(Base):
+    """
+    Global idempotency_key uniqueness for the partitioned payments table.
+    Written ONLY by the payments AFTER INSERT trigger.
+    """
+    __tablename__ = "payment_idempotency_keys"
+
+    idempotency_key = Column(String, primary_key=True)
+    payment_id = Column(UUID(as_uuid=True), nullable=False)
+
+    # Partition key of the payment → lookups prune to one partition
+    created_at = Column(DateTime, nullable=False, index=True)
+
 
 # ------------------------
 # Daily Analytics Table
@@ -57,4 +85,21 @@ class DailyPaymentAnalytics(Base):
     failure_rate = Column(Float, nullable=False)
     avg_processing_time_seconds = Column(Float, nullable=True)
 
+    # Serialized LatencySketch (mergeable, see app.services.latency_sketch)
+    latency_sketch = Column(LargeBinary, nullable=True)
+
+    created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+# ------------------------
+# Hourly Latency Sketches
+# ------------------------
+class HourlyPaymentLatency(Base):
+    __tablename__ = "hourly_payment_latency"
+
+    # Start of the UTC hour (payments bucketed by created_at)
+    hour = Column(DateTime, primary_key=True)
+
+    latency_sketch = Column(LargeBinary, nullable=False)
+
     created_at = Column(DateTime, default=datetime.utcnow, nullable=False)
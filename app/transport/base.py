@@ -0,0 +1,73 @@
+import os
+from typing import Any, Dict, List, Optional, Protocol
+
+# aws → boto3 clients, memory → in-process bus / queues (local stack)
+TRANSPORT = os.getenv("TRANSPORT", "aws")
+
+
+# ==================================================
+# INTERFACES (boto3-shaped subset the pipeline uses)
+# ==================================================
+class EventBus(Protocol):
+    def put_events(self, *, Entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        ...
+
+
+class QueueClient(Protocol):
+    def send_message(self, *, QueueUrl: str, MessageBody: str, **kwargs) -> Dict[str, Any]:
+        ...
+
+    def receive_message(
+        self,
+        *,
+        QueueUrl: str,
+        MaxNumberOfMessages: int = 1,
+        WaitTimeSeconds: int = 0,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        ...
+
+    def delete_message(self, *, QueueUrl: str, ReceiptHandle: str) -> Dict[str, Any]:
+        ...
+
+    def change_message_visibility(
+        self,
+        *,
+        QueueUrl: str,
+        ReceiptHandle: str,
+        VisibilityTimeout: int,
+    ) -> Dict[str, Any]:
+        ...
+
+    def get_queue_attributes(
+        self,
+        *,
+        QueueUrl: str,
+        AttributeNames: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        ...
+
+
+# ==================================================
+# SELECTION
+# ==================================================
+def get_event_bus() -> EventBus:
+    if TRANSPORT == "memory":
+        from app.transport.memory import local_event_bus
+
+        return local_event_bus()
+
+    from app.core.aws import get_client
+
+    return get_client("events")
+
+
+def get_queue_client() -> QueueClient:
+    if TRANSPORT == "memory":
+        from app.transport.memory import local_queue_client
+
+        return local_queue_client()
+
+    from app.core.aws import get_client
+
+    return get_client("sqs")
@@ -0,0 +1,289 @@
+import time
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Set
+
+# ==================================================
+# IN-PROCESS REDIS (LOCAL STACK)
+# ==================================================
+# Covers the commands the pipeline issues, with decode_responses=True
+# semantics (strings in, strings out). Every client created with
+# from_url("memory://…") shares one process-wide keyspace, like separate
+# connections to one server.
+
+
+class _Server:
+    def __init__(self):
+        self.data: Dict[str, Any] = {}
+        self.expires_at: Dict[str, float] = {}
+        self.channels: Dict[str, Set["FakePubSub"]] = {}
+        self.commands = 0
+
+    def alive(self, key: str) -> bool:
+        expires_at = self.expires_at.get(key)
+        if expires_at is not None and expires_at <= time.monotonic():
+            self.data.pop(key, None)
+            del self.expires_at[key]
+        return key in self.data
+
+
+_server = _Server()
+
+
+def command_count() -> int:
+    """
+    Commands served so far (round trips; a pipeline or script counts once).
+    """
+    return _server.commands
+
+
+class FakeRedis:
+    """
+    redis.asyncio.Redis stand-in.
+
+    - Strings, counters, hashes, TTLs, pub/sub
+    - eval() runs Python equivalents of the repo's Lua scripts
+    """
+
+    def __init__(self, server: _Server = _server):
+        self._server = server
+
+    # --------------------------------------------------
+    # Connection
+    # --------------------------------------------------
+    async def ping(self) -> bool:
+        self._server.commands += 1
+        return True
+
+    async def close(self) -> None:
+        pass
+
+    # --------------------------------------------------
+    # Keys / strings
+    # --------------------------------------------------
+    def _get(self, key: str) -> Optional[Any]:
+        return self._server.data.get(key) if self._server.alive(key) else None
+
+    def _set(self, key: str, value: Any, ex: Optional[float] = None) -> None:
+        self._server.data[key] = value
+        if ex is not None:
+            self._server.expires_at[key] = time.monotonic() + float(ex)
+        else:
+            self._server.expires_at.pop(key, None)
+
+    def _expire(self, key: str, seconds: float) -> bool:
+        if not self._server.alive(key):
+            return False
+        self._server.expires_at[key] = time.monotonic() + float(seconds)
+        return True
+
+    async def get(self, name: str) -> Optional[str]:
+        self._server.commands += 1
+        return self._get(name)
+
+    async def mget(self, keys: List[str]) -> List[Optional[str]]:
+        self._server.commands += 1
+        return [self._get(key) for key in keys]
+
+    async def set(self, name: str, value: Any, ex: Optional[float] = None, nx: bool = False):
+        self._server.commands += 1
+        if nx and self._server.alive(name):
+            return None
+        self._set(name, str(value), ex)
+        return True
+
+    async def setex(self, name: str, time_seconds: float, value: Any) -> bool:
+        self._server.commands += 1
+        self._set(name, value if isinstance(value, str) else _text(value), time_seconds)
+        return True
+
+    async def incr(self, name: str, amount: int = 1) -> int:
+        self._server.commands += 1
+        value = int(self._get(name) or 0) + amount
+        self._server.data[name] = str(value)
+        return value
+
+    async def expire(self, name: str, time_seconds: float) -> bool:
+        self._server.commands += 1
+        return self._expire(name, time_seconds)
+
+    async def delete(self, *names: str) -> int:
+        self._server.commands += 1
+        deleted = 0
+        for name in names:
+            if self._server.alive(name):
+                del self._server.data[name]
+                self._server.expires_at.pop(name, None)
+                deleted += 1
+        return deleted
+
+    # --------------------------------------------------
+    # Hashes
+    # --------------------------------------------------
+    def _hash(self, key: str) -> Dict[str, str]:
+        value = self._get(key)
+        if value is None:
+            value = self._server.data[key] = {}
+        return value
+
+    def _hincrby(self, key: str, field: str, amount: float, cast: Callable) -> Any:
+        hash_ = self._hash(key)
+        value = cast(hash_.get(field) or 0) + cast(amount)
+        hash_[field] = repr(value) if cast is float else str(value)
+        return value
+
+    async def hgetall(self, name: str) -> Dict[str, str]:
+        self._server.commands += 1
+        return dict(self._get(name) or {})
+
+    async def hincrby(self, name: str, key: str, amount: int = 1) -> int:
+        self._server.commands += 1
+        return self._hincrby(name, key, amount, int)
+
+    async def hincrbyfloat(self, name: str, key: str, amount: float = 1.0) -> float:
+        self._server.commands += 1
+        return self._hincrby(name, key, amount, float)
+
+    def pipeline(self, transaction: bool = False) -> "FakePipeline":
+        return FakePipeline(self)
+
+    # --------------------------------------------------
+    # Scripts
+    # --------------------------------------------------
+    async def eval(self, script: str, numkeys: int, *keys_and_args: Any) -> Any:
+        self._server.commands += 1
+        handler = _scripts().get(_normalise(script))
+        if handler is None:
+            raise NotImplementedError("Script not supported by FakeRedis")
+
+        keys = [str(k) for k in keys_and_args[:numkeys]]
+        args = [str(a) for a in keys_and_args[numkeys:]]
+        return handler(self, keys, args)
+
+    # --------------------------------------------------
+    # Pub/sub
+    # --------------------------------------------------
+    async def publish(self, channel: str, message: Any) -> int:
+        self._server.commands += 1
+        subscribers = self._server.channels.get(channel, ())
+        for pubsub in subscribers:
+            pubsub.deliver(channel, message if isinstance(message, str) else _text(message))
+        return len(subscribers)
+
+    def pubsub(self, ignore_subscribe_messages: bool = False) -> "FakePubSub":
+        return FakePubSub(self._server)
+
+
+class FakePipeline:
+    """
+    Buffers commands; execute() runs them in order as ONE round trip.
+    """
+
+    def __init__(self, client: FakeRedis):
+        self._client = client
+        self._calls: List[tuple] = []
+
+    def __getattr__(self, name: str):
+        def queue(*args, **kwargs):
+            self._calls.append((name, args, kwargs))
+            return self
+
+        return queue
+
+    async def execute(self) -> List[Any]:
+        calls, self._calls = self._calls, []
+        results = [
+            await getattr(self._client, name)(*args, **kwargs)
+            for name, args, kwargs in calls
+        ]
+        self._client._server.commands -= max(0, len(calls) - 1)
+        return results
+
+
+class FakePubSub:
+    def __init__(self, server: _Server):
+        self._server = server
+        self._channels: Set[str] = set()
+        self._messages: asyncio.Queue = asyncio.Queue()
+
+    def deliver(self, channel: str, data: str) -> None:
+        self._messages.put_nowait({"type": "message", "channel": channel, "data": data})
+
+    async def subscribe(self, *channels: str) -> None:
+        for channel in channels:
+            self._channels.add(channel)
+            self._server.channels.setdefault(channel, set()).add(self)
+
+    async def unsubscribe(self, *channels: str) -> None:
+        for channel in channels or tuple(self._channels):
+            self._channels.discard(channel)
+            subscribers = self._server.channels.get(channel)
+            if subscribers is not None:
+                subscribers.discard(self)
+                if not subscribers:
+                    del self._server.channels[channel]
+
+    async def get_message(self, ignore_subscribe_messages: bool = False, timeout: float = 0.0):
+        try:
+            return await asyncio.wait_for(self._messages.get(), timeout=timeout)
+        except asyncio.TimeoutError:
+            return None
+
+    async def close(self) -> None:
+        await self.unsubscribe()
+
+
+def from_url(url: str, **kwargs) -> FakeRedis:
+    return FakeRedis()
+
+
+# --------------------------------------------------
+# Lua script equivalents
+# --------------------------------------------------
+def _text(value: Any) -> str:
+    return value.decode() if isinstance(value, bytes) else str(value)
+
+
+def _normalise(script: str) -> str:
+    return " ".join(script.split())
+
+
+def _record_analytics(client: FakeRedis, keys: List[str], args: List[str]) -> int:
+    # app.services.analytics_counters._RECORD_SCRIPT
+    dedup_key, counter_keys, latency_keys = keys[0], keys[1:3], keys[3:5]
+    dedup_ttl, counter_ttl, field, latency, bucket = args
+
+    if client._server.alive(dedup_key):
+        return 0
+    client._set(dedup_key, "1", dedup_ttl)
+
+    for key in counter_keys:
+        client._hincrby(key, field, 1, int)
+        if latency:
+            client._hincrby(key, "latency_sum", float(latency), float)
+            client._hincrby(key, "processed", 1, int)
+        client._expire(key, counter_ttl)
+
+    if latency:
+        for key in latency_keys:
+            client._hincrby(key, bucket, 1, int)
+            client._expire(key, counter_ttl)
+    return 1
+
+
+def _release_lock(client: FakeRedis, keys: List[str], args: List[str]) -> int:
+    # app.core.locks._RELEASE_SCRIPT
+    if client._get(keys[0]) == args[0]:
+        del client._server.data[keys[0]]
+        client._server.expires_at.pop(keys[0], None)
+        return 1
+    return 0
+
+
+def _scripts() -> Dict[str, Callable]:
+    from app.core.locks import _RELEASE_SCRIPT
+    from app.services.analytics_counters import _RECORD_SCRIPT
+
+    return {
+        _normalise(_RECORD_SCRIPT): _record_analytics,
+        _normalise(_RELEASE_SCRIPT): _release_lock,
+    }
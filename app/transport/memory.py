@@ -0,0 +1,428 @@
+import os
+import time
+import uuid
+import heapq
+import asyncio
+import threading
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Awaitable, Callable, Deque, Dict, List, Optional, Tuple
+
+from app.core import metrics
+from app.core.serialization import dumps_str, loads
+from app.core.logging import logger
+
+# Mirrors infra/terraform/sqs.tf and eventbridge.tf
+PAYMENT_QUEUE_URL = os.getenv("PAYMENT_QUEUE_URL", "memory://payment-queue")
+DLQ_URL = os.getenv("DLQ_URL", "memory://payment-dlq")
+PAYMENT_QUEUE_VISIBILITY_SECONDS = float(os.getenv("LOCAL_VISIBILITY_TIMEOUT_SECONDS", "120"))
+PAYMENT_QUEUE_MAX_RECEIVE_COUNT = int(os.getenv("LOCAL_MAX_RECEIVE_COUNT", "5"))
+EVENT_SOURCE = "event-platform.payments"
+PAYMENT_DETAIL_TYPES = ("payment.created", "payment.success", "payment.failed")
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+# ==================================================
+# QUEUES (SQS SEMANTICS)
+# ==================================================
+@dataclass
+class _Message:
+    message_id: str
+    body: str
+    sent_at_ms: int
+    receive_count: int = 0
+    first_received_at_ms: Optional[int] = None
+    receipt_handle: Optional[str] = None
+    visible_at: float = 0.0
+
+
+@dataclass
+class _Queue:
+    url: str
+    visibility_timeout: float
+    dead_letter_url: Optional[str] = None
+    max_receive_count: Optional[int] = None
+
+    messages: Dict[str, _Message] = field(default_factory=dict)
+    ready: Deque[str] = field(default_factory=deque)
+    # (visible_at, message_id, receipt_handle) — stale entries (deleted,
+    # or visibility changed since) are skipped
+    in_flight: List[Tuple[float, str, str]] = field(default_factory=list)
+    receipts: Dict[str, str] = field(default_factory=dict)
+
+    def requeue_expired(self, now: float) -> None:
+        while self.in_flight and self.in_flight[0][0] <= now:
+            visible_at, message_id, receipt = heapq.heappop(self.in_flight)
+            message = self.messages.get(message_id)
+            if (
+                self.receipts.get(receipt) == message_id
+                and message is not None
+                and message.visible_at == visible_at
+            ):
+                del self.receipts[receipt]
+                self.ready.append(message_id)
+
+
+class InMemoryQueueClient:
+    """
+    SQS subset: send / receive / delete / change visibility / attributes.
+
+    - Received messages are invisible for the visibility timeout, then
+      delivered again (ApproximateReceiveCount grows)
+    - Redrive: a message received more than max_receive_count times
+      moves to the dead-letter queue instead
+    - receive_message never blocks (WaitTimeSeconds is ignored);
+      pollers back off on empty receives
+    - Thread-safe, so sync handlers can run in worker threads
+    """
+
+    def __init__(self):
+        self._queues: Dict[str, _Queue] = {}
+        self._lock = threading.Lock()
+        self.redriven = 0
+
+    def create_queue(
+        self,
+        url: str,
+        visibility_timeout: float = 30,
+        dead_letter_url: Optional[str] = None,
+        max_receive_count: Optional[int] = None,
+    ) -> None:
+        with self._lock:
+            self._queues[url] = _Queue(
+                url=url,
+                visibility_timeout=visibility_timeout,
+                dead_letter_url=dead_letter_url,
+                max_receive_count=max_receive_count,
+            )
+
+    def _queue(self, url: str) -> _Queue:
+        queue = self._queues.get(url)
+        if queue is None:
+            raise KeyError(f"Unknown queue {url}")
+        return queue
+
+    def send_message(self, *, QueueUrl: str, MessageBody: str, **kwargs) -> Dict[str, Any]:
+        message = _Message(
+            message_id=str(uuid.uuid4()),
+            body=MessageBody,
+            sent_at_ms=_now_ms(),
+        )
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            queue.messages[message.message_id] = message
+            queue.ready.append(message.message_id)
+        return {"MessageId": message.message_id}
+
+    def receive_message(
+        self,
+        *,
+        QueueUrl: str,
+        MaxNumberOfMessages: int = 1,
+        WaitTimeSeconds: int = 0,
+        VisibilityTimeout: Optional[float] = None,
+        **kwargs,
+    ) -> Dict[str, Any]:
+        received: List[Dict[str, Any]] = []
+        redriven = 0
+
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            now = time.monotonic()
+            queue.requeue_expired(now)
+            visibility = queue.visibility_timeout if VisibilityTimeout is None else VisibilityTimeout
+
+            while queue.ready and len(received) < MaxNumberOfMessages:
+                message = queue.messages.get(queue.ready.popleft())
+                if message is None:
+                    continue  # deleted while waiting
+
+                if (
+                    queue.dead_letter_url
+                    and queue.max_receive_count
+                    and message.receive_count >= queue.max_receive_count
+                ):
+                    del queue.messages[message.message_id]
+                    dlq = self._queue(queue.dead_letter_url)
+                    message.receive_count = 0
+                    dlq.messages[message.message_id] = message
+                    dlq.ready.append(message.message_id)
+                    redriven += 1
+                    continue
+
+                message.receive_count += 1
+                message.first_received_at_ms = message.first_received_at_ms or _now_ms()
+                message.receipt_handle = uuid.uuid4().hex
+                message.visible_at = now + visibility
+                queue.receipts[message.receipt_handle] = message.message_id
+                heapq.heappush(
+                    queue.in_flight,
+                    (message.visible_at, message.message_id, message.receipt_handle),
+                )
+
+                received.append(
+                    {
+                        "MessageId": message.message_id,
+                        "ReceiptHandle": message.receipt_handle,
+                        "Body": message.body,
+                        "Attributes": {
+                            "SentTimestamp": str(message.sent_at_ms),
+                            "ApproximateReceiveCount": str(message.receive_count),
+                            "ApproximateFirstReceiveTimestamp": str(message.first_received_at_ms),
+                        },
+                    }
+                )
+
+        if redriven:
+            self.redriven += redriven
+            metrics.incr("local.queue.redriven", redriven)
+            logger.warning(
+                "LOCAL_QUEUE_REDRIVE",
+                extra={"queue_url": QueueUrl, "messages": redriven},
+            )
+
+        return {"Messages": received} if received else {}
+
+    def delete_message(self, *, QueueUrl: str, ReceiptHandle: str) -> Dict[str, Any]:
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            message_id = queue.receipts.pop(ReceiptHandle, None)
+            if message_id is not None:
+                queue.messages.pop(message_id, None)
+        return {}
+
+    def change_message_visibility(
+        self,
+        *,
+        QueueUrl: str,
+        ReceiptHandle: str,
+        VisibilityTimeout: float,
+    ) -> Dict[str, Any]:
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            message = queue.messages.get(queue.receipts.get(ReceiptHandle, ""))
+            if message is not None:
+                message.visible_at = time.monotonic() + VisibilityTimeout
+                heapq.heappush(
+                    queue.in_flight,
+                    (message.visible_at, message.message_id, ReceiptHandle),
+                )
+        return {}
+
+    def get_queue_attributes(
+        self,
+        *,
+        QueueUrl: str,
+        AttributeNames: Optional[List[str]] = None,
+    ) -> Dict[str, Any]:
+        with self._lock:
+            queue = self._queue(QueueUrl)
+            queue.requeue_expired(time.monotonic())
+            not_visible = len(queue.receipts)
+            visible = len(queue.messages) - not_visible
+
+        return {
+            "Attributes": {
+                "ApproximateNumberOfMessages": str(visible),
+                "ApproximateNumberOfMessagesNotVisible": str(not_visible),
+            }
+        }
+
+
+# ==================================================
+# EVENT BUS (EVENTBRIDGE SEMANTICS)
+# ==================================================
+@dataclass
+class Rule:
+    name: str
+    source: str
+    detail_type_prefixes: Tuple[str, ...]
+    target_queue_url: str
+
+    def matches(self, source: str, detail_type: str) -> bool:
+        return source == self.source and detail_type.startswith(self.detail_type_prefixes)
+
+
+class InMemoryEventBus:
+    """
+    EventBridge subset: put_events routed by rules to queue targets.
+
+    SQS targets receive the full EventBridge envelope (detail-type,
+    source, detail, …), exactly what sqs_worker and DLQ replay parse.
+    """
+
+    def __init__(self, queues: InMemoryQueueClient, rules: List[Rule], name: str = "local"):
+        self.queues = queues
+        self.rules = rules
+        self.name = name
+
+    def put_events(self, *, Entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        results = []
+        for entry in Entries:
+            event_id = str(uuid.uuid4())
+            document = {
+                "version": "0",
+                "id": event_id,
+                "detail-type": entry["DetailType"],
+                "source": entry["Source"],
+                "account": "000000000000",
+                "time": datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ"),
+                "region": "local",
+                "resources": [],
+                "detail": loads(entry["Detail"]),
+            }
+
+            targets = [
+                rule.target_queue_url
+                for rule in self.rules
+                if rule.matches(entry["Source"], entry["DetailType"])
+            ]
+            if not targets:
+                metrics.incr("local.bus.unmatched", detail_type=entry["DetailType"])
+
+            body = dumps_str(document)
+            for url in targets:
+                self.queues.send_message(QueueUrl=url, MessageBody=body)
+
+            results.append({"EventId": event_id})
+
+        return {"FailedEntryCount": 0, "Entries": results}
+
+
+# ==================================================
+# LAMBDA SQS EVENT SOURCE MAPPING
+# ==================================================
+class EventSourceMapping:
+    """
+    Polls a queue the way the Lambda SQS trigger does.
+
+    - Up to `batch_size` records per invocation, gathered for at most
+      `batching_window_seconds`
+    - ReportBatchItemFailures: the handler returns failed messageIds,
+      everything else is deleted; failures reappear after the
+      visibility timeout (and eventually redrive)
+    - A raising handler leaves the whole batch in flight
+    """
+
+    def __init__(
+        self,
+        queues: InMemoryQueueClient,
+        queue_url: str,
+        handler: Callable[[Dict[str, Any]], Awaitable[List[str]]],
+        batch_size: int = 10,
+        batching_window_seconds: float = 0.0,
+        idle_sleep_seconds: float = 0.01,
+    ):
+        self.queues = queues
+        self.queue_url = queue_url
+        self.handler = handler
+        self.batch_size = batch_size
+        self.batching_window_seconds = batching_window_seconds
+        self.idle_sleep_seconds = idle_sleep_seconds
+
+    def _receive(self, limit: int) -> List[Dict[str, Any]]:
+        return self.queues.receive_message(
+            QueueUrl=self.queue_url,
+            MaxNumberOfMessages=limit,
+        ).get("Messages", [])
+
+    async def poll_once(self) -> int:
+        messages = self._receive(self.batch_size)
+        if not messages:
+            return 0
+
+        deadline = time.monotonic() + self.batching_window_seconds
+        while len(messages) < self.batch_size and time.monotonic() < deadline:
+            await asyncio.sleep(self.idle_sleep_seconds)
+            messages += self._receive(self.batch_size - len(messages))
+
+        records = [
+            {
+                "messageId": message["MessageId"],
+                "receiptHandle": message["ReceiptHandle"],
+                "body": message["Body"],
+                "attributes": message["Attributes"],
+                "eventSource": "aws:sqs",
+                "eventSourceARN": self.queue_url,
+            }
+            for message in messages
+        ]
+
+        try:
+            failed_ids = set(await self.handler({"Records": records}))
+        except Exception as exc:
+            logger.exception(
+                "LOCAL_BATCH_FAILED",
+                extra={"queue_url": self.queue_url, "error": str(exc)},
+            )
+            return len(records)
+
+        for record in records:
+            if record["messageId"] not in failed_ids:
+                self.queues.delete_message(
+                    QueueUrl=self.queue_url,
+                    ReceiptHandle=record["receiptHandle"],
+                )
+        return len(records)
+
+    async def run(self, stop: asyncio.Event) -> None:
+        while not stop.is_set():
+            if not await self.poll_once():
+                await asyncio.sleep(self.idle_sleep_seconds)
+
+
+# ==================================================
+# LOCAL TOPOLOGY (PER PROCESS)
+# ==================================================
+_queue_client: Optional[InMemoryQueueClient] = None
+_event_bus: Optional[InMemoryEventBus] = None
+
+
+def local_queue_client() -> InMemoryQueueClient:
+    """
+    Payment queue with redrive to the DLQ, as in sqs.tf.
+    """
+    global _queue_client
+    if _queue_client is None:
+        client = InMemoryQueueClient()
+        client.create_queue(DLQ_URL, visibility_timeout=60)
+        client.create_queue(
+            PAYMENT_QUEUE_URL,
+            visibility_timeout=PAYMENT_QUEUE_VISIBILITY_SECONDS,
+            dead_letter_url=DLQ_URL,
+            max_receive_count=PAYMENT_QUEUE_MAX_RECEIVE_COUNT,
+        )
+        _queue_client = client
+    return _queue_client
+
+
+def local_event_bus() -> InMemoryEventBus:
+    """
+    Payment events rule → payment queue, as in eventbridge.tf.
+    """
+    global _event_bus
+    if _event_bus is None:
+        _event_bus = InMemoryEventBus(
+            local_queue_client(),
+            rules=[
+                Rule(
+                    name="payment-events",
+                    source=EVENT_SOURCE,
+                    detail_type_prefixes=PAYMENT_DETAIL_TYPES,
+                    target_queue_url=PAYMENT_QUEUE_URL,
+                )
+            ],
+        )
+    return _event_bus
+
+
+def use_local_event_bus(bus) -> None:
+    """
+    Replaces the process-wide bus (benchmarks plug in recording stubs).
+    """
+    global _event_bus
+    _event_bus = bus
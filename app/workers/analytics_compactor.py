@@ -0,0 +1,91 @@
+import asyncio
+from datetime import datetime, timedelta
+
+from app.db.session import create_worker_session_factory
+from app.services.analytics_counters import (
+    counters_to_row,
+    day_key,
+    latency_day_key,
+    latency_hour_key,
+)
+from app.services.analytics_job import upsert_daily_analytics, upsert_hourly_latency
+from app.services.latency_sketch import LatencySketch
+from app.core.redis import get_redis
+from app.core.logging import flushes_logs, logger
+
+# Today + yesterday: late outcome events still land in yesterday's bucket
+COMPACT_DAYS = 2
+
+
+async def run_analytics_compactor():
+    """
+    Flushes incremental Redis counters into daily_payment_analytics.
+
+    - Upsert per day (idempotent, safe to run every minute)
+    - Reads O(days) hashes, never scans payments
+    - The daily batch job remains the reconciliation pass
+    """
+
+    redis = await get_redis()
+    if not redis:
+        logger.warning("ANALYTICS_COMPACTOR_REDIS_UNAVAILABLE")
+        return {"status": "skipped"}
+
+    today = datetime.utcnow().date()
+    days = [today - timedelta(days=n) for n in range(COMPACT_DAYS)]
+
+    rows = []
+    hourly_rows = []
+    for day in days:
+        counters = await redis.hgetall(day_key(day))
+        if not counters:
+            continue
+
+        latency_buckets = await redis.hgetall(latency_day_key(day))
+        rows.append(counters_to_row(day, counters, latency_buckets))
+
+        start = datetime.combine(day, datetime.min.time())
+        hours = [start + timedelta(hours=h) for h in range(24)]
+
+        pipe = redis.pipeline(transaction=False)
+        for hour in hours:
+            pipe.hgetall(latency_hour_key(hour))
+
+        for hour, buckets in zip(hours, await pipe.execute()):
+            if buckets:
+                hourly_rows.append(
+                    {
+                        "hour": hour,
+                        "latency_sketch": LatencySketch.from_counts(buckets).to_bytes(),
+                    }
+                )
+
+    if not rows:
+        logger.info("ANALYTICS_COMPACTOR_EMPTY")
+        return {"status": "empty"}
+
+    engine, SessionLocal = create_worker_session_factory("analytics")
+
+    try:
+        async with SessionLocal() as session:
+            async with session.begin():
+                await upsert_daily_analytics(session, rows)
+                await upsert_hourly_latency(session, hourly_rows)
+
+        logger.info(
+            "ANALYTICS_COUNTERS_COMPACTED",
+            extra={"days": [row["date"].isoformat() for row in rows]},
+        )
+
+        return {"status": "processed", "days": len(rows)}
+
+    finally:
+        await engine.dispose()
+
+
+# --------------------------------------------------
+# 🔥 Lambda Entrypoint
+# --------------------------------------------------
+@flushes_logs
+def handler(event, context):
+    return asyncio.run(run_analytics_compactor())
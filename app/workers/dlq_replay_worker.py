@@ -1,10 +1,8 @@
-import json
 import os
-import boto3
-from app.core.logging import logger
-
-sqs = boto3.client("sqs")
-eventbridge = boto3.client("events")
+from app.core import metrics
+from app.transport.base import get_event_bus, get_queue_client
+from app.core.serialization import dumps_str, loads
+from app.core.logging import flushes_logs, logger
 
 DLQ_URL = os.environ["DLQ_URL"]
 EVENT_BUS = os.environ.get("EVENT_BUS_NAME", "default")
@@ -17,9 +15,14 @@ ALLOWED_EVENTS = {
 MAX_BATCH = 10
 
 
+@flushes_logs
+@metrics.flushes_metrics
 def handler(event, context):
     logger.info("DLQ_REPLAY_TRIGGERED")
 
+    sqs = get_queue_client()
+    eventbridge = get_event_bus()
+
     response = sqs.receive_message(
         QueueUrl=DLQ_URL,
         MaxNumberOfMessages=MAX_BATCH,
@@ -33,7 +36,7 @@ def handler(event, context):
 
     for msg in messages:
         try:
-            body = json.loads(msg["Body"])
+            body = loads(msg["Body"])
             detail_type = body.get("detail-type")
 
             if detail_type not in ALLOWED_EVENTS:
@@ -41,6 +44,7 @@ def handler(event, context):
                     "DLQ_SKIP_NON_TERMINAL_EVENT",
                     extra={"detail_type": detail_type}
                 )
+                metrics.incr("dlq.skipped")
                 # ❗ DELETE IT — poison message
                 sqs.delete_message(
                     QueueUrl=DLQ_URL,
@@ -61,7 +65,7 @@ def handler(event, context):
                 Entries=[{
                     "Source": body["source"],
                     "DetailType": body["detail-type"],
-                    "Detail": json.dumps(body["detail"]),
+                    "Detail": dumps_str(body["detail"]),
                     "EventBusName": EVENT_BUS
                 }]
             )
@@ -74,9 +78,11 @@ def handler(event, context):
                 ReceiptHandle=msg["ReceiptHandle"]
             )
 
+            metrics.incr("dlq.replayed", detail_type=detail_type)
             logger.info("DLQ_REPLAY_SUCCESS")
 
         except Exception as exc:
+            metrics.incr("dlq.replay_failed")
             logger.error(
                 "DLQ_REPLAY_FAILED",
                 extra={
@@ -1,13 +1,28 @@
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select
 
-from app.shared.models import Payment
+from app.shared.models import Payment, PaymentIdempotencyKey
+from app.services.payment_query import payment_by_id_query
+from app.core import metrics
 from app.core.redis import get_redis
 from app.core.logging import logger
 
 IDEMPOTENCY_TTL_SECONDS = 300
 
 
+def payment_by_idempotency_key_query(idempotency_key: str):
+    # Key registry carries the partition key → prunes to one partition
+    return (
+        select(Payment)
+        .join(
+            PaymentIdempotencyKey,
+            (Payment.id == PaymentIdempotencyKey.payment_id)
+            & (Payment.created_at == PaymentIdempotencyKey.created_at),
+        )
+        .where(PaymentIdempotencyKey.idempotency_key == idempotency_key)
+    )
+
+
 async def check_idempotency(
     session: AsyncSession,
     idempotency_key: str,
@@ -26,11 +41,10 @@ async def check_idempotency(
     # -------------------------
     if redis:
         try:
-            payment_id = await redis.get(f"idempotency:{idempotency_key}")
+            with metrics.timer("redis.command_ms", command="idempotency_get"):
+                payment_id = await redis.get(f"idempotency:{idempotency_key}")
             if payment_id:
-                result = await session.execute(
-                    select(Payment).where(Payment.id == payment_id)
-                )
+                result = await session.execute(payment_by_id_query(payment_id))
                 return result.scalar_one_or_none()
         except Exception as exc:
             logger.warning(
@@ -42,7 +56,7 @@ async def check_idempotency(
     # DB fallback
     # -------------------------
     result = await session.execute(
-        select(Payment).where(Payment.idempotency_key == idempotency_key)
+        payment_by_idempotency_key_query(idempotency_key)
     )
     payment = result.scalar_one_or_none()
 
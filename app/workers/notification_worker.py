@@ -0,0 +1,56 @@
+from typing import Any, Dict, Optional, Set
+
+from app.services.notification_engine import NotificationEngine
+from app.core.logging import logger
+
+# One engine per container: buffers survive between records of a batch,
+# channel rate limits survive between invocations
+_engine: Optional[NotificationEngine] = None
+
+# Source ids that failed in a mid-batch flush, reported by the next
+# flush_notifications()
+_undelivered: Set[str] = set()
+
+
+def get_notification_engine() -> NotificationEngine:
+    global _engine
+
+    if _engine is None:
+        _engine = NotificationEngine()
+    return _engine
+
+
+async def process_notification(
+    event_type: str,
+    payload: Dict[str, Any],
+    source_id: Optional[str] = None,
+) -> None:
+    """
+    Buffers a payment outcome notification (coalesced per user/channel).
+
+    Nothing is sent here — flush_notifications() sends the window.
+    Long-running consumers flush as soon as the window is due.
+    """
+    engine = get_notification_engine()
+    engine.add(event_type, payload, source_id=source_id)
+
+    logger.info(
+        "NOTIFICATION_BUFFERED",
+        extra={
+            "event_type": event_type,
+            "payment_id": payload.get("payment_id"),
+            "user_id": payload.get("user_id"),
+        },
+    )
+
+    if engine.due():
+        _undelivered.update(await engine.flush())
+
+
+async def flush_notifications() -> Set[str]:
+    """
+    Sends every buffered notification; returns failed source ids.
+    """
+    failed = _undelivered | await get_notification_engine().flush()
+    _undelivered.clear()
+    return failed
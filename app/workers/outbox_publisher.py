@@ -6,11 +6,49 @@ import asyncio
 from app.db.session import create_worker_session_factory
 from app.db.models.outbox import OutboxEvent
 from app.services.event_publisher import publish_event
-from app.core.logging import logger
+from app.core import metrics, tracing
+from app.core.logging import flushes_logs, logger
 
 BATCH_SIZE = 10
 
 
+def claim_batch_query(batch_size: int = BATCH_SIZE):
+    """
+    Oldest unpublished events, locked for this relay only.
+    Served by the partial index ix_outbox_events_unpublished.
+    """
+    return (
+        select(OutboxEvent)
+        .where(OutboxEvent.published_at.is_(None))
+        .order_by(OutboxEvent.occurred_at.asc())
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    )
+
+
+def _published_trace(trace_context):
+    if not trace_context:
+        return None
+    hops = {**(trace_context.get("hops") or {}), tracing.OUTBOX_PUBLISHED: tracing.now_ms()}
+    return {**trace_context, "hops": hops}
+
+
+def event_detail(event: OutboxEvent) -> dict:
+    """
+    EventBridge detail for an outbox row: payload + flattened envelope.
+    """
+    return {
+        **event.decoded_payload(),
+        "event_id": str(event.event_id),
+        "event_type": event.event_type,
+        "version": event.version,
+        "aggregate_id": str(event.aggregate_id),
+        "occurred_at": event.occurred_at.isoformat(),
+        "replayed": False,
+        "trace": _published_trace(event.trace_context),
+    }
+
+
 async def run_outbox_publisher():
     """
     Publishes domain events from the outbox table.
@@ -23,19 +61,13 @@ async def run_outbox_publisher():
     - Lambda-safe resource cleanup
     """
 
-    engine, SessionLocal = create_worker_session_factory()
+    engine, SessionLocal = create_worker_session_factory("publisher")
 
     try:
         async with SessionLocal() as session:  # type: AsyncSession
 
             async with session.begin():
-                result = await session.execute(
-                    select(OutboxEvent)
-                    .where(OutboxEvent.published_at.is_(None))
-                    .order_by(OutboxEvent.occurred_at.asc())
-                    .limit(BATCH_SIZE)
-                    .with_for_update(skip_locked=True)
-                )
+                result = await session.execute(claim_batch_query())
 
                 events = result.scalars().all()
 
@@ -51,20 +83,19 @@ async def run_outbox_publisher():
                         publish_event(
                             event_type=event.event_type,
                             version=str(event.version),
-                            payload={
-                                **event.payload,
-                                "event_id": str(event.event_id),
-                                "event_type": event.event_type,
-                                "version": event.version,
-                                "occurred_at": event.occurred_at.isoformat(),
-                                "replayed": False,
-                            },
+                            payload=event_detail(event),
                             event_id=str(event.event_id),
                         )
 
                         event.published_at = datetime.now(timezone.utc)
                         published_count += 1
 
+                        metrics.incr("outbox.published", event_type=event.event_type)
+                        metrics.observe(
+                            "outbox.publish_lag_ms",
+                            (event.published_at - event.occurred_at).total_seconds() * 1000,
+                        )
+
                         logger.info(
                             "OUTBOX_EVENT_PUBLISHED",
                             extra={
@@ -75,6 +106,7 @@ async def run_outbox_publisher():
                         )
 
                     except Exception as exc:
+                        metrics.incr("outbox.publish_failed", event_type=event.event_type)
                         logger.exception(
                             "OUTBOX_EVENT_PUBLISH_FAILED",
                             extra={
@@ -97,9 +129,12 @@ async def run_outbox_publisher():
 # --------------------------------------------------
 # 🔥 Lambda Entrypoint
 # --------------------------------------------------
+@flushes_logs
+@metrics.flushes_metrics
 def handler(event, context):
     """
     AWS Lambda entrypoint.
     Fully executes async publisher.
     """
-    return asyncio.run(run_outbox_publisher())
+    with metrics.timer("outbox.relay_ms"):
+        return asyncio.run(run_outbox_publisher())
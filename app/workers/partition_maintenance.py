@@ -0,0 +1,240 @@
+import asyncio
+import os
+import re
+from datetime import date, datetime, timezone
+from typing import Dict, List, Optional
+
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection
+
+from app.db.session import create_worker_session_factory
+from app.core import metrics
+from app.core.logging import flushes_logs, logger
+
+# table → (partition column, bound suffix, key registry, registry column)
+PARTITIONED_TABLES = {
+    "payments": ("created_at", "", "payment_idempotency_keys", "created_at"),
+    "outbox_events": ("occurred_at", " 00:00:00+00", "outbox_event_ids", "occurred_at"),
+}
+
+MONTHS_AHEAD = int(os.getenv("PARTITION_MONTHS_AHEAD", "3"))
+
+# Unset → keep everything. N → partitions older than N months are removed.
+RETENTION_MONTHS = os.getenv("PARTITION_RETENTION_MONTHS")
+
+# "detach" keeps the old table around (archive / export), "drop" deletes it
+RETENTION_MODE = os.getenv("PARTITION_RETENTION_MODE", "detach")
+
+# There is no DEFAULT partition: an insert into a month without a
+# partition fails. Fewer months than this ahead (before this run
+# creates any) means the schedule has been missing runs.
+MIN_MONTHS_AHEAD = int(os.getenv("PARTITION_MIN_MONTHS_AHEAD", "1"))
+
+_PARTITION_NAME = re.compile(r"_p(\d{4})_(\d{2})$")
+
+
+def _add_months(value: date, months: int) -> date:
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+async def _existing_partitions(
+    conn: AsyncConnection,
+    table: str,
+    detach_pending: bool = False,
+) -> Dict[date, str]:
+    """
+    Monthly partitions by month. detach_pending=True returns only those
+    left half-detached by an interrupted DETACH … CONCURRENTLY.
+    """
+    result = await conn.execute(
+        text(
+            """
+            SELECT child.relname
+            FROM pg_inherits
+            JOIN pg_class parent ON parent.oid = pg_inherits.inhparent
+            JOIN pg_class child ON child.oid = pg_inherits.inhrelid
+            WHERE parent.relname = :table
+              AND pg_inherits.inhdetachpending = :detach_pending
+            """
+        ),
+        {"table": table, "detach_pending": detach_pending},
+    )
+
+    partitions = {}
+    for (name,) in result:
+        match = _PARTITION_NAME.search(name)
+        if match:
+            partitions[date(int(match[1]), int(match[2]), 1)] = name
+    return partitions
+
+
+async def months_ahead(conn: AsyncConnection, table: str) -> int:
+    """
+    Consecutive months with a partition after the current one
+    (-1 → not even the current month is covered).
+    """
+    existing = await _existing_partitions(conn, table)
+    month = datetime.now(timezone.utc).date().replace(day=1)
+
+    covered = -1
+    while month in existing:
+        covered += 1
+        month = _add_months(month, 1)
+    return covered
+
+
+async def ensure_partitions(
+    conn: AsyncConnection,
+    table: str,
+    first_month: date,
+    last_month: date,
+) -> List[str]:
+    """
+    Creates every missing monthly partition in [first_month, last_month].
+    Idempotent — existing months are skipped.
+    """
+    _, suffix, _, _ = PARTITIONED_TABLES[table]
+    existing = await _existing_partitions(conn, table)
+
+    created = []
+    month = first_month.replace(day=1)
+    while month <= last_month:
+        upper = _add_months(month, 1)
+
+        if month not in existing:
+            name = f"{table}_p{month:%Y_%m}"
+            await conn.execute(
+                text(
+                    f"""
+                    CREATE TABLE {name}
+                    PARTITION OF {table}
+                    FOR VALUES FROM ('{month.isoformat()}{suffix}')
+                               TO ('{upper.isoformat()}{suffix}')
+                    """
+                )
+            )
+            created.append(name)
+
+        month = upper
+
+    return created
+
+
+async def ensure_future_partitions(
+    conn: AsyncConnection,
+    table: str,
+    months_ahead: int = MONTHS_AHEAD,
+) -> List[str]:
+    """
+    Creates monthly partitions from the current month to `months_ahead`.
+    """
+    this_month = datetime.now(timezone.utc).date().replace(day=1)
+    return await ensure_partitions(
+        conn, table, this_month, _add_months(this_month, months_ahead)
+    )
+
+
+async def expire_old_partitions(
+    conn: AsyncConnection,
+    table: str,
+    retention_months: int,
+    mode: str = RETENTION_MODE,
+) -> List[str]:
+    """
+    Detaches (or drops) partitions entirely older than the retention window.
+
+    Retention is a catalog operation — no DELETE, no vacuum debt. The
+    matching rows in the uniqueness registry are pruned alongside.
+
+    `conn` must be in AUTOCOMMIT: DETACH … CONCURRENTLY cannot run inside
+    a transaction block, and takes only a SHARE UPDATE EXCLUSIVE lock on
+    the parent, so inserts and reads keep flowing while it waits.
+    A detach interrupted half-way is finalized on the next run.
+    """
+    _, _, registry, registry_column = PARTITIONED_TABLES[table]
+    cutoff = _add_months(
+        datetime.now(timezone.utc).date().replace(day=1), -retention_months
+    )
+
+    pending = await _existing_partitions(conn, table, detach_pending=True)
+    for name in pending.values():
+        await conn.execute(text(f"ALTER TABLE {table} DETACH PARTITION {name} FINALIZE"))
+
+    existing = await _existing_partitions(conn, table)
+
+    expired = []
+    for month, name in sorted({**existing, **pending}.items()):
+        if month >= cutoff:
+            continue
+
+        if name not in pending.values():
+            await conn.execute(
+                text(f"ALTER TABLE {table} DETACH PARTITION {name} CONCURRENTLY")
+            )
+        if mode == "drop":
+            await conn.execute(text(f"DROP TABLE {name}"))
+        expired.append(name)
+
+    if expired:
+        await conn.execute(
+            text(f"DELETE FROM {registry} WHERE {registry_column} < :cutoff"),
+            {"cutoff": cutoff},
+        )
+
+    return expired
+
+
+async def run_partition_maintenance(
+    retention_months: Optional[int] = None,
+):
+    """
+    Keeps monthly partitions rolling for payments and outbox_events.
+
+    Safe to run on any schedule (daily is plenty).
+    """
+    if retention_months is None and RETENTION_MONTHS:
+        retention_months = int(RETENTION_MONTHS)
+
+    engine, _ = create_worker_session_factory(pool_size=1)
+
+    try:
+        summary = {"created": [], "expired": [], "months_ahead": {}}
+
+        async with engine.begin() as conn:
+            for table in PARTITIONED_TABLES:
+                covered = await months_ahead(conn, table)
+                summary["months_ahead"][table] = covered
+                metrics.gauge("partitions.months_ahead", covered, table=table)
+
+                if covered < MIN_MONTHS_AHEAD:
+                    # Inserts fail once "now" passes the last partition
+                    logger.error(
+                        "PARTITION_COVERAGE_LOW",
+                        extra={"table": table, "months_ahead": covered},
+                    )
+
+                summary["created"] += await ensure_future_partitions(conn, table)
+
+        if retention_months is not None:
+            async with engine.connect() as conn:
+                autocommit = await conn.execution_options(isolation_level="AUTOCOMMIT")
+                for table in PARTITIONED_TABLES:
+                    summary["expired"] += await expire_old_partitions(
+                        autocommit, table, retention_months
+                    )
+
+        logger.info("PARTITION_MAINTENANCE_COMPLETE", extra=summary)
+        return {"status": "processed", **summary}
+
+    finally:
+        await engine.dispose()
+
+
+# --------------------------------------------------
+# 🔥 Lambda Entrypoint
+# --------------------------------------------------
+@flushes_logs
+@metrics.flushes_metrics
+def handler(event, context):
+    return asyncio.run(run_partition_maintenance())
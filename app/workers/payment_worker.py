@@ -1,33 +1,82 @@
+import uuid
+from datetime import datetime
+
+from app.db.session import create_worker_session_factory
+from app.db.models.outbox import build_outbox_event
+from app.events.payment_events import payment_outcome_event
+from app.services.fake_gateway import charge, PaymentGatewayError
+from app.services.payment_query import payment_by_id_query, publish_payment_status
+from app.shared.models import PaymentStatus
+from app.core import metrics, tracing
+from app.core.logging import logger
+
+
 # --------------------------------------------------
-# Lambda batch processor
+# Single payment execution (effectively-once)
 # --------------------------------------------------
-async def run_worker(event):
-    records = event.get("Records", [])
-
-    for record in records:
-        try:
-            body = json.loads(record["body"])
-            detail = body.get("detail", {})
-            raw_payment_id = detail.get("payment_id")
-
-            if not raw_payment_id:
-                logger.warning("MISSING_PAYMENT_ID")
-                continue
-
-            # 🔥 UUID VALIDATION (CRITICAL FIX)
-            try:
-                payment_uuid = uuid.UUID(str(raw_payment_id))
-            except ValueError:
-                logger.warning(
-                    "INVALID_PAYMENT_ID_FORMAT",
-                    extra={"payment_id": raw_payment_id},
+async def process_payment(payment_id: str):
+    """
+    Executes a PENDING payment and records its terminal state.
+
+    Guarantees:
+    - Row lock (SELECT … FOR UPDATE) serialises duplicate deliveries
+    - Non-PENDING payments are skipped (retry safe)
+    - Terminal state + outcome outbox event committed atomically
+    """
+
+    engine, SessionLocal = create_worker_session_factory()
+
+    try:
+        async with SessionLocal() as session:
+            async with session.begin():
+                result = await session.execute(
+                    payment_by_id_query(uuid.UUID(payment_id)).with_for_update()
                 )
-                continue
+                payment = result.scalar_one_or_none()
+
+                if not payment:
+                    logger.warning(
+                        "PAYMENT_NOT_FOUND",
+                        extra={"payment_id": payment_id},
+                    )
+                    return
+
+                if payment.status != PaymentStatus.PENDING:
+                    logger.info(
+                        "PAYMENT_ALREADY_PROCESSED",
+                        extra={
+                            "payment_id": payment_id,
+                            "status": payment.status.value,
+                        },
+                    )
+                    return
+
+                tracing.mark(tracing.GATEWAY_STARTED)
+                try:
+                    await charge(payment.amount)
+                    payment.status = PaymentStatus.SUCCESS
+                except PaymentGatewayError as exc:
+                    logger.warning(
+                        "PAYMENT_GATEWAY_FAILED",
+                        extra={"payment_id": payment_id, "error": str(exc)},
+                    )
+                    payment.status = PaymentStatus.FAILED
+
+                tracing.mark(tracing.GATEWAY_COMPLETED)
+                payment.processed_at = datetime.utcnow()
+                metrics.incr("payments.processed", status=payment.status.value)
+
+                event = payment_outcome_event(payment)
+
+                session.add(build_outbox_event(event, aggregate_id=payment.id))
+
+        logger.info(
+            "PAYMENT_PROCESSED",
+            extra={"payment_id": payment_id, "status": payment.status.value},
+        )
 
-            await process_payment(str(payment_uuid))
+        # Committed → wake clients waiting on GET /payments/{id}/events
+        await publish_payment_status(payment)
 
-        except Exception as exc:
-            logger.exception(
-                "WORKER_RECORD_FAILED",
-                extra={"error": str(exc)},
-            )
+    finally:
+        await engine.dispose()
@@ -1,20 +1,32 @@
-import json
+import time
 import asyncio
-from typing import Any, Dict
+from typing import Any, Dict, List
 
-from app.core.logging import logger
-from app.events.schema import EventEnvelope
+from app.core import metrics, tracing
+from app.core.logging import flushes_logs, logger
+from app.core.serialization import loads
+from app.events.schema import envelope_from_message
+from app.events.registry import UnknownEventSchema, schema_name, upcast
 from app.workers.payment_worker import process_payment
-from app.workers.notification_worker import process_notification
+from app.workers.notification_worker import flush_notifications, process_notification
+from app.services.analytics_counters import (
+    record_payment_created,
+    record_payment_outcome,
+)
 
-print("🔥🔥 WORKER IMAGE VERSION: 2026-02-10-OUTBOX-V1-SAFE 🔥🔥")
+logger.info("🔥🔥 WORKER IMAGE VERSION: 2026-02-10-OUTBOX-V1-SAFE 🔥🔥")
 
 
 # ==================================================
 # Core async handler
 # ==================================================
-async def _handle_records(event: Dict[str, Any]):
+async def _handle_records(event: Dict[str, Any]) -> List[str]:
+    """
+    Processes an SQS batch; returns the messageIds that must be retried
+    (partial batch response — one bad record no longer retries the rest).
+    """
     records = event.get("Records", [])
+    failed_ids: List[str] = []
 
     logger.info(
         "SQS_BATCH_RECEIVED",
@@ -22,21 +34,47 @@ async def _handle_records(event: Dict[str, Any]):
     )
 
     for record in records:
+        started = time.perf_counter()
         try:
             raw_body = record.get("body")
             if not raw_body:
                 raise ValueError("Empty SQS body")
 
-            body = json.loads(raw_body)
+            body = loads(raw_body)
 
             # ------------------------------------------
             # STRICT event schema validation (🔥 PHASE 4)
             # ------------------------------------------
-            event_envelope = EventEnvelope.model_validate(body)
+            event_envelope = envelope_from_message(body)
 
-            event_type = event_envelope.event_type
-            version = event_envelope.version
-            payload = event_envelope.payload
+            # ------------------------------------------
+            # Trace: SQS enqueue + worker pickup hops
+            # ------------------------------------------
+            tracing.resume_trace(event_envelope.trace)
+            sent_timestamp = (record.get("attributes") or {}).get("SentTimestamp")
+            if sent_timestamp:
+                tracing.mark(tracing.SQS_SENT, float(sent_timestamp))
+            tracing.mark(tracing.WORKER_RECEIVED)
+
+            # ------------------------------------------
+            # Upcast to the latest registered version
+            # ------------------------------------------
+            event_type = schema_name(event_envelope.event_type)
+            try:
+                version, payload = upcast(
+                    event_type,
+                    event_envelope.version,
+                    event_envelope.payload,
+                )
+            except UnknownEventSchema:
+                logger.warning(
+                    "UNSUPPORTED_EVENT_VERSION",
+                    extra={
+                        "event_type": event_envelope.event_type,
+                        "version": event_envelope.version,
+                    },
+                )
+                continue
 
             logger.info(
                 "DOMAIN_EVENT_RECEIVED",
@@ -55,13 +93,26 @@ async def _handle_records(event: Dict[str, Any]):
                 if not payment_id:
                     raise ValueError("payment_id missing in payload")
 
+                # Queueing stages up to this pickup (first trip only —
+                # outcome events re-use the same trace)
+                for stage_name, ms in tracing.stage_durations(tracing.current_trace()).items():
+                    if stage_name != "total":
+                        metrics.observe("trace.stage_ms", ms, stage=stage_name)
+
+                await record_payment_created(str(event_envelope.event_id), payload)
                 await process_payment(payment_id)
 
             elif event_type == "payment.success" and version == 1:
-                await process_notification("payment.success", payload)
+                await record_payment_outcome(str(event_envelope.event_id), payload)
+                await process_notification(
+                    "payment.success", payload, source_id=record.get("messageId")
+                )
 
             elif event_type == "payment.failed" and version == 1:
-                await process_notification("payment.failed", payload)
+                await record_payment_outcome(str(event_envelope.event_id), payload)
+                await process_notification(
+                    "payment.failed", payload, source_id=record.get("messageId")
+                )
 
             else:
                 logger.warning(
@@ -72,21 +123,43 @@ async def _handle_records(event: Dict[str, Any]):
                     },
                 )
 
+            metrics.incr("sqs.records", event_type=event_type, outcome="processed")
+            metrics.observe(
+                "sqs.record_ms",
+                (time.perf_counter() - started) * 1000,
+                event_type=event_type,
+            )
+
         except Exception as exc:
+            metrics.incr("sqs.records", outcome="failed")
             logger.exception(
                 "SQS_RECORD_PROCESSING_FAILED",
-                extra={"error": str(exc)},
+                extra={"error": str(exc), "message_id": record.get("messageId")},
             )
-            # 🔥 Force retry / DLQ
-            raise
+            if not record.get("messageId"):
+                raise
+
+            # 🔥 Retry / DLQ this record only
+            failed_ids.append(record["messageId"])
+
+    # ------------------------------------------
+    # Send the batch's coalesced notifications
+    # ------------------------------------------
+    for message_id in await flush_notifications():
+        if message_id not in failed_ids:
+            failed_ids.append(message_id)
+
+    return failed_ids
 
 
 # ==================================================
 # Lambda entrypoint (SYNC)
 # ==================================================
+@flushes_logs
+@metrics.flushes_metrics
 def handler(event: Dict[str, Any], context):
     try:
-        asyncio.run(_handle_records(event))
+        failed_ids = asyncio.run(_handle_records(event))
     except Exception as exc:
         logger.exception(
             "SQS_BATCH_FAILED",
@@ -94,4 +167,8 @@ def handler(event: Dict[str, Any], context):
         )
         raise
 
-    return {"status": "ok"}
+    return {
+        "status": "ok",
+        # ReportBatchItemFailures (see lambda_payment_worker.tf)
+        "batchItemFailures": [{"itemIdentifier": message_id} for message_id in failed_ids],
+    }
@@ -0,0 +1,10 @@
+"""
+Performance benchmarks.
+
+Run from the repo root, e.g.:
+    python -m benchmarks.uuid_inserts
+
+Benchmarks talk to LOCAL stand-ins only (docker-compose Postgres on
+localhost:5433 by default, override with BENCH_DATABASE_URL).
+They are not shipped in the Lambda images.
+"""
@@ -0,0 +1,90 @@
+"""
+Event payload encode/decode: current JSON path vs the binary registry.
+
+    python -m benchmarks.event_codec --iterations 50000
+
+JSON path   = json.dumps on publish, json.loads + EventEnvelope on consume
+Binary path = registry.encode / registry.decode (msgpack, zlib ≥ 512 B)
+Reports ops/sec and encoded size for a typical and a large payload.
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+
+from app.core.ids import uuid7
+from app.events import registry
+from app.events.schema import EventEnvelope
+
+
+def _payloads():
+    base = {
+        "payment_id": str(uuid7()),
+        "user_id": str(uuid7()),
+        "amount": 500,
+        "currency": "INR",
+        "created_at": datetime.now(timezone.utc).isoformat(),
+    }
+    large = {
+        **base,
+        "metadata": {f"attribute_{i}": f"value-{i}" * 4 for i in range(40)},
+    }
+    return {"typical": base, "large": large}
+
+
+def _envelope(payload):
+    return {
+        "event_id": str(uuid7()),
+        "event_type": "payment.created",
+        "aggregate_id": payload["payment_id"],
+        "version": 1,
+        "occurred_at": datetime.now(timezone.utc).isoformat(),
+        "payload": payload,
+    }
+
+
+def _bench(fn, iterations: int) -> float:
+    return round(iterations / timeit.timeit(fn, number=iterations), 1)
+
+
+def run(iterations: int):
+    results = []
+
+    for label, payload in _payloads().items():
+        envelope = _envelope(payload)
+        json_body = json.dumps(envelope)
+        binary_body = registry.encode("payment.created", 1, payload)
+
+        results.append(
+            {
+                "payload": label,
+                "json_bytes": len(json_body.encode()),
+                "binary_bytes": len(binary_body),
+                "json_encode_ops": _bench(lambda: json.dumps(envelope), iterations),
+                "binary_encode_ops": _bench(
+                    lambda: registry.encode("payment.created", 1, payload),
+                    iterations,
+                ),
+                "json_decode_ops": _bench(
+                    lambda: EventEnvelope.model_validate(json.loads(json_body)),
+                    iterations,
+                ),
+                "binary_decode_ops": _bench(
+                    lambda: registry.decode(binary_body), iterations
+                ),
+            }
+        )
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    print(json.dumps(run(args.iterations), indent=2))
+
+
+if __name__ == "__main__":
+    main()
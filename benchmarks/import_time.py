@@ -0,0 +1,128 @@
+"""
+Cold-start import cost per Lambda entry point.
+
+    python -m benchmarks.import_time --runs 5 --top 10
+
+Each entry point is imported in a fresh interpreter under
+`python -X importtime`; the summed self-time of every module imported
+(minus a bare interpreter's own startup imports) is compared against the
+entry point's budget. Median of --runs is reported.
+Exit code 1 if any entry point is over budget or fails to import.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from typing import Dict, List, Tuple
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+@dataclass
+class EntryPoint:
+    module: str
+    attribute: str
+    budget_ms: float
+
+
+ENTRY_POINTS: List[EntryPoint] = [
+    EntryPoint("app.main", "handler", budget_ms=900.0),
+    EntryPoint("app.workers.sqs_worker", "handler", budget_ms=600.0),
+    EntryPoint("app.workers.outbox_publisher", "handler", budget_ms=600.0),
+    EntryPoint("app.workers.dlq_replay_worker", "handler", budget_ms=150.0),
+]
+
+
+def _import_profile(statement: str) -> Tuple[float, Dict[str, float]]:
+    """
+    (total self ms, module → cumulative ms) for one fresh interpreter.
+    """
+    env = {
+        **os.environ,
+        # module-level os.environ[...] lookups must not fail the import
+        "PAYMENT_QUEUE_URL": os.getenv("PAYMENT_QUEUE_URL", "local"),
+        "DLQ_URL": os.getenv("DLQ_URL", "local"),
+        "PYTHONDONTWRITEBYTECODE": "1",
+    }
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", statement],
+        cwd=REPO_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    if completed.returncode != 0:
+        error = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+        raise RuntimeError(error[0])
+
+    total_us = 0
+    cumulative: Dict[str, float] = {}
+    for line in completed.stderr.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        total_us += int(self_us)
+        cumulative[name.strip()] = int(cumulative_us) / 1000
+
+    return total_us / 1000, cumulative
+
+
+def measure(entry: EntryPoint, runs: int, baseline_ms: float) -> Dict:
+    statement = f"from {entry.module} import {entry.attribute}"
+
+    samples = []
+    heaviest: Dict[str, float] = {}
+    for _ in range(runs):
+        total_ms, heaviest = _import_profile(statement)
+        samples.append(total_ms - baseline_ms)
+
+    import_ms = statistics.median(samples)
+    return {
+        "entry_point": f"{entry.module}.{entry.attribute}",
+        "import_ms": round(import_ms, 1),
+        "budget_ms": entry.budget_ms,
+        "over_budget": import_ms > entry.budget_ms,
+        "heaviest": sorted(
+            ((name, ms) for name, ms in heaviest.items() if "." not in name),
+            key=lambda item: item[1],
+            reverse=True,
+        ),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=8, help="heaviest packages shown")
+    args = parser.parse_args()
+
+    baseline_ms = statistics.median(
+        _import_profile("pass")[0] for _ in range(args.runs)
+    )
+
+    failed = False
+    for entry in ENTRY_POINTS:
+        try:
+            result = measure(entry, args.runs, baseline_ms)
+        except RuntimeError as exc:
+            failed = True
+            name = f"{entry.module}.{entry.attribute}"
+            print(f"FAIL {name:40} import error: {exc}")
+            continue
+
+        failed |= result["over_budget"]
+        status = "FAIL" if result["over_budget"] else "ok"
+        print(
+            f"{status:4} {result['entry_point']:40} "
+            f"{result['import_ms']:>8.1f}ms / {result['budget_ms']:.0f}ms"
+        )
+        for name, ms in result["heaviest"][: args.top]:
+            print(f"       {name:32} {ms:>8.1f}ms")
+
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,12 @@
+"""
+Micro-benchmarks for the hot functions, each called in isolation.
+
+    python -m benchmarks.micro --out micro.json
+    python -m benchmarks.micro --cases rate_limit,create_payment --compare micro.json
+
+Per case: ops/sec, p50/p99 per call, tracemalloc allocations per call
+and round trips per call (database statements, Redis commands, AWS
+calls). Stand-ins: the local Postgres (BENCH_DATABASE_URL), the
+in-process FakeRedis unless --redis-url points at a server, and a
+recording EventBridge stub. DB cases write rows to the local database.
+"""
@@ -0,0 +1,124 @@
+import uuid
+from datetime import datetime, timezone
+from typing import List
+
+from app.core.ids import uuid7
+from app.core.rate_limit import rate_limit
+from app.db.models.outbox import build_outbox_event
+from app.events.payment_events import payment_created_event
+from app.events.schema import EventEnvelope
+from app.services.event_publisher import publish_event
+from app.services.payment_service import create_payment
+from app.shared.models import Payment, PaymentStatus
+from app.workers.idempotency import check_idempotency
+from app.workers.outbox_publisher import claim_batch_query, event_detail
+
+from benchmarks.micro.harness import Case
+
+
+def _sample_payment() -> Payment:
+    return Payment(
+        id=uuid7(),
+        user_id=uuid.uuid4(),
+        amount=500,
+        currency="INR",
+        idempotency_key="bench-sample",
+        status=PaymentStatus.PENDING,
+        created_at=datetime.now(timezone.utc),
+    )
+
+
+def build_cases(SessionLocal) -> List[Case]:
+    """
+    Cases in run order: create_payment runs before the outbox claim so
+    there are unpublished rows to claim. Pure cases need no database.
+    """
+    payment = _sample_payment()
+    created = payment_created_event(payment)
+    outbox_row = build_outbox_event(created, aggregate_id=payment.id)
+
+    # Wire form the worker validates (strings, as decoded from JSON)
+    envelope = {
+        "event_id": created["event_id"],
+        "event_type": created["event_type"],
+        "aggregate_id": str(payment.id),
+        "version": created["version"],
+        "occurred_at": created["occurred_at"].isoformat(),
+        "payload": created["payload"],
+        "trace": None,
+    }
+
+    # --------------------------------------------------
+    # Pure
+    # --------------------------------------------------
+    def payment_created_event_case():
+        payment_created_event(payment)
+
+    def envelope_validate_case():
+        EventEnvelope.model_validate(envelope)
+
+    def publish_event_case():
+        publish_event(
+            event_type=outbox_row.event_type,
+            version=str(outbox_row.version),
+            payload=event_detail(outbox_row),
+            event_id=str(outbox_row.event_id),
+        )
+
+    # --------------------------------------------------
+    # Redis / DB
+    # --------------------------------------------------
+    async def rate_limit_case():
+        # First request of a user: INCR + EXPIRE
+        await rate_limit(uuid.uuid4().hex)
+
+    async def create_payment_case():
+        async with SessionLocal() as session:
+            await create_payment(
+                db=session,
+                user_id=uuid.uuid4(),
+                amount=500,
+                currency="INR",
+                idempotency_key=uuid.uuid4().hex,
+            )
+
+    # One stored payment whose key is cached by the write-through,
+    # created on the first (warm-up) call
+    hit_key = f"bench-hit-{uuid.uuid4().hex}"
+    seeded = False
+
+    async def idempotency_hit_case():
+        nonlocal seeded
+        async with SessionLocal() as session:
+            if not seeded:
+                await create_payment(
+                    db=session,
+                    user_id=uuid.uuid4(),
+                    amount=500,
+                    currency="INR",
+                    idempotency_key=hit_key,
+                )
+                seeded = True
+                return
+            await check_idempotency(session, hit_key)
+
+    async def idempotency_miss_case():
+        async with SessionLocal() as session:
+            await check_idempotency(session, uuid.uuid4().hex)
+
+    async def outbox_claim_case():
+        # Claim + release (nothing marked published)
+        async with SessionLocal() as session:
+            async with session.begin():
+                (await session.execute(claim_batch_query())).scalars().all()
+
+    return [
+        Case("payment_created_event", payment_created_event_case),
+        Case("EventEnvelope.model_validate", envelope_validate_case),
+        Case("publish_event", publish_event_case),
+        Case("rate_limit", rate_limit_case, needs=("redis",)),
+        Case("check_idempotency.hit", idempotency_hit_case, needs=("db", "redis")),
+        Case("check_idempotency.miss", idempotency_miss_case, needs=("db", "redis")),
+        Case("create_payment", create_payment_case, needs=("db", "redis")),
+        Case("outbox.claim", outbox_claim_case, needs=("db",)),
+    ]
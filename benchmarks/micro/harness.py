@@ -0,0 +1,159 @@
+import time
+import asyncio
+import tracemalloc
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple
+
+from sqlalchemy import event
+
+
+@dataclass
+class Case:
+    name: str
+    fn: Callable[[], Any]  # sync, or async (awaited)
+    needs: Tuple[str, ...] = ()  # "db" / "redis" → the fewer --db-iterations
+
+
+# --------------------------------------------------
+# Round-trip counters
+# --------------------------------------------------
+class DbRoundTrips:
+    """
+    Statements + transaction control on one engine (pre-ping excluded).
+    """
+
+    def __init__(self, engine):
+        self.count = 0
+        sync_engine = engine.sync_engine
+        for name in ("before_cursor_execute", "begin", "commit", "rollback"):
+            event.listen(sync_engine, name, self._count)
+
+    def _count(self, *args, **kwargs) -> None:
+        self.count += 1
+
+
+class RedisRoundTrips:
+    """
+    FakeRedis command counter, or the server's total_commands_processed
+    (minus the INFO call itself) for a real Redis.
+    """
+
+    def __init__(self, redis_url: str):
+        self.redis_url = redis_url
+
+    async def count(self) -> int:
+        from app.core.redis import redis_from_url
+
+        if self.redis_url.startswith("memory://"):
+            from app.transport.fake_redis import command_count
+
+            return command_count()
+
+        client = redis_from_url(self.redis_url, decode_responses=True)
+        try:
+            return int((await client.info("stats"))["total_commands_processed"])
+        finally:
+            await client.close()
+
+    def correction(self) -> int:
+        return 0 if self.redis_url.startswith("memory://") else 1
+
+
+class RecordingEventBus:
+    """
+    EventBridge stand-in: accepts everything, keeps nothing.
+    """
+
+    def __init__(self):
+        self.calls = 0
+
+    def put_events(self, *, Entries: List[Dict[str, Any]]) -> Dict[str, Any]:
+        self.calls += 1
+        return {"FailedEntryCount": 0, "Entries": [{"EventId": "bench"} for _ in Entries]}
+
+
+class RoundTrips:
+    def __init__(self, db: DbRoundTrips, redis: RedisRoundTrips, bus: RecordingEventBus):
+        self.db, self.redis, self.bus = db, redis, bus
+
+    async def snapshot(self) -> Dict[str, int]:
+        return {"db": self.db.count, "redis": await self.redis.count(), "aws": self.bus.calls}
+
+    async def per_call(self, before: Dict[str, int], calls: int) -> Dict[str, float]:
+        after = await self.snapshot()
+        deltas = {key: after[key] - before[key] for key in after}
+        deltas["redis"] -= self.redis.correction()
+        return {key: round(value / calls, 2) for key, value in deltas.items()}
+
+
+# --------------------------------------------------
+# Measurement
+# --------------------------------------------------
+def _quantile(values: List[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def _call(fn, is_async: bool) -> None:
+    if is_async:
+        await fn()
+    else:
+        fn()
+
+
+async def measure(
+    case: Case,
+    iterations: int,
+    alloc_samples: int,
+    round_trips: RoundTrips,
+) -> Dict[str, Any]:
+    """
+    Warm-up, timed loop (ops/sec, per-call latency, round trips), then
+    a separate tracemalloc pass — tracing distorts timings.
+    """
+    fn = case.fn
+    is_async = asyncio.iscoroutinefunction(fn)
+
+    for _ in range(max(1, iterations // 20)):
+        await _call(fn, is_async)
+
+    before = await round_trips.snapshot()
+    latencies: List[float] = []
+    started = time.perf_counter()
+    if is_async:
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            await fn()
+            latencies.append(time.perf_counter() - t0)
+    else:
+        for _ in range(iterations):
+            t0 = time.perf_counter()
+            fn()
+            latencies.append(time.perf_counter() - t0)
+    elapsed = time.perf_counter() - started
+    per_call = await round_trips.per_call(before, iterations)
+
+    tracemalloc.start()
+    try:
+        first = tracemalloc.take_snapshot()
+        peaks = []
+        for _ in range(alloc_samples):
+            tracemalloc.reset_peak()
+            current = tracemalloc.get_traced_memory()[0]
+            await _call(fn, is_async)
+            peaks.append(tracemalloc.get_traced_memory()[1] - current)
+        stats = tracemalloc.take_snapshot().compare_to(first, "filename")
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "iterations": iterations,
+        "ops_per_second": round(iterations / elapsed, 1),
+        "p50_us": round(_quantile(latencies, 0.50) * 1e6, 1),
+        "p99_us": round(_quantile(latencies, 0.99) * 1e6, 1),
+        # peak working memory of one call / what it leaves behind
+        "alloc_peak_bytes": round(sum(peaks) / alloc_samples),
+        "alloc_retained_bytes": round(sum(s.size_diff for s in stats) / alloc_samples),
+        "alloc_retained_blocks": round(sum(s.count_diff for s in stats) / alloc_samples, 1),
+        "round_trips": per_call,
+    }
@@ -0,0 +1,95 @@
+"""
+JSON serialization: stdlib path vs app.core.serialization (orjson).
+
+    python -m benchmarks.serialization --iterations 50000
+
+Response path = jsonable_encoder + json.dumps (FastAPI default)
+                vs serialization.dumps (hot routes return FastJSONResponse)
+Dict path     = jsonable_encoder + json.dumps
+                vs jsonable_encoder + serialization.dumps (a route that
+                returns a dict: FastAPI encodes it before render)
+Event path    = json.dumps / json.loads (publish → consume)
+                vs serialization.dumps_str / loads
+Reports ops/sec per path and the speed-up.
+"""
+import argparse
+import json
+import timeit
+from datetime import datetime, timezone
+
+from fastapi.encoders import jsonable_encoder
+
+from app.core import serialization
+from app.core.ids import uuid7
+
+
+def _samples():
+    now = datetime.now(timezone.utc)
+    payment_id = uuid7()
+
+    response = {
+        "status": "accepted",
+        "payment_id": payment_id,
+        "idempotency_key": "bench-key-0001",
+        "created_at": now,
+    }
+    event = {
+        "event_id": str(uuid7()),
+        "event_type": "payment.created",
+        "aggregate_id": str(payment_id),
+        "version": 1,
+        "occurred_at": now.isoformat(),
+        "payload": {
+            "payment_id": str(payment_id),
+            "user_id": str(uuid7()),
+            "amount": 500,
+            "currency": "INR",
+            "created_at": now.isoformat(),
+        },
+    }
+    return response, event
+
+
+def _ops(fn, iterations: int) -> float:
+    return iterations / timeit.timeit(fn, number=iterations)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--iterations", type=int, default=50_000)
+    args = parser.parse_args()
+
+    response, event = _samples()
+    event_text = json.dumps(event)
+
+    cases = {
+        "response": (
+            lambda: json.dumps(jsonable_encoder(response)).encode(),
+            lambda: serialization.dumps(response),
+        ),
+        "response.dict": (
+            lambda: json.dumps(jsonable_encoder(response)).encode(),
+            lambda: serialization.dumps(jsonable_encoder(response)),
+        ),
+        "event.encode": (
+            lambda: json.dumps(event),
+            lambda: serialization.dumps_str(event),
+        ),
+        "event.decode": (
+            lambda: json.loads(event_text),
+            lambda: serialization.loads(event_text),
+        ),
+    }
+
+    print(f"{'case':14} {'stdlib ops/s':>14} {'orjson ops/s':>14} {'speed-up':>9}")
+    for name, (stdlib, fast) in cases.items():
+        stdlib_ops = _ops(stdlib, args.iterations)
+        fast_ops = _ops(fast, args.iterations)
+        print(
+            f"{name:14} {stdlib_ops:>14,.0f} {fast_ops:>14,.0f} "
+            f"{fast_ops / stdlib_ops:>8.1f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
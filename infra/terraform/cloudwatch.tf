@@ -64,3 +64,31 @@ resource "aws_lambda_permission" "allow_dlq_replay_schedule" {
   principal     = "events.amazonaws.com"
   source_arn    = aws_cloudwatch_event_rule.dlq_replay_schedule.arn
 }
+
+########################################
+# Partition Coverage Alarm
+########################################
+# No DEFAULT partition: inserts fail once "now" passes the last monthly
+# partition. Emitted by partition maintenance on every run; missing data
+# (job not running) breaches too.
+resource "aws_cloudwatch_metric_alarm" "partition_coverage_alarm" {
+  for_each = toset(["payments", "outbox_events"])
+
+  alarm_name          = "${var.project_name}-${each.key}-partition-coverage"
+  comparison_operator = "LessThanThreshold"
+  evaluation_periods  = 1
+  metric_name         = "partitions.months_ahead"
+  namespace           = "EventPlatform"
+  period              = 86400
+  statistic           = "Minimum"
+  threshold           = 1
+
+  dimensions = {
+    table = each.key
+  }
+
+  alarm_description  = "Fewer than one month of ${each.key} partitions ahead — run partition maintenance"
+  treat_missing_data = "breaching"
+
+  alarm_actions = [aws_sns_topic.alerts.arn]
+}
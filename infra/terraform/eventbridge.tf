@@ -41,10 +41,11 @@ resource "aws_cloudwatch_event_rule" "payment_events" {
 
   event_pattern = jsonencode({
     source = ["event-platform.payments"],
+    # Detail types carry a version suffix (payment.created.v1, …)
     "detail-type" = [
-      "payment.created",
-      "payment.success",
-      "payment.failed"
+      { prefix = "payment.created" },
+      { prefix = "payment.success" },
+      { prefix = "payment.failed" }
     ]
   })
 
@@ -89,6 +89,23 @@ resource "aws_iam_role_policy" "lambda_sqs_publish" {
   })
 }
 
+# ==================================================
+# SNS Notifications (PublishBatch uses sns:Publish)
+# ==================================================
+resource "aws_iam_role_policy" "lambda_sns_notifications" {
+  name = "${var.project_name}-lambda-sns-notifications"
+  role = aws_iam_role.lambda_role.id
+
+  policy = jsonencode({
+    Version = "2012-10-17"
+    Statement = [{
+      Effect = "Allow"
+      Action = ["sns:Publish"]
+      Resource = aws_sns_topic.notifications.arn
+    }]
+  })
+}
+
 ########################################
 # Lambda → Secrets Manager Access
 ########################################
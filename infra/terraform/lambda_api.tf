@@ -25,6 +25,9 @@ resource "aws_lambda_function" "api" {
 
 
     REDIS_URL = "redis://${aws_elasticache_cluster.redis.cache_nodes[0].address}:6379"
+
+    # Per-container limiter never sheds at one request per container
+    ADMISSION_ENABLED = "false"
   }
 }
 
@@ -7,6 +7,12 @@ resource "aws_lambda_function" "payment_worker" {
   timeout     = 60
   memory_size = 1024
 
+  # Same as Dockerfile.worker CMD — pinned so an image rebuild cannot
+  # silently switch the entrypoint
+  image_config {
+    command = ["app.workers.sqs_worker.handler"]
+  }
+
   vpc_config {
     subnet_ids         = [aws_subnet.subnet_a.id, aws_subnet.subnet_b.id]
     security_group_ids = [aws_security_group.lambda_db_sg.id]
@@ -19,6 +25,8 @@ resource "aws_lambda_function" "payment_worker" {
 
 
       REDIS_URL = "redis://${aws_elasticache_cluster.redis.cache_nodes[0].address}:6379"
+
+      NOTIFICATION_TOPIC_ARN = aws_sns_topic.notifications.arn
     }
   }
 }
@@ -26,5 +34,13 @@ resource "aws_lambda_function" "payment_worker" {
 resource "aws_lambda_event_source_mapping" "sqs_trigger" {
   event_source_arn = aws_sqs_queue.payment_queue.arn
   function_name    = aws_lambda_function.payment_worker.arn
-  batch_size       = 1
+
+  # No batching window: payment.created shares this queue and must not
+  # wait for a batch to fill. Notifications coalesce within whatever
+  # batch a poll returns (up to 10 already-queued records).
+  batch_size                         = 10
+  maximum_batching_window_in_seconds = 0
+
+  # sqs_worker returns batchItemFailures — only failed records retry
+  function_response_types = ["ReportBatchItemFailures"]
 }
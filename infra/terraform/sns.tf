@@ -15,3 +15,13 @@ resource "aws_sns_topic_subscription" "email_alert" {
   protocol  = "email"
   endpoint  = var.alert_email
 }
+
+########################################
+# SNS Topic – User Notifications
+########################################
+# Payment outcome notifications / digests (app.services.notification_engine).
+# Messages carry `channel` and `user_id` attributes for filter policies.
+
+resource "aws_sns_topic" "notifications" {
+  name = "${var.project_name}-notifications"
+}
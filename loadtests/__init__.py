@@ -0,0 +1,11 @@
+"""
+Load-test scenario suite (Locust).
+
+Run from the repo root against a deployed stack or a local uvicorn:
+    locust -f locustfile.py --headless -H http://localhost:8000 \
+        -u 50 -r 10 -t 2m MixedTrafficUser --results-file out.json
+
+Scenarios are user classes in loadtests/scenarios.py. Name the ones
+to run on the command line; with no names, all of them run, weighted.
+Results, SLO checks and baseline comparison are in loadtests/report.py.
+"""
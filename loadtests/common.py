@@ -0,0 +1,142 @@
+import os
+import time
+import uuid
+import random
+from typing import Callable, Optional
+
+import gevent
+from locust import HttpUser, events
+
+THINK_TIME_SECONDS = (
+    float(os.getenv("LOAD_THINK_MIN_SECONDS", "0.5")),
+    float(os.getenv("LOAD_THINK_MAX_SECONDS", "1.5")),
+)
+# Many-user fan-out draws from this many distinct users
+FAN_OUT_USERS = int(os.getenv("LOAD_FAN_OUT_USERS", "100000"))
+# Per-user budget of app.core.rate_limit (requests per minute)
+RATE_LIMIT_PER_MINUTE = int(os.getenv("LOAD_RATE_LIMIT_PER_MINUTE", "10"))
+# Every hot-user request uses this one user → hits the 10/min rate limit
+HOT_USER_ID = os.getenv("LOAD_HOT_USER_ID", "00000000-0000-0000-0000-000000000001")
+CURRENCIES = ("INR", "USD", "EUR")
+TERMINAL_STATUSES = {"SUCCESS", "FAILED"}
+
+
+@events.init_command_line_parser.add_listener
+def _add_arguments(parser):
+    parser.add_argument(
+        "--arrival-rate",
+        type=float,
+        default=0.0,
+        help="Open loop: scenario actions per second per locust process (0 = closed loop)",
+    )
+    parser.add_argument(
+        "--max-in-flight",
+        type=int,
+        default=200,
+        help="Open loop: outstanding actions per user before arrivals are dropped",
+    )
+
+
+def payment_body(user_id: Optional[str] = None) -> dict:
+    return {
+        "user_id": user_id or str(uuid.uuid4()),
+        "amount": random.randint(100, 50_000),
+        "currency": random.choice(CURRENCIES),
+    }
+
+
+class ScenarioUser(HttpUser):
+    """
+    Base for every scenario.
+
+    - Closed loop (default): one action at a time, think time between
+    - Open loop (--arrival-rate): actions start on a fixed schedule and
+      run concurrently, so a slow API does not slow the arrivals down
+      (no coordinated omission). Arrivals beyond --max-in-flight are
+      reported as failed "dropped" requests
+    """
+
+    abstract = True
+
+    def on_start(self):
+        self._in_flight = set()
+
+    def wait_time(self):
+        options = self.environment.parsed_options
+        if options and options.arrival_rate:
+            users = max(1, self.environment.runner.user_count)
+            return users / options.arrival_rate
+        return random.uniform(*THINK_TIME_SECONDS)
+
+    def dispatch(self, action: Callable, *args) -> None:
+        options = self.environment.parsed_options
+        if not (options and options.arrival_rate):
+            action(*args)
+            return
+
+        if len(self._in_flight) >= options.max_in_flight:
+            self.environment.events.request.fire(
+                request_type="ARRIVAL",
+                name=f"dropped:{type(self).__name__}",
+                response_time=0,
+                response_length=0,
+                exception=RuntimeError("open-loop arrival dropped (max in flight)"),
+                context={},
+            )
+            return
+
+        greenlet = gevent.spawn(action, *args)
+        self._in_flight.add(greenlet)
+        greenlet.link(self._in_flight.discard)
+
+    # --------------------------------------------------
+    # API calls
+    # --------------------------------------------------
+    def create_payment(
+        self,
+        name: str,
+        body: Optional[dict] = None,
+        idempotency_key: Optional[str] = None,
+        expected=(202,),
+    ) -> Optional[str]:
+        """
+        POST /payments; returns the payment id (None when not accepted).
+        """
+        with self.client.post(
+            "/payments",
+            json=body or payment_body(),
+            headers={"Idempotency-Key": idempotency_key or uuid.uuid4().hex},
+            name=name,
+            catch_response=True,
+        ) as response:
+            if response.status_code not in expected:
+                response.failure(f"unexpected status {response.status_code}")
+                return None
+
+            response.success()
+            if response.status_code == 202:
+                return response.json().get("payment_id")
+            return None
+
+    def get_payment(self, payment_id: str) -> Optional[dict]:
+        with self.client.get(
+            f"/payments/{payment_id}",
+            name="GET /payments/{id}",
+            catch_response=True,
+        ) as response:
+            # Not yet visible on the replica is a normal polling outcome
+            if response.status_code == 404:
+                response.success()
+                return None
+            if response.status_code != 200:
+                response.failure(f"unexpected status {response.status_code}")
+                return None
+            return response.json()
+
+    def poll_until_terminal(self, payment_id: str, interval: float, timeout: float) -> None:
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            payment = self.get_payment(payment_id)
+            if payment and payment.get("status") in TERMINAL_STATUSES:
+                return
+            gevent.sleep(interval)
@@ -0,0 +1,176 @@
+import json
+import os
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+
+from locust import events
+from locust.runners import WorkerRunner
+
+SLO_FILE = os.path.join(os.path.dirname(__file__), "slo.json")
+REPORT_QUANTILES = (0.5, 0.9, 0.99)
+# Latency differences below this are noise, whatever the ratio
+REGRESSION_FLOOR_MS = 5.0
+
+
+@events.init_command_line_parser.add_listener
+def _add_arguments(parser):
+    parser.add_argument("--results-file", default="out.json", help="Machine-readable results")
+    parser.add_argument("--slo-file", default=SLO_FILE, help="p50 / p99 / error-rate targets")
+    parser.add_argument("--baseline", help="Results file of a previous run to compare against")
+    parser.add_argument(
+        "--regression-tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative slowdown vs the baseline",
+    )
+    parser.add_argument(
+        "--save-baseline",
+        action="store_true",
+        help="Write this run's results to --baseline",
+    )
+
+
+_started_at: Optional[datetime] = None
+
+
+@events.test_start.add_listener
+def _on_test_start(environment, **kwargs):
+    global _started_at
+    _started_at = datetime.now(timezone.utc)
+
+
+# --------------------------------------------------
+# Results
+# --------------------------------------------------
+def _entry_row(entry) -> Dict[str, Any]:
+    return {
+        "method": entry.method,
+        "num_requests": entry.num_requests,
+        "num_failures": entry.num_failures,
+        "error_rate": round(entry.fail_ratio, 4),
+        "rps": round(entry.total_rps, 2),
+        "avg_ms": round(entry.avg_response_time, 1),
+        "max_ms": round(entry.max_response_time or 0, 1),
+        **{
+            f"p{int(q * 100)}_ms": entry.get_response_time_percentile(q)
+            for q in REPORT_QUANTILES
+        },
+    }
+
+
+def collect_results(environment) -> Dict[str, Any]:
+    options = environment.parsed_options
+    stats = environment.stats
+
+    return {
+        "started_at": _started_at.isoformat() if _started_at else None,
+        "finished_at": datetime.now(timezone.utc).isoformat(),
+        "host": environment.host,
+        "users": sorted(cls.__name__ for cls in environment.user_classes),
+        "mode": "open_loop" if options.arrival_rate else "closed_loop",
+        "arrival_rate": options.arrival_rate or None,
+        "peak_user_count": environment.runner.target_user_count,
+        "requests": {
+            entry.name: _entry_row(entry)
+            for entry in sorted(stats.entries.values(), key=lambda e: e.name)
+        },
+        "total": _entry_row(stats.total),
+    }
+
+
+# --------------------------------------------------
+# SLOs
+# --------------------------------------------------
+def check_slos(results: Dict[str, Any], slo_file: str) -> List[str]:
+    with open(slo_file) as fh:
+        slos = json.load(fh)
+
+    violations = []
+    for name, row in [*results["requests"].items(), ("total", results["total"])]:
+        targets = {**slos.get("default", {}), **slos.get("requests", {}).get(name, {})}
+        if name == "total":
+            # Latency targets are per request type; total gets error rate only
+            targets = {"error_rate": targets["error_rate"]} if "error_rate" in targets else {}
+
+        for metric, limit in targets.items():
+            value = row.get(metric)
+            if value is not None and row["num_requests"] and value > limit:
+                violations.append(f"{name}: {metric}={value} > {limit}")
+    return violations
+
+
+# --------------------------------------------------
+# Baseline comparison
+# --------------------------------------------------
+def compare_with_baseline(
+    results: Dict[str, Any],
+    baseline: Dict[str, Any],
+    tolerance: float,
+) -> List[str]:
+    """
+    Regressions: p50 / p99 slower by more than `tolerance` (and the
+    floor), error rate up by more than a point, open-loop throughput
+    down by more than `tolerance`.
+    """
+    regressions = []
+    for name, row in results["requests"].items():
+        before = baseline.get("requests", {}).get(name)
+        if not before or not row["num_requests"]:
+            continue
+
+        for metric in ("p50_ms", "p99_ms"):
+            if (
+                row[metric] > before[metric] * (1 + tolerance)
+                and row[metric] - before[metric] > REGRESSION_FLOOR_MS
+            ):
+                regressions.append(f"{name}: {metric} {before[metric]} → {row[metric]}")
+
+        if row["error_rate"] > before["error_rate"] + 0.01:
+            regressions.append(
+                f"{name}: error_rate {before['error_rate']} → {row['error_rate']}"
+            )
+
+    if results["mode"] == "open_loop" and baseline.get("mode") == "open_loop":
+        before_rps, rps = baseline["total"]["rps"], results["total"]["rps"]
+        if rps < before_rps * (1 - tolerance):
+            regressions.append(f"total: rps {before_rps} → {rps}")
+
+    return regressions
+
+
+@events.quitting.add_listener
+def _on_quitting(environment, **kwargs):
+    # Workers only hold partial stats; the master / local runner reports
+    if isinstance(environment.runner, WorkerRunner):
+        return
+
+    options = environment.parsed_options
+    results = collect_results(environment)
+
+    violations = check_slos(results, options.slo_file)
+    results["slo"] = {"passed": not violations, "violations": violations}
+
+    regressions: List[str] = []
+    if options.baseline and not options.save_baseline and os.path.exists(options.baseline):
+        with open(options.baseline) as fh:
+            regressions = compare_with_baseline(results, json.load(fh), options.regression_tolerance)
+        results["baseline"] = {
+            "file": options.baseline,
+            "passed": not regressions,
+            "regressions": regressions,
+        }
+
+    with open(options.results_file, "w") as fh:
+        json.dump(results, fh, indent=2)
+
+    if options.baseline and options.save_baseline:
+        with open(options.baseline, "w") as fh:
+            json.dump(results, fh, indent=2)
+
+    for line in violations:
+        print(f"SLO VIOLATION  {line}")
+    for line in regressions:
+        print(f"REGRESSION     {line}")
+
+    if violations or regressions:
+        environment.process_exit_code = 1
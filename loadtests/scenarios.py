@@ -0,0 +1,200 @@
+import os
+import uuid
+import random
+from collections import deque
+from typing import Optional
+
+import gevent
+from locust import task
+
+from loadtests.common import (
+    FAN_OUT_USERS,
+    HOT_USER_ID,
+    RATE_LIMIT_PER_MINUTE,
+    ScenarioUser,
+    payment_body,
+)
+
+# One storm = one user: at the rate limit by default, so every retry is
+# answered by the idempotency path rather than the limiter
+RETRY_STORM_SIZE = int(os.getenv("LOAD_RETRY_STORM_SIZE", str(RATE_LIMIT_PER_MINUTE)))
+BATCH_SIZE = int(os.getenv("LOAD_BATCH_SIZE", "25"))
+POLL_INTERVAL_SECONDS = float(os.getenv("LOAD_POLL_INTERVAL_SECONDS", "0.5"))
+POLL_TIMEOUT_SECONDS = float(os.getenv("LOAD_POLL_TIMEOUT_SECONDS", "30"))
+
+
+# --------------------------------------------------
+# Idempotent retry storm
+# --------------------------------------------------
+class RetryStormUser(ScenarioUser):
+    """
+    A client that times out and retries: the SAME Idempotency-Key sent
+    RETRY_STORM_SIZE times back to back, concurrently. Every accepted
+    response must carry the same payment_id.
+
+    - 429 (storm larger than the per-user limit) is expected and
+      reported as "[retry: rate-limited]"
+    - 5xx means a concurrent same-key insert lost on the unique key
+      without being answered with the winner (create_payment handles
+      the race) — reported as "[retry: same-key 5xx]", never mixed
+      with 429s; gated at 0
+    """
+
+    @task
+    def retry_storm(self):
+        self.dispatch(self._storm)
+
+    def _send_retry(self, body: dict, key: str) -> Optional[str]:
+        with self.client.post(
+            "/payments",
+            json=body,
+            headers={"Idempotency-Key": key},
+            name="POST /payments [retry]",
+            catch_response=True,
+        ) as response:
+            status = response.status_code
+            if status == 202:
+                response.success()
+                return response.json().get("payment_id")
+
+            if status == 429:
+                response.request_meta["name"] = "POST /payments [retry: rate-limited]"
+                response.success()
+            elif status >= 500:
+                response.request_meta["name"] = "POST /payments [retry: same-key 5xx]"
+                response.failure(f"same-key race: status {status}")
+            else:
+                response.failure(f"unexpected status {status}")
+            return None
+
+    def _storm(self):
+        key = uuid.uuid4().hex
+        body = payment_body()
+        results = gevent.joinall(
+            [gevent.spawn(self._send_retry, body, key) for _ in range(RETRY_STORM_SIZE)]
+        )
+
+        payment_ids = {greenlet.value for greenlet in results if greenlet.value}
+        if len(payment_ids) > 1:
+            self.environment.events.request.fire(
+                request_type="CHECK",
+                name="idempotency: one payment per key",
+                response_time=0,
+                response_length=0,
+                exception=AssertionError(f"{len(payment_ids)} payments for one key"),
+                context={},
+            )
+
+
+# --------------------------------------------------
+# Hot-user rate limiting
+# --------------------------------------------------
+class HotUserUser(ScenarioUser):
+    """
+    Every request for ONE user: once the per-user budget is spent the
+    limiter must answer 429 — quickly, and without errors.
+    """
+
+    @task
+    def hot_user(self):
+        self.dispatch(
+            self.create_payment,
+            "POST /payments [hot-user]",
+            payment_body(HOT_USER_ID),
+            None,
+            (202, 429),
+        )
+
+
+# --------------------------------------------------
+# Many-user fan-out
+# --------------------------------------------------
+class FanOutUser(ScenarioUser):
+    """
+    Writes spread over FAN_OUT_USERS distinct users (never rate limited).
+    """
+
+    @task
+    def fan_out(self):
+        user_id = str(uuid.UUID(int=random.randrange(1, FAN_OUT_USERS + 1)))
+        self.dispatch(self.create_payment, "POST /payments", payment_body(user_id))
+
+
+# --------------------------------------------------
+# Status polling reads
+# --------------------------------------------------
+class StatusPollingUser(ScenarioUser):
+    """
+    Create one payment, then poll GET /payments/{id} until it is
+    SUCCESS / FAILED — the client pattern the status endpoint serves.
+    """
+
+    @task
+    def create_and_poll(self):
+        self.dispatch(self._create_and_poll)
+
+    def _create_and_poll(self):
+        payment_id = self.create_payment("POST /payments")
+        if payment_id:
+            self.poll_until_terminal(payment_id, POLL_INTERVAL_SECONDS, POLL_TIMEOUT_SECONDS)
+
+
+# --------------------------------------------------
+# Batch submission
+# --------------------------------------------------
+class BatchSubmitUser(ScenarioUser):
+    """
+    A merchant uploading a batch: BATCH_SIZE payments submitted at once
+    (there is no bulk endpoint, so the batch is a concurrent burst).
+    """
+
+    @task
+    def submit_batch(self):
+        self.dispatch(self._submit_batch)
+
+    def _submit_batch(self):
+        gevent.joinall(
+            [
+                gevent.spawn(self.create_payment, "POST /payments [batch]")
+                for _ in range(BATCH_SIZE)
+            ]
+        )
+
+
+# --------------------------------------------------
+# Mixed read / write traffic
+# --------------------------------------------------
+class MixedTrafficUser(ScenarioUser):
+    """
+    Production-like mix: mostly status reads of recent payments, new
+    payments, a few client retries.
+    """
+
+    def on_start(self):
+        super().on_start()
+        self.recent = deque(maxlen=50)
+
+    def _create(self):
+        payment_id = self.create_payment("POST /payments")
+        if payment_id:
+            self.recent.append(payment_id)
+
+    def _retry(self):
+        key, body = uuid.uuid4().hex, payment_body()
+        self.create_payment("POST /payments [retry]", body, key)
+        self.create_payment("POST /payments [retry]", body, key)
+
+    @task(70)
+    def read(self):
+        if self.recent:
+            self.dispatch(self.get_payment, random.choice(self.recent))
+        else:
+            self.dispatch(self._create)
+
+    @task(25)
+    def write(self):
+        self.dispatch(self._create)
+
+    @task(5)
+    def retry(self):
+        self.dispatch(self._retry)
@@ -1,20 +1,21 @@
-from locust import HttpUser, task, between
-import uuid
+"""
+Entry point for the load-test suite (see loadtests/__init__.py).
 
-class PaymentUser(HttpUser):
-    wait_time = between(1, 3)
+    # one scenario, closed loop
+    locust -f locustfile.py --headless -H http://localhost:8000 \
+        -u 20 -r 5 -t 1m RetryStormUser
 
-    @task
-    def create_payment(self):
-        self.client.post(
-            "/payments/",
-            headers={
-                "Authorization": "Bearer dummy",
-                "Idempotency-Key": str(uuid.uuid4())
-            },
-            json={
-                "user_id": "00000000-0000-0000-0000-000000000001",
-                "amount": 500,
-                "currency": "INR"
-            }
-        )
+    # mixed traffic, open loop at 200 actions/s, gated on a baseline
+    locust -f locustfile.py --headless -H http://localhost:8000 \
+        -u 50 -r 50 -t 5m MixedTrafficUser --arrival-rate 200 \
+        --results-file out.json --baseline loadtests/baseline.json
+"""
+from loadtests import report  # noqa: F401  (results / SLO hooks)
+from loadtests.scenarios import (  # noqa: F401
+    BatchSubmitUser,
+    FanOutUser,
+    HotUserUser,
+    MixedTrafficUser,
+    RetryStormUser,
+    StatusPollingUser,
+)
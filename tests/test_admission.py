@@ -0,0 +1,70 @@
+from app.core.admission import AdmissionController
+
+
+def _controller(**overrides) -> AdmissionController:
+    options = dict(
+        name="test",
+        initial_limit=4,
+        min_limit=1,
+        max_limit=6,
+        latency_budget_ms=100,
+        target_pool_wait_ms=10,
+        window=4,
+    )
+    options.update(overrides)
+    return AdmissionController(**options)
+
+
+def _run_window(controller, in_flight, latency_ms=10.0, pool_wait_ms=0.0):
+    for _ in range(in_flight):
+        assert controller.try_acquire()
+    for _ in range(in_flight):
+        controller.release(latency_ms=latency_ms, pool_wait_ms=pool_wait_ms)
+
+
+def test_sheds_over_the_limit():
+    controller = _controller(initial_limit=2)
+
+    assert controller.try_acquire()
+    assert controller.try_acquire()
+    assert not controller.try_acquire()
+
+    controller.release(latency_ms=10, pool_wait_ms=0)
+    assert controller.try_acquire()
+    assert controller.stats()["shed"] == 1
+
+
+def test_additive_increase_when_saturated_and_healthy():
+    controller = _controller()
+
+    _run_window(controller, in_flight=4)
+    assert controller.stats()["limit"] == 5
+
+    _run_window(controller, in_flight=5)
+    _run_window(controller, in_flight=6)
+    assert controller.stats()["limit"] == 6  # max_limit
+
+
+def test_no_increase_when_not_saturated():
+    controller = _controller()
+
+    for _ in range(2):
+        _run_window(controller, in_flight=2)
+    assert controller.stats()["limit"] == 4
+
+
+def test_multiplicative_decrease_on_latency_or_pool_wait():
+    controller = _controller()
+
+    _run_window(controller, in_flight=4, latency_ms=500)
+    assert controller.limit == 3.0
+
+    _run_window(controller, in_flight=2, pool_wait_ms=50)
+    _run_window(controller, in_flight=2, pool_wait_ms=50)
+    assert controller.limit == 2.25
+
+    # 2.25 → 1.69 → 1.27 → 1 (min_limit), then stays
+    for _ in range(4 * 4):
+        _run_window(controller, in_flight=1, latency_ms=500)
+    assert controller.limit == 1
+    assert controller.stats()["decreases"] == 5
@@ -0,0 +1,74 @@
+import pytest
+
+pytest.importorskip("msgpack")
+
+from app.events import registry  # noqa: E402
+from app.events.registry import (  # noqa: E402
+    UnknownEventSchema,
+    decode,
+    encode,
+    register_event,
+    split_event_type,
+    upcast,
+    upcaster,
+)
+
+
+@upcaster("test.upcast", 1)
+def _v1_to_v2(payload):
+    return {**payload, "currency": payload.get("currency", "INR")}
+
+
+@upcaster("test.upcast", 2)
+def _v2_to_v3(payload):
+    payload = dict(payload)
+    payload["amount_minor"] = payload.pop("amount") * 100
+    return payload
+
+
+register_event("test.upcast", 1)
+register_event("test.upcast", 2)
+register_event("test.upcast", 3)
+
+
+def test_split_event_type():
+    assert split_event_type("payment.created.v1") == ("payment.created", 1)
+    with pytest.raises(UnknownEventSchema):
+        split_event_type("payment.created")
+
+
+def test_upcasts_through_every_version():
+    assert upcast("test.upcast", 1, {"amount": 5}) == (
+        3,
+        {"currency": "INR", "amount_minor": 500},
+    )
+    assert upcast("test.upcast", 3, {"amount_minor": 1}) == (3, {"amount_minor": 1})
+
+
+def test_rejects_newer_or_unregistered_versions():
+    with pytest.raises(UnknownEventSchema):
+        upcast("test.upcast", 4, {})
+    with pytest.raises(UnknownEventSchema):
+        upcast("test.unregistered", 1, {})
+
+
+def test_version_needs_upcaster_from_previous():
+    with pytest.raises(ValueError):
+        register_event("test.gap", 2)
+
+
+def test_round_trip_upcasts_on_decode():
+    data = encode("test.upcast", 1, {"amount": 2})
+
+    assert decode(data) == ("test.upcast", 3, {"currency": "INR", "amount_minor": 200})
+    assert decode(data, upcast_to_latest=False) == ("test.upcast", 1, {"amount": 2})
+
+
+def test_large_payloads_are_compressed():
+    small = encode("test.upcast", 3, {"note": "x"})
+    large = encode("test.upcast", 3, {"note": "x" * 4 * registry.COMPRESS_THRESHOLD_BYTES})
+
+    assert small[1] == 0
+    assert large[1] & 0x01
+    assert len(large) < registry.COMPRESS_THRESHOLD_BYTES
+    assert decode(large)[2]["note"] == "x" * 4 * registry.COMPRESS_THRESHOLD_BYTES
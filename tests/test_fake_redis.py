@@ -0,0 +1,84 @@
+import asyncio
+from importlib.util import find_spec
+
+import pytest
+
+from app.core.locks import _RELEASE_SCRIPT
+from app.transport.fake_redis import FakeRedis, _Server
+
+
+def _redis() -> FakeRedis:
+    return FakeRedis(_Server())
+
+
+# The script table imports analytics_counters (→ sqlalchemy models)
+needs_scripts = pytest.mark.skipif(
+    find_spec("sqlalchemy") is None, reason="sqlalchemy not installed"
+)
+
+
+@needs_scripts
+def test_release_script_only_deletes_owned_lock():
+    async def scenario():
+        redis = _redis()
+        await redis.set("lock:job", "owner", nx=True, ex=30)
+
+        assert await redis.eval(_RELEASE_SCRIPT, 1, "lock:job", "other") == 0
+        assert await redis.get("lock:job") == "owner"
+
+        assert await redis.eval(_RELEASE_SCRIPT, 1, "lock:job", "owner") == 1
+        assert await redis.get("lock:job") is None
+
+    asyncio.run(scenario())
+
+
+@needs_scripts
+def test_unknown_script_is_rejected():
+    async def scenario():
+        with pytest.raises(NotImplementedError):
+            await _redis().eval("return 1", 0)
+
+    asyncio.run(scenario())
+
+
+@needs_scripts
+def test_record_script_dedupes_and_counts():
+    from app.services.analytics_counters import _RECORD_SCRIPT
+
+    keys = ["seen:e1", "day", "hour", "latency:day", "latency:hour"]
+
+    async def scenario():
+        redis = _redis()
+        args = (60, 3600, "success", "0.25", "139")
+
+        assert await redis.eval(_RECORD_SCRIPT, 5, *keys, *args) == 1
+        assert await redis.eval(_RECORD_SCRIPT, 5, *keys, *args) == 0
+
+        for key in ("day", "hour"):
+            counters = await redis.hgetall(key)
+            assert counters["success"] == "1"
+            assert counters["processed"] == "1"
+            assert float(counters["latency_sum"]) == 0.25
+        for key in ("latency:day", "latency:hour"):
+            assert await redis.hgetall(key) == {"139": "1"}
+
+        # No latency → counters only
+        await redis.eval(_RECORD_SCRIPT, 5, "seen:e2", *keys[1:], 60, 3600, "total", "", "")
+        assert (await redis.hgetall("day"))["total"] == "1"
+        assert (await redis.hgetall("day"))["processed"] == "1"
+
+    asyncio.run(scenario())
+
+
+def test_set_nx_and_expiry():
+    async def scenario():
+        redis = _redis()
+        assert await redis.set("k", "1", nx=True) is True
+        assert await redis.set("k", "2", nx=True) is None
+        assert await redis.mget(["k", "missing"]) == ["1", None]
+
+        await redis.set("short", "1", ex=0.01)
+        await asyncio.sleep(0.02)
+        assert await redis.get("short") is None
+
+    asyncio.run(scenario())
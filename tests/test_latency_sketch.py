@@ -0,0 +1,70 @@
+import random
+
+import pytest
+
+pytest.importorskip("sqlalchemy")
+
+from app.services.latency_sketch import (  # noqa: E402
+    RELATIVE_ACCURACY,
+    LatencySketch,
+    bucket_key,
+    merge_sketches,
+)
+
+
+def _exact_quantile(values, q):
+    ordered = sorted(values)
+    return ordered[int(q * (len(ordered) - 1))]
+
+
+@pytest.mark.parametrize("q", [0.5, 0.9, 0.99])
+def test_quantiles_within_relative_accuracy(q):
+    rng = random.Random(7)
+    values = [rng.lognormvariate(-1, 1.2) + 0.002 for _ in range(20_000)]
+
+    sketch = LatencySketch()
+    for value in values:
+        sketch.add(value)
+
+    exact = _exact_quantile(values, q)
+    assert abs(sketch.quantile(q) - exact) <= RELATIVE_ACCURACY * exact * 1.0001
+
+
+def test_zero_bucket_and_empty():
+    sketch = LatencySketch()
+    assert sketch.quantile(0.5) is None
+
+    sketch.add(0.0005)
+    assert bucket_key(0.0005) is None
+    assert sketch.quantile(0.5) == 0.0
+
+
+def test_serialization_round_trip():
+    sketch = LatencySketch()
+    for value in (0.0001, 0.003, 0.05, 0.05, 1.5, 30.0):
+        sketch.add(value)
+
+    restored = LatencySketch.from_bytes(sketch.to_bytes())
+    assert restored.buckets == sketch.buckets
+    assert restored.zero_count == sketch.zero_count
+
+    with pytest.raises(ValueError):
+        LatencySketch.from_bytes(b"\x09" + sketch.to_bytes()[1:])
+
+
+def test_merge_equals_sketching_everything():
+    first, second, combined = LatencySketch(), LatencySketch(), LatencySketch()
+    for index in range(1, 500):
+        value = index / 100
+        (first if index % 2 else second).add(value)
+        combined.add(value)
+
+    merged = merge_sketches([first.to_bytes(), None, second.to_bytes()])
+    assert merged.buckets == combined.buckets
+    assert merged.quantile(0.99) == combined.quantile(0.99)
+
+
+def test_from_counts_reads_redis_hash():
+    sketch = LatencySketch.from_counts({"z": "2", str(bucket_key(0.25)): "3"})
+    assert sketch.count == 5
+    assert sketch.zero_count == 2
@@ -0,0 +1,88 @@
+from app.transport.memory import InMemoryQueueClient
+
+QUEUE = "memory://test-queue"
+DLQ = "memory://test-dlq"
+
+
+def _client(max_receive_count=None) -> InMemoryQueueClient:
+    client = InMemoryQueueClient()
+    client.create_queue(DLQ, visibility_timeout=30)
+    client.create_queue(
+        QUEUE,
+        visibility_timeout=30,
+        dead_letter_url=DLQ if max_receive_count else None,
+        max_receive_count=max_receive_count,
+    )
+    return client
+
+
+def _receive(client, url=QUEUE, **kwargs):
+    return client.receive_message(QueueUrl=url, MaxNumberOfMessages=10, **kwargs).get("Messages", [])
+
+
+def _attributes(client, url=QUEUE):
+    return client.get_queue_attributes(QueueUrl=url)["Attributes"]
+
+
+def test_received_message_is_invisible_until_deleted():
+    client = _client()
+    client.send_message(QueueUrl=QUEUE, MessageBody="a")
+
+    [message] = _receive(client)
+    assert message["Body"] == "a"
+    assert message["Attributes"]["ApproximateReceiveCount"] == "1"
+    assert _receive(client) == []
+    assert _attributes(client) == {
+        "ApproximateNumberOfMessages": "0",
+        "ApproximateNumberOfMessagesNotVisible": "1",
+    }
+
+    client.delete_message(QueueUrl=QUEUE, ReceiptHandle=message["ReceiptHandle"])
+    assert _attributes(client)["ApproximateNumberOfMessagesNotVisible"] == "0"
+    assert _receive(client, VisibilityTimeout=0) == []
+
+
+def test_expired_visibility_redelivers_with_new_receipt():
+    client = _client()
+    client.send_message(QueueUrl=QUEUE, MessageBody="a")
+
+    first = _receive(client, VisibilityTimeout=0)[0]
+    second = _receive(client, VisibilityTimeout=0)[0]
+
+    assert second["MessageId"] == first["MessageId"]
+    assert second["ReceiptHandle"] != first["ReceiptHandle"]
+    assert second["Attributes"]["ApproximateReceiveCount"] == "2"
+
+    # A stale receipt no longer deletes the message
+    client.delete_message(QueueUrl=QUEUE, ReceiptHandle=first["ReceiptHandle"])
+    assert len(_receive(client, VisibilityTimeout=0)) == 1
+
+
+def test_change_message_visibility_releases_message():
+    client = _client()
+    client.send_message(QueueUrl=QUEUE, MessageBody="a")
+
+    [message] = _receive(client)
+    client.change_message_visibility(
+        QueueUrl=QUEUE,
+        ReceiptHandle=message["ReceiptHandle"],
+        VisibilityTimeout=0,
+    )
+
+    [again] = _receive(client)
+    assert again["MessageId"] == message["MessageId"]
+
+
+def test_redrive_after_max_receive_count():
+    client = _client(max_receive_count=2)
+    client.send_message(QueueUrl=QUEUE, MessageBody="poison")
+
+    for _ in range(2):
+        assert len(_receive(client, VisibilityTimeout=0)) == 1
+
+    assert _receive(client, VisibilityTimeout=0) == []
+    assert client.redriven == 1
+
+    [dead] = _receive(client, url=DLQ)
+    assert dead["Body"] == "poison"
+    assert dead["Attributes"]["ApproximateReceiveCount"] == "1"
@@ -0,0 +1,116 @@
+import asyncio
+
+from app.services import notification_engine
+from app.services.notification_engine import (
+    MemoryDeliveryLog,
+    NotificationEngine,
+    StubSender,
+    TokenBucket,
+)
+
+
+def _payload(payment_id: str, user_id: str = "u1", status: str = "SUCCESS"):
+    return {"payment_id": payment_id, "user_id": user_id, "status": status, "amount": 500}
+
+
+def _engine(sender, channels=("email",), delivery_log=None) -> NotificationEngine:
+    return NotificationEngine(
+        sender=sender,
+        delivery_log=delivery_log or MemoryDeliveryLog(),
+        channels=list(channels),
+    )
+
+
+def _sent(sender):
+    return [message for batch in sender.batches for message in batch]
+
+
+def test_coalesces_per_user_and_channel():
+    sender = StubSender()
+    engine = _engine(sender, channels=("email", "sms"))
+
+    engine.add("payment.success", _payload("p1"), source_id="m1")
+    engine.add("payment.failed", _payload("p2", status="FAILED"), source_id="m2")
+    engine.add("payment.success", _payload("p3", user_id="u2"), source_id="m3")
+
+    assert asyncio.run(engine.flush()) == set()
+
+    bodies = {(m.user_id, m.channel): m.body for m in _sent(sender)}
+    assert len(bodies) == 4
+    assert bodies[("u1", "email")]["type"] == "payment.digest"
+    assert [p["payment_id"] for p in bodies[("u1", "email")]["payments"]] == ["p1", "p2"]
+    assert bodies[("u2", "sms")]["type"] == "payment.success"
+    assert bodies[("u2", "sms")]["payment_id"] == "p3"
+
+
+def test_repeated_payment_keeps_latest_event():
+    sender = StubSender()
+    engine = _engine(sender)
+
+    engine.add("payment.failed", _payload("p1", status="FAILED"), source_id="m1")
+    engine.add("payment.success", _payload("p1"), source_id="m2")
+    asyncio.run(engine.flush())
+
+    [message] = _sent(sender)
+    assert message.body["type"] == "payment.success"
+
+
+def test_partial_failure_reports_sources_and_retries_failed_channel_only():
+    delivery_log = MemoryDeliveryLog()
+    sender = StubSender(fail_ids={"n1"})  # (u1, sms) — second group
+    engine = _engine(sender, channels=("email", "sms"), delivery_log=delivery_log)
+
+    engine.add("payment.success", _payload("p1"), source_id="m1")
+    engine.add("payment.success", _payload("p9", user_id="u9"), source_id="m9")
+    assert asyncio.run(engine.flush()) == {"m1"}
+
+    # The redelivered record goes out on sms only
+    sender.batches.clear()
+    engine.add("payment.success", _payload("p1"), source_id="m1")
+    assert asyncio.run(engine.flush()) == set()
+    assert [(m.user_id, m.channel) for m in _sent(sender)] == [("u1", "sms")]
+
+    # Fully delivered: nothing left to send
+    sender.batches.clear()
+    engine.add("payment.success", _payload("p1"), source_id="m1")
+    assert asyncio.run(engine.flush()) == set()
+    assert sender.batches == []
+
+
+def test_due_on_buffer_limit():
+    engine = NotificationEngine(
+        sender=StubSender(),
+        delivery_log=MemoryDeliveryLog(),
+        channels=["email"],
+        window_seconds=60,
+        max_buffered=2,
+    )
+    assert not engine.due()
+
+    engine.add("payment.success", _payload("p1"))
+    assert not engine.due()
+    engine.add("payment.success", _payload("p2"))
+    assert engine.due()
+
+
+def test_token_bucket_bursts_then_sleeps_off_debt(monkeypatch):
+    sleeps = []
+
+    async def fake_sleep(seconds):
+        sleeps.append(seconds)
+
+    monkeypatch.setattr(notification_engine.asyncio, "sleep", fake_sleep)
+    bucket = TokenBucket(rate=10, capacity=10)
+
+    async def scenario():
+        await bucket.acquire(10)
+        assert sleeps == []
+
+        await bucket.acquire(5)
+        await bucket.acquire(5)
+
+    asyncio.run(scenario())
+
+    assert len(sleeps) == 2
+    assert 0.4 < sleeps[0] <= 0.5
+    assert 0.9 < sleeps[1] <= 1.0